@@ -1 +1,12 @@
 from .amazingctrl import AmazingHand
+from .scs0009 import TELEMETRY_DTYPE
+from .loop import ControlLoop
+from .gestures import register_gesture
+from .aio import AsyncAmazingHand
+from .group import HandGroup
+from .process import ProcessAmazingHand
+from .kinematics import FingerModel, HandKinematics
+from .recorder import Recorder, load_recording, replay
+from .metrics import BusMetrics, InstrumentedController
+from .sequence import load_sequence, plan_sequence, run_sequence
+from .teleop import TeleopInput
@@ -0,0 +1,231 @@
+"""
+asyncio front end for the AmazingHand.
+
+AsyncAmazingHand runs every blocking bus call on one dedicated I/O thread, so
+the event loop never blocks and bus access stays serialized. Motions are
+asyncio tasks: a newer command cancels the motion in flight instead of waiting
+for it to finish.
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .amazingctrl import AmazingHand, SettleTracker
+from .trajectory import plan
+
+
+class AsyncAmazingHand:
+    """
+    Awaitable wrapper around AmazingHand.
+
+        async with AsyncAmazingHand(port="/dev/ttyACM0") as hand:
+            await hand.open()
+            await hand.move_to([90, -90] * 4, duration=1.0)
+            status = await hand.read_telemetry()
+    """
+
+    def __init__(self, port=None, side=1, calibration_data=None, hand=None):
+        """
+        :param port: The serial port, as for AmazingHand.
+        :param side: 1 for Right Hand (default), 2 for Left Hand.
+        :param calibration_data: A list of 8 calibration values for the servos.
+        :param hand: An existing AmazingHand to wrap instead of opening `port`.
+        """
+        self.hand = hand if hand is not None else AmazingHand(port, side=side, calibration_data=calibration_data)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="amazinghand-io")
+        self._motion = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+        self.shutdown()
+
+    async def _run(self, func, *args, **kwargs):
+        """Runs a blocking hand call on the I/O thread."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        """
+        Shuts down the I/O thread. Call stop() first to release the motors.
+        """
+        self._executor.shutdown(wait=True)
+
+    # --- Motion ---
+
+    async def cancel_motion(self):
+        """
+        Cancels the motion in flight, if any, and waits until it has stopped sending.
+        """
+        motion, self._motion = self._motion, None
+        if motion is not None and not motion.done():
+            motion.cancel()
+            await asyncio.wait([motion])
+
+    async def _command(self, func, *args):
+        await self.cancel_motion()
+        await self._run(func, *args)
+
+    async def start(self):
+        await self._run(self.hand.start)
+
+    async def stop(self):
+        await self.cancel_motion()
+        await self._run(self.hand.stop)
+
+    async def set_pose(self, positions, speeds=None):
+        await self._command(self.hand.set_pose, positions, speeds)
+
+    async def gesture(self, name):
+        await self._command(self.hand.gesture, name)
+
+    async def index(self, angle_1, angle_2, speed):
+        await self._command(self.hand.index, angle_1, angle_2, speed)
+
+    async def middle(self, angle_1, angle_2, speed):
+        await self._command(self.hand.middle, angle_1, angle_2, speed)
+
+    async def ring(self, angle_1, angle_2, speed):
+        await self._command(self.hand.ring, angle_1, angle_2, speed)
+
+    async def thumb(self, angle_1, angle_2, speed):
+        await self._command(self.hand.thumb, angle_1, angle_2, speed)
+
+    async def open(self):
+        await self.gesture("open")
+
+    async def close(self):
+        await self.gesture("close")
+
+    async def point(self):
+        await self.gesture("point")
+
+    async def victory(self):
+        await self.gesture("victory")
+
+    async def ok(self):
+        await self.gesture("ok")
+
+    async def pinch(self):
+        await self.gesture("pinch")
+
+    async def move_to(self, positions, duration, rate_hz=100, method="min_jerk"):
+        """
+        Moves smoothly to `positions` in `duration` seconds.
+
+        :return: True if the motion completed, False if a newer command pre-empted it.
+        """
+        await self.cancel_motion()
+        trajectory = plan([self.hand.get_goal_pose()[0], positions], [duration], rate_hz=rate_hz, method=method)
+        return await self.play_trajectory(trajectory)
+
+    async def play_trajectory(self, trajectory, speeds=None):
+        """
+        Streams a Trajectory without blocking the event loop.
+
+        :return: True if the motion completed, False if a newer command pre-empted it.
+        """
+        await self.cancel_motion()
+        compiled = self.hand.compile_trajectory(trajectory, speeds)
+        completed, _ = await self._track(self._stream(compiled))
+        return completed
+
+    async def _track(self, coro):
+        """
+        Runs `coro` as the motion in flight, which a newer command cancels.
+
+        :return: (completed, result); completed is False if it was pre-empted.
+        """
+        motion = asyncio.ensure_future(coro)
+        self._motion = motion
+        try:
+            # asyncio.wait() does not raise when `motion` is cancelled by a
+            # newer command, only when this coroutine itself is cancelled.
+            await asyncio.wait([motion])
+        except asyncio.CancelledError:
+            motion.cancel()
+            raise
+        if motion.cancelled():
+            return False, None
+        return True, motion.result()
+
+    async def wait_settled(self, tol_deg=2.0, timeout=3.0, speed_tol=0.05, stall_load=300,
+                           stall_time=0.1, poll_interval=0.005):
+        """
+        Waits until the hand has arrived; see AmazingHand.wait_settled().
+
+        The wait is the motion in flight: the I/O thread is only busy for one
+        read of all motors at a time, and a newer command cancels the wait.
+
+        :return: The result dict of AmazingHand.wait_settled(), or None if a newer
+                 command pre-empted the wait.
+        """
+        await self.cancel_motion()
+        await self._run(self.hand.flush)
+        target = np.asarray(self.hand.calibration_data) + self.hand.get_goal_pose()[0]
+        settling = SettleTracker(target, tol_deg, speed_tol, stall_load, stall_time)
+        _, result = await self._track(self._settle(settling, timeout, poll_interval))
+        return result
+
+    async def move_and_wait(self, positions, tol_deg=2.0, timeout=3.0, speeds=None, **kwargs):
+        """
+        Sends a pose or gesture and waits until the hand has arrived; see AmazingHand.move_and_wait().
+
+        :return: As for wait_settled().
+        """
+        if isinstance(positions, str):
+            await self.gesture(positions)
+        else:
+            await self.set_pose(positions, speeds)
+        return await self.wait_settled(tol_deg=tol_deg, timeout=timeout, **kwargs)
+
+    async def _settle(self, settling, timeout, poll_interval):
+        start = time.monotonic()
+        while True:
+            state = await self._run(self.hand._read_motion_state)
+            now = time.monotonic()
+            done = settling.update(state, now)
+            timed_out = now - start >= timeout
+            if done or timed_out:
+                return settling.result(now - start, timed_out)
+            await asyncio.sleep(poll_interval)
+
+    async def _stream(self, compiled):
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        last = len(compiled) - 1
+        k = 0
+        while True:
+            await self._run(self.hand.send_trajectory_sample, compiled, k)
+            if k == last:
+                return
+            k += 1
+            # Absolute deadlines; samples that are already late are skipped.
+            delay = start + k / compiled.rate_hz - loop.time()
+            if delay < 0:
+                k = compiled.sample_at(loop.time() - start)
+                delay = 0
+            await asyncio.sleep(delay)
+
+    # --- Telemetry ---
+
+    async def read_telemetry(self):
+        return await self._run(self.hand.read_telemetry)
+
+    async def get_all_motors_status(self):
+        return await self._run(self.hand.get_all_motors_status)
+
+    async def read_position(self, motor_id):
+        return await self._run(self.hand.read_position, motor_id)
+
+    async def read_load(self, motor_id):
+        return await self._run(self.hand.read_load, motor_id)
+
+    async def read_temperature(self, motor_id):
+        return await self._run(self.hand.read_temperature, motor_id)
@@ -1,24 +1,160 @@
+import threading
 import time
+from contextlib import contextmanager
+
 import numpy as np
 from rustypot import Scs0009PyController
 
+from .scs0009 import (
+    ADDR_GOAL_POSITION,
+    ADDR_GOAL_SPEED,
+    ADDR_TORQUE_ENABLE,
+    GOAL_BLOCK_ADDR,
+    GOAL_BLOCK_SIZE,
+    IDENTITY_BLOCK_ADDR,
+    IDENTITY_BLOCK_SIZE,
+    MOTION_BLOCK_SIZE,
+    MOTOR_IDS,
+    NUM_MOTORS,
+    PRESENT_BLOCK_ADDR,
+    PRESENT_BLOCK_SIZE,
+    STEPS_PER_RAD,
+    decode_present_block,
+    encode_position,
+    encode_speed,
+    pack_goal_block,
+    pack_words,
+    sync_write_frame_bytes,
+    unpack_goal_block,
+)
+from .gestures import CLOSE_SPEED, GESTURES, MAX_SPEED, Gesture, GestureTable, registry_version
+from .config import config_path, load_calibration
+from .loop import ControlLoop
+from .sequence import run_sequence
+from .grasp import grasp
+from .kinematics import joint_to_servo
+from .health import HealthMonitor
+from .metrics import BusMetrics, InstrumentedController
+from .telemetry import PollingScheduler, TelemetrySampler
+from .thermal import ThermalLimiter
+from .trajectory import CompiledTrajectory, plan
+
+# Reply timeout of the serial port opened by AmazingHand, in seconds.
+BUS_TIMEOUT = 0.5
+
+class SettleTracker:
+    """
+    The per-joint settle/stall bookkeeping of AmazingHand.wait_settled(), fed
+    one _read_motion_state() sweep at a time by whoever runs the polling loop.
+    """
+
+    def __init__(self, target, tol_deg, speed_tol, stall_load, stall_time):
+        """
+        :param target: The 8 goal positions in degrees, calibration included.
+        """
+        self.target = target
+        self.tol_deg = tol_deg
+        self.speed_tol = speed_tol
+        self.stall_load = stall_load
+        self.stall_time = stall_time
+        self._stopped_since = np.full(NUM_MOTORS, np.nan)
+        self._state = None
+        self.done = False
+
+    def update(self, state, now):
+        """
+        :param state: A TELEMETRY_DTYPE array with position, speed and load.
+        :param now: time.monotonic() of the sweep.
+        :return: True once every joint is settled, stalled or in error.
+        """
+        error = state["position_deg"] - self.target
+        stopped = np.abs(state["speed"]) < self.speed_tol
+        in_tolerance = np.abs(error) <= self.tol_deg
+        loaded = np.abs(state["load"]) >= self.stall_load
+
+        pushing = stopped & loaded & ~in_tolerance
+        stopped_since = self._stopped_since
+        stopped_since[~pushing] = np.nan
+        stopped_since[pushing & np.isnan(stopped_since)] = now
+        stalled = pushing & (now - stopped_since >= self.stall_time)
+        settled = state["ok"] & stopped & in_tolerance
+
+        self._state = state, error, settled, stalled
+        self.done = bool((settled | stalled | ~state["ok"]).all())
+        return self.done
+
+    def result(self, elapsed, timed_out):
+        """The result dict of wait_settled() for the last update()."""
+        state, error, settled, stalled = self._state
+        status = np.where(settled, "settled", np.where(stalled, "stalled", "moving"))
+        status[~state["ok"]] = "error"
+        joints = []
+        for i, motor_id in enumerate(MOTOR_IDS):
+            joints.append({
+                "id": motor_id,
+                "status": str(status[i]),
+                "position": float(state["position_deg"][i]),
+                "target": float(self.target[i]),
+                "error": float(error[i]),
+                "speed": float(state["speed"][i]),
+                "load": float(state["load"][i]),
+            })
+        return {
+            "settled": bool(settled.all()),
+            "stalled": [motor_id for motor_id, s in zip(MOTOR_IDS, stalled) if s],
+            "timed_out": bool(timed_out and not self.done),
+            "elapsed": elapsed,
+            "joints": joints,
+        }
+
+
+def _check_finite(positions, speeds):
+    """Raises ValueError on NaN or infinite goals, which would encode to arbitrary raw values."""
+    if not (np.isfinite(positions).all() and np.isfinite(speeds).all()):
+        raise ValueError(f"Goal positions and speeds must be finite, got {positions} and {speeds}")
+
+
 class AmazingHand:
-    def __init__(self, port, side=1, calibration_data=None):
+    def __init__(self, port, side=1, calibration_data=None, controller=None):
         """
         Initializes the AmazingHand controller.
 
         :param port: The serial port for communication (e.g., "COM3" or "/dev/tty.usbmodemXXXX").
         :param side: 1 for Right Hand (default), 2 for Left Hand.
-        :param calibration_data: A list of 8 calibration values for the servos.
+        :param calibration_data: A list of 8 calibration values for the servos. If omitted,
+                                 the values saved for `port` by `python -m amazingctrl calibrate`
+                                 are used (see amazingctrl.config), else built-in defaults.
+        :param controller: Optional bus transport to use instead of opening `port` with
+                           rustypot's Scs0009PyController, e.g. amazingctrl.sim.SimulatedController().
         """
+        # Gestures are compiled lazily for the current calibration and side,
+        # and recompiled whenever either changes.
+        self._custom_gestures = {}
+        self._gesture_table = None
+
         self.port = port
         self.side = side
-        self.controller = Scs0009PyController(
-            serial_port=self.port,
-            baudrate=1000000,
-            timeout=0.5,
-        )
+        # Injected controllers cannot be reopened by reconnect() without a new one.
+        self._owns_controller = controller is None
+        # The bus reply timeout outside probe() and the HealthMonitor's per-call
+        # budget. The controller cannot be asked for it (rustypot has no getter),
+        # so it is tracked here.
+        self._bus_timeout = getattr(controller, "timeout", BUS_TIMEOUT)
+        if controller is not None:
+            self.controller = controller
+        else:
+            self.controller = self._open_controller()
+        # Set when stop() closed the port; start() reopens it.
+        self._closed = False
+        # Ids that answered the last probe(), None before the first one.
+        self.present_ids = None
+        self._torque_enabled = False
         
+        if not calibration_data:
+            # Offsets saved by `python -m amazingctrl calibrate` for this port, if any.
+            calibration_data = load_calibration(port)
+            if calibration_data:
+                print(f"Loaded calibration for {port} from {config_path()}.")
         if calibration_data:
             self.calibration_data = calibration_data
         else:
@@ -26,48 +162,718 @@ class AmazingHand:
             self.calibration_data = [3, 0, -5, -8, -2, 5, -12, 0]
 
         # Constants
-        self.MAX_SPEED = 7
-        self.CLOSE_SPEED = 3
+        self.MAX_SPEED = MAX_SPEED
+        self.CLOSE_SPEED = CLOSE_SPEED
+
+        # Last commanded pose, in degrees before calibration, ordered like MOTOR_IDS.
+        self._goal_angles = np.zeros(NUM_MOTORS)
+        self._goal_speeds = np.full(NUM_MOTORS, float(self.MAX_SPEED))
+        # Motors whose goal changed but has not been sent yet (see batch()).
+        self._dirty = np.zeros(NUM_MOTORS, dtype=bool)
+        self._batch_depth = 0
+        # Guards the goal arrays, the dirty mask and the batch depth across
+        # threads; a batch() holds it until it closes. Always taken before _bus_lock.
+        self._goal_lock = threading.RLock()
+
+        # Shadow copy of the raw goal_position, goal_speed and torque_enable
+        # values last written to each servo (-1: unknown). Values that match
+        # the shadow are not sent again; see position_deadband and resync().
+        self._shadow_position = np.full(NUM_MOTORS, -1, dtype=np.int64)
+        self._shadow_speed = np.full(NUM_MOTORS, -1, dtype=np.int64)
+        self._shadow_torque = np.full(NUM_MOTORS, -1, dtype=np.int64)
+        # Goal position changes smaller than this (degrees) are not sent.
+        self.position_deadband = 0.0
+        self.reset_write_stats()
+
+        # Serializes every bus transaction between the caller and the telemetry thread.
+        self._bus_lock = threading.RLock()
+        self.telemetry_sampler = None
+        self.polling_scheduler = None
+        self.health = None
+        self.thermal = None
+
+        # Callbacks notified of every command sent and every telemetry sweep read.
+        self._command_listeners = []
+        self._telemetry_listeners = []
+        # Exceptions raised by telemetry listeners; only the first is printed.
+        self.listener_errors = 0
+
+    @property
+    def side(self):
+        """1 for Right Hand, 2 for Left Hand. Changing it recompiles the gestures."""
+        return self._side
+
+    @side.setter
+    def side(self, side):
+        self._side = side
+        self._gesture_table = None
+
+    @property
+    def calibration_data(self):
+        """
+        The 8 calibration offsets in degrees, as a tuple.
+        Assign a new list to change them; the gestures are recompiled.
+        """
+        return tuple(self._calibration.tolist())
 
-    def start(self):
+    @calibration_data.setter
+    def calibration_data(self, calibration_data):
+        calibration = np.asarray(calibration_data, dtype=float)
+        if calibration.shape != (NUM_MOTORS,):
+            raise ValueError(f"Expected {NUM_MOTORS} calibration values, got shape {calibration.shape}")
+        self._calibration = calibration
+        self._gesture_table = None
+
+    def enable_metrics(self, metrics=None):
+        """
+        Records every bus transaction (counts, latency histogram, timeouts, errors
+        and bytes per register and motor) until disable_metrics() is called.
+
+        :param metrics: Optional BusMetrics to record into, e.g. one shared by several hands.
+        :return: The BusMetrics being recorded into.
+        """
+        with self._bus_lock:
+            if isinstance(self.controller, InstrumentedController):
+                return self.controller.metrics
+            if metrics is None:
+                metrics = BusMetrics(labels={"port": self.port})
+            self.controller = InstrumentedController(self.controller, metrics)
+            return metrics
+
+    def disable_metrics(self):
+        """
+        Stops recording bus transactions; the hand talks to the bare controller again.
+        """
+        with self._bus_lock:
+            if isinstance(self.controller, InstrumentedController):
+                self.controller = self.controller.controller
+
+    @property
+    def metrics(self):
+        """The BusMetrics being recorded into, or None when metrics are disabled."""
+        controller = self.controller
+        return controller.metrics if isinstance(controller, InstrumentedController) else None
+
+    def enable_health(self, **options):
+        """
+        Installs a HealthMonitor: short per-call timeouts, a per-sweep time budget,
+        bounded retries and a per-motor circuit breaker. A servo that keeps failing
+        is marked degraded and skipped by reads and goal writes until a background
+        probe sees it answer again.
+
+        :param options: Options of amazingctrl.health.HealthMonitor, e.g.
+                        failure_threshold=3, call_timeout=0.01, cycle_budget=0.02.
+        :return: The running HealthMonitor.
+        """
+        self.disable_health()
+        self.health = HealthMonitor(self, **options)
+        self.health.start()
+        return self.health
+
+    def disable_health(self):
+        """
+        Removes the HealthMonitor and restores the controller's timeout.
+        """
+        if self.health is not None:
+            self.health.stop()
+            self.health = None
+
+    def enable_thermal(self, **options):
+        """
+        Installs a ThermalLimiter: a thermal model of every servo, fed by the
+        telemetry sweeps, that scales goal speeds, torque limits and hold times
+        down as a finger approaches its temperature limit.
+
+        The model only advances with read_telemetry(), so keep telemetry running
+        (e.g. start_telemetry(rate_hz=10)).
+
+        :param options: Options of amazingctrl.thermal.ThermalLimiter, e.g.
+                        limit=65, soft_limit=55, horizon=30.
+        :return: The running ThermalLimiter.
+        """
+        self.disable_thermal()
+        self.thermal = ThermalLimiter(self, **options)
+        self.thermal.start()
+        return self.thermal
+
+    def disable_thermal(self):
+        """
+        Removes the ThermalLimiter, restores the full torque limit and resends the unscaled goal speeds.
+        """
+        if self.thermal is not None:
+            thermal, self.thermal = self.thermal, None
+            thermal.stop()
+            with self._goal_lock:
+                self._send_goals(np.arange(NUM_MOTORS))
+
+    def _call_motor(self, motor_id, method, *args, deadline=None):
+        """
+        Calls controller.<method>(motor_id, *args), through the HealthMonitor if one is installed.
+
+        :param deadline: Optional time.monotonic() of the current sweep's budget (with a HealthMonitor).
+        """
+        if self.health is not None:
+            return self.health.call(motor_id, method, *args, deadline=deadline)
+        with self._bus_lock:
+            return getattr(self.controller, method)(motor_id, *args)
+
+    def _restore_motors(self, motor_ids):
+        """
+        Rewrites the goal and torque state of servos that came back (see HealthMonitor).
+        """
+        indices = np.asarray(motor_ids) - 1
+        with self._goal_lock, self._bus_lock:
+            self._shadow_position[indices] = -1
+            self._shadow_speed[indices] = -1
+            self._shadow_torque[indices] = -1
+            if self.thermal is not None:
+                self.thermal.invalidate(indices)
+            self._send_goals(indices)
+            if self._torque_enabled:
+                self._sync_write_torque_enable(1)
+
+    def _open_controller(self):
+        return Scs0009PyController(
+            serial_port=self.port,
+            baudrate=1000000,
+            timeout=self._bus_timeout,
+        )
+
+    def _timeout_in_use(self):
+        """The reply timeout the controller should have outside probe()."""
+        return self.health.call_timeout if self.health is not None else self._bus_timeout
+
+    def _set_timeout(self, timeout):
+        """Sets the reply timeout of the current controller, if it supports one."""
+        set_timeout = getattr(self.controller, "set_timeout", None)
+        if set_timeout is not None:
+            with self._bus_lock:
+                set_timeout(timeout)
+
+    def _set_controller(self, controller):
+        """Installs a new transport, keeping metrics and the health timeouts."""
+        metrics = self.metrics
+        self.controller = InstrumentedController(controller, metrics) if metrics is not None else controller
+        if self.health is not None:
+            self.health.apply_timeout()
+
+    def _close_controller(self):
+        """Closes the current transport; a failure to close is reported, not raised."""
+        controller = self.controller
+        if isinstance(controller, InstrumentedController):
+            controller = controller.controller
+        close = getattr(controller, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as error:
+            print(f"Failed to close {self.port}: {error}")
+
+    def start(self, probe=True):
         """
         Starts the connection and enables torque for all motors.
+        Reopens the port if stop() closed it.
+
+        :param probe: Check which servos answer first (see probe()) and report missing ones.
         """
-        # In a real scenario, you might need to check the connection status.
-        # For now, we assume the connection is successful if no exception is raised.
-        for i in range(1, 9):
-            self.controller.write_torque_enable(i, 1)
-            time.sleep(0.01) # Small delay between commands
+        if self._closed:
+            with self._bus_lock:
+                self._set_controller(self._open_controller())
+                self._closed = False
+        if probe:
+            found = self.probe()
+            missing = [motor_id for motor_id in MOTOR_IDS if motor_id not in found]
+            if missing:
+                print(f"Warning: motors {missing} did not respond.")
+        self._sync_write_torque_enable(1)
+        self._torque_enabled = True
         print("AmazingHand started and torque enabled.")
 
-    def stop(self):
+    def stop(self, close=True):
         """
         Disables torque for all motors and closes the connection.
+
+        :param close: Close the serial port, if the hand opened it. Pass False to
+                      keep reading the released servos (e.g. while calibrating).
         """
-        for i in range(1, 9):
-            self.controller.write_torque_enable(i, 3) # Use 3 to free the motors
-            time.sleep(0.01)
-        # The rustypot library doesn't have an explicit close() method,
-        # but disabling torque is the main safety action.
+        self.stop_telemetry()
+        self.stop_polling()
+        # Always send the release, whatever the shadow says, and forget what
+        # the servos hold: they may be power-cycled before the next start().
+        self.invalidate_shadow()
+        self._sync_write_torque_enable(3) # Use 3 to free the motors
+        self._torque_enabled = False
+        self.invalidate_shadow()
+        if close and self._owns_controller:
+            with self._bus_lock:
+                self._close_controller()
+                self._closed = True
         print("AmazingHand stopped and torque disabled.")
 
-    def _move_finger(self, motor_ids, angles, speed):
+    def set_pose(self, positions, speeds=None):
         """
-        Internal helper function to move a finger's servos.
+        Sends goal positions and speeds for all 8 servos in a single sync-write frame.
+
+        :param positions: 8 servo angles in degrees, ordered index (1, 2), middle (3, 4),
+                          ring (5, 6), thumb (7, 8), as passed to index()/middle()/ring()/thumb().
+        :param speeds: One speed for every servo, or a list of 8 speeds. Defaults to MAX_SPEED.
+        :raises ValueError: If a position or speed is NaN or infinite.
         """
-        motor1_id, motor2_id = motor_ids
-        angle1, angle2 = angles
-        cal_offset1, cal_offset2 = self.calibration_data[motor1_id-1], self.calibration_data[motor2_id-1]
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape != (NUM_MOTORS,):
+            raise ValueError(f"Expected {NUM_MOTORS} positions, got shape {positions.shape}")
+        if speeds is None:
+            speeds = self.MAX_SPEED
+        _check_finite(positions, speeds)
+        with self._goal_lock:
+            self._goal_angles[:] = positions
+            self._goal_speeds[:] = speeds
+            self._dirty[:] = True
+            if self._batch_depth == 0:
+                self.flush()
 
-        self.controller.write_goal_speed(motor1_id, speed)
-        self.controller.write_goal_speed(motor2_id, speed)
-        
-        pos1 = np.deg2rad(cal_offset1 + angle1)
-        pos2 = np.deg2rad(cal_offset2 + angle2)
+    def set_joints(self, joints, speeds=None):
+        """
+        Sends finger joint angles instead of servo angles, in one sync-write frame.
+
+        :param joints: (flexion, abduction) in degrees for each finger, shape (4, 2),
+                       ordered index, middle, ring, thumb. See amazingctrl.kinematics;
+                       the hand's side is taken into account.
+        :param speeds: As for set_pose().
+        """
+        self.set_pose(joint_to_servo(joints, self._side), speeds)
+
+    @contextmanager
+    def batch(self):
+        """
+        Coalesces the commands issued inside the block into one bus flush.
+
+        set_pose() and the finger/gesture methods only update the goal arrays
+        while a batch is open; the last value per motor is sent when it closes.
+
+            with hand.batch():
+                hand.index(90, -90, 3)
+                hand.thumb(0, -75, 7)
+
+        If the block raises, the goals it set are discarded: the goal arrays go
+        back to their values when the block opened and nothing is sent.
+
+        Goal updates from other threads (e.g. set_targets()) wait until the
+        batch has closed.
+        """
+        with self._goal_lock:
+            saved = self._goal_angles.copy(), self._goal_speeds.copy(), self._dirty.copy()
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._goal_angles[:], self._goal_speeds[:], self._dirty[:] = saved
+                raise
+            finally:
+                self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self):
+        """
+        Sends the goals of every motor changed since the last flush, in one sync-write frame.
+        """
+        with self._goal_lock:
+            indices = np.flatnonzero(self._dirty)
+            if indices.size == 0:
+                return
+            self._dirty[:] = False
+            self._send_goals(indices)
+
+    def set_targets(self, motor_ids, positions, speeds=None):
+        """
+        Sets the goals of some servos and sends them at once, safe to call from
+        any thread (e.g. a teleoperation writer).
+
+        Waits for a batch() open on another thread to close. Inside a batch on
+        the calling thread, the goals are sent when the batch closes.
+
+        :param motor_ids: Servo ids (1-8).
+        :param positions: One angle in degrees per id.
+        :param speeds: One speed for every servo, or one per id. Defaults to MAX_SPEED.
+        :return: The ids whose goal was written to the bus. Ids skipped because
+                 the servo is degraded or already holds the goal (see
+                 position_deadband) are not included.
+        :raises ValueError: If a position or speed is NaN or infinite.
+        """
+        indices = np.asarray(motor_ids) - 1
+        if speeds is None:
+            speeds = self.MAX_SPEED
+        _check_finite(positions, speeds)
+        with self._goal_lock:
+            self._goal_angles[indices] = positions
+            self._goal_speeds[indices] = speeds
+            if self._batch_depth:
+                self._dirty[indices] = True
+                return []
+            self._dirty[indices] = False
+            return (self._send_goals(indices) + 1).tolist()
+
+    def _send_goals(self, indices):
+        """
+        Writes the stored goal position and speed of the given servos in one sync-write frame.
+
+        :param indices: Indices into the 8-element pose arrays (motor id - 1).
+        """
+        calibration = self._calibration[indices]
+        pos_raw = encode_position(np.deg2rad(calibration + self._goal_angles[indices]))
+        speed_raw = encode_speed(self._goal_speeds[indices])
+        return self._write_goals(np.asarray(indices), pos_raw, speed_raw)
+
+    def _write_goal_block(self, ids, payloads):
+        """
+        Sends pre-packed goal blocks (see scs0009.pack_goal_block), skipping values the servos already hold.
+        """
+        pos_raw, speed_raw = unpack_goal_block(payloads)
+        return self._write_goals(np.asarray(ids) - 1, pos_raw, speed_raw)
+
+    def _write_goals(self, indices, pos_raw, speed_raw):
+        """
+        Sends the raw goals that differ from the shadow registers in a single sync-write frame.
 
-        self.controller.write_goal_position(motor1_id, pos1)
-        self.controller.write_goal_position(motor2_id, pos2)
-        time.sleep(0.005) # Short delay to ensure commands are sent
+        Positions within position_deadband of the last value sent count as
+        unchanged. Depending on what changed, the frame carries only goal
+        positions, only goal speeds, or the whole goal block.
+
+        :param indices: Indices into the 8-element pose arrays (motor id - 1).
+        :return: The indices whose goal position or speed was written.
+        """
+        if self.health is not None:
+            # Degraded servos are skipped; their goals are resent when they recover.
+            available = self.health.available(indices)
+            indices, pos_raw, speed_raw = indices[available], pos_raw[available], speed_raw[available]
+        if self.thermal is not None:
+            speed_raw = self.thermal.scale_speeds(indices, speed_raw)
+        deadband = np.deg2rad(self.position_deadband) * STEPS_PER_RAD
+        with self._bus_lock:
+            shadow_pos = self._shadow_position[indices]
+            shadow_speed = self._shadow_speed[indices]
+            pos_dirty = (shadow_pos < 0) | (np.abs(pos_raw - shadow_pos) > deadband)
+            speed_dirty = (shadow_speed < 0) | (speed_raw != shadow_speed)
+            sent_pos, sent_speed = self._sync_write_goals(indices, pos_raw, speed_raw, pos_dirty, speed_dirty)
+
+            stats = self._write_stats
+            stats["goal_position"]["sent"] += sent_pos
+            stats["goal_position"]["suppressed"] += len(indices) - sent_pos
+            stats["goal_speed"]["sent"] += sent_speed
+            stats["goal_speed"]["suppressed"] += len(indices) - sent_speed
+            if not (sent_pos or sent_speed):
+                stats["frames_suppressed"] += 1
+        if self._command_listeners:
+            now = time.monotonic()
+            for listener in self._command_listeners:
+                listener(now, self._goal_angles, self._goal_speeds)
+        return indices[pos_dirty | speed_dirty]
+
+    def _sync_write_goals(self, indices, pos_raw, speed_raw, pos_dirty, speed_dirty):
+        """
+        Writes the dirty goals with the cheapest frame(s) and updates the shadow.
+
+        :return: The number of goal positions and goal speeds written.
+        """
+        pos_idx = indices[pos_dirty]
+        speed_idx = indices[speed_dirty]
+        if not len(pos_idx) and not len(speed_idx):
+            return 0, 0
+        if not len(speed_idx):
+            self.controller.sync_write_raw_data((pos_idx + 1).tolist(), ADDR_GOAL_POSITION, pack_words(pos_raw[pos_dirty]))
+            self._shadow_position[pos_idx] = pos_raw[pos_dirty]
+            return len(pos_idx), 0
+        if not len(pos_idx):
+            self.controller.sync_write_raw_data((speed_idx + 1).tolist(), ADDR_GOAL_SPEED, pack_words(speed_raw[speed_dirty]))
+            self._shadow_speed[speed_idx] = speed_raw[speed_dirty]
+            return 0, len(speed_idx)
+
+        # Both changed: one goal block frame for every motor with a change, or
+        # two narrow frames if that is fewer bytes on the wire.
+        either = pos_dirty | speed_dirty
+        block_bytes = sync_write_frame_bytes(int(either.sum()), GOAL_BLOCK_SIZE)[0]
+        split_bytes = sync_write_frame_bytes(len(pos_idx), 2)[0] + sync_write_frame_bytes(len(speed_idx), 2)[0]
+        if split_bytes < block_bytes:
+            # Speeds first, so the servos never start the new move at the old speed.
+            self._sync_write_goals(indices, pos_raw, speed_raw, np.zeros_like(pos_dirty), speed_dirty)
+            self._sync_write_goals(indices, pos_raw, speed_raw, pos_dirty, np.zeros_like(speed_dirty))
+            return len(pos_idx), len(speed_idx)
+        ids = indices[either]
+        self.controller.sync_write_raw_data((ids + 1).tolist(), GOAL_BLOCK_ADDR,
+                                            pack_goal_block(pos_raw[either], speed_raw[either]))
+        self._shadow_position[ids] = pos_raw[either]
+        self._shadow_speed[ids] = speed_raw[either]
+        return len(ids), len(ids)
+
+    def _sync_write_torque_enable(self, value):
+        """
+        Writes torque_enable to every servo that does not already hold `value`, in one sync-write frame.
+
+        :return: True if a frame was sent.
+        """
+        with self._bus_lock:
+            indices = np.flatnonzero(self._shadow_torque != value)
+            stats = self._write_stats["torque_enable"]
+            stats["suppressed"] += NUM_MOTORS - len(indices)
+            if not len(indices):
+                return False
+            self.controller.sync_write_raw_data((indices + 1).tolist(), ADDR_TORQUE_ENABLE,
+                                                [bytes([value])] * len(indices))
+            self._shadow_torque[indices] = value
+            stats["sent"] += len(indices)
+        return True
+
+    def probe(self, ids=MOTOR_IDS, timeout=0.02):
+        """
+        Checks which servos answer, with a short timeout so missing ones cost
+        milliseconds instead of the full bus timeout.
+
+        The bus is half duplex, so servos are queried one after the other; each
+        costs a single read of its firmware version and model number.
+
+        :param ids: Servo ids to query.
+        :param timeout: Reply timeout per servo during the probe, in seconds.
+        :return: A dict of id -> {"firmware": "major.minor", "model": int, "latency": seconds}
+                 for every servo that answered. Also stored in `present_ids`.
+        """
+        found = {}
+        with self._bus_lock:
+            controller = self.controller
+            self._set_timeout(timeout)
+            try:
+                for motor_id in ids:
+                    start = time.perf_counter()
+                    try:
+                        data = controller.read_raw_data(motor_id, IDENTITY_BLOCK_ADDR, IDENTITY_BLOCK_SIZE)
+                    except Exception:
+                        continue
+                    found[motor_id] = {
+                        "firmware": f"{data[0]}.{data[1]}",
+                        "model": (data[3] << 8) | data[4],
+                        "latency": time.perf_counter() - start,
+                    }
+            finally:
+                self._set_timeout(self._timeout_in_use())
+        self.present_ids = tuple(found)
+        return found
+
+    def reconnect(self, controller=None, timeout=2.0):
+        """
+        Reopens the bus after a disconnection (e.g. a USB glitch) and restores
+        the commanded state: goal positions and speeds, then torque.
+
+        Background telemetry and polling keep running and resume on the new bus.
+
+        :param controller: A new transport to use. By default the serial port is
+                           reopened, which is only possible if the hand opened it.
+        :param timeout: How long to keep retrying to reopen the port, in seconds.
+        :return: The time taken, in seconds.
+        """
+        if controller is None and not self._owns_controller:
+            raise RuntimeError("This hand was given its controller; pass a new one to reconnect()")
+        start = time.monotonic()
+        with self._goal_lock, self._bus_lock:
+            # Close the old port first, or reopening it may fail with "port is in use".
+            self._close_controller()
+            if controller is None:
+                while True:
+                    try:
+                        controller = self._open_controller()
+                        break
+                    except Exception as error:
+                        if time.monotonic() - start >= timeout:
+                            # The closed controller stays in place: later calls
+                            # fail as bus errors and reconnect() can be retried.
+                            raise ConnectionError(f"Could not reopen {self.port} within {timeout} s: {error}") from error
+                        time.sleep(0.05)
+            self._set_controller(controller)
+            self._closed = False
+
+            # The servos may have been power-cycled: resend everything.
+            self.invalidate_shadow()
+            self._dirty[:] = False
+            self._send_goals(np.arange(NUM_MOTORS))
+            if self._torque_enabled:
+                self._sync_write_torque_enable(1)
+        elapsed = time.monotonic() - start
+        print(f"AmazingHand reconnected in {elapsed * 1e3:.1f} ms.")
+        return elapsed
+
+    def invalidate_shadow(self):
+        """
+        Forgets the register values the servos are assumed to hold, so the next
+        command of each kind is sent in full. Called by stop() and on reconnect.
+        """
+        with self._bus_lock:
+            self._shadow_position[:] = -1
+            self._shadow_speed[:] = -1
+            self._shadow_torque[:] = -1
+            if self.thermal is not None:
+                self.thermal.invalidate()
+
+    def resync(self):
+        """
+        Forces the current goal pose to be rewritten to every servo, e.g. after
+        a servo was power-cycled or written to by another program.
+        """
+        with self._goal_lock:
+            self.invalidate_shadow()
+            self._dirty[:] = False
+            self._send_goals(np.arange(NUM_MOTORS))
+
+    def write_stats(self):
+        """
+        :return: Per register ("goal_position", "goal_speed", "torque_enable"), the
+                 number of values sent and suppressed because the servo already
+                 held them, plus the number of whole frames suppressed.
+        """
+        with self._bus_lock:
+            return {name: dict(value) if isinstance(value, dict) else value
+                    for name, value in self._write_stats.items()}
+
+    def reset_write_stats(self):
+        """Clears the counters of write_stats()."""
+        self._write_stats = {
+            "goal_position": {"sent": 0, "suppressed": 0},
+            "goal_speed": {"sent": 0, "suppressed": 0},
+            "torque_enable": {"sent": 0, "suppressed": 0},
+            "frames_suppressed": 0,
+        }
+
+    def add_command_listener(self, listener):
+        """
+        Registers listener(timestamp, positions, speeds), called after every goal frame is sent.
+
+        `positions` and `speeds` are the full 8-element goal arrays; copy them if they are kept.
+        """
+        self._command_listeners.append(listener)
+
+    def remove_command_listener(self, listener):
+        if listener in self._command_listeners:
+            self._command_listeners.remove(listener)
+
+    def add_telemetry_listener(self, listener):
+        """
+        Registers listener(timestamp, telemetry), called after every read_telemetry() sweep.
+
+        An exception raised by a listener is counted in `listener_errors` and does
+        not reach the caller of read_telemetry() or the other listeners.
+        """
+        self._telemetry_listeners.append(listener)
+
+    def remove_telemetry_listener(self, listener):
+        if listener in self._telemetry_listeners:
+            self._telemetry_listeners.remove(listener)
+
+    def get_goal_pose(self):
+        """
+        Returns the last commanded pose.
+
+        :return: A (positions, speeds) tuple of 8-element arrays, positions in degrees.
+        """
+        with self._goal_lock:
+            return self._goal_angles.copy(), self._goal_speeds.copy()
+
+    def move_to(self, positions, duration, rate_hz=100, method="min_jerk"):
+        """
+        Moves smoothly from the last commanded pose to `positions` in `duration` seconds.
+
+        Blocks until the trajectory has been streamed. See play_trajectory().
+
+        :param positions: 8 target angles in degrees, as for set_pose().
+        :param duration: Transition time in seconds.
+        :param rate_hz: Setpoint streaming rate.
+        :param method: "min_jerk" or "cubic".
+        """
+        self.flush()
+        trajectory = plan([self.get_goal_pose()[0], positions], [duration], rate_hz=rate_hz, method=method)
+        self.play_trajectory(trajectory)
+
+    def compile_trajectory(self, trajectory, speeds=None):
+        """
+        Converts every setpoint of a Trajectory to a ready-made goal frame, calibration included.
+
+        :param trajectory: A Trajectory from amazingctrl.trajectory.
+        :param speeds: Optional goal speed(s) in rad/s. By default the servo speed
+                       follows the trajectory velocity (see Trajectory.servo_speeds()).
+        :return: A CompiledTrajectory.
+        """
+        n = len(trajectory)
+        if speeds is None:
+            speeds = trajectory.servo_speeds()
+        speeds = np.broadcast_to(np.asarray(speeds, dtype=float), (n, NUM_MOTORS))
+        pos_raw = encode_position(np.deg2rad(self._calibration + trajectory.positions))
+        speed_raw = encode_speed(speeds)
+        payloads = pack_goal_block(pos_raw.ravel(), speed_raw.ravel())
+        return CompiledTrajectory(trajectory.positions, speeds, payloads, trajectory.rate_hz)
+
+    def send_trajectory_sample(self, compiled, k):
+        """
+        Sends sample k of a CompiledTrajectory in one sync-write frame.
+        """
+        with self._goal_lock:
+            self._goal_angles[:] = compiled.positions[k]
+            self._goal_speeds[:] = compiled.speeds[k]
+            self._dirty[:] = False
+            self._write_goal_block(list(MOTOR_IDS), compiled.frame(k))
+
+    def play_trajectory(self, trajectory, speeds=None):
+        """
+        Streams a precomputed Trajectory to the servos at its sample rate.
+
+        Every setpoint is converted to raw register values (calibration included)
+        before streaming starts, so each tick only sends a ready-made frame.
+
+        :param trajectory: A Trajectory, or a CompiledTrajectory from compile_trajectory().
+        :param speeds: Optional goal speed(s) in rad/s, see compile_trajectory().
+        """
+        if isinstance(trajectory, CompiledTrajectory):
+            compiled = trajectory
+        else:
+            compiled = self.compile_trajectory(trajectory, speeds)
+
+        def tick(t):
+            k = compiled.sample_at(t)
+            self.send_trajectory_sample(compiled, k)
+            if k == len(compiled) - 1:
+                loop.stop()
+
+        loop = ControlLoop(tick, rate_hz=compiled.rate_hz)
+        loop.run()
+
+    def play_sequence(self, script, limits=None):
+        """
+        Plans a gesture-sequence script ahead of time and streams it at a fixed rate.
+
+        :param script: A script dict or a JSON/YAML file path, see amazingctrl.sequence.
+        :param limits: Optional (lower, upper) joint limits in degrees, checked before anything is sent.
+        :return: The planned Trajectory.
+        """
+        self.flush()
+        return run_sequence(self, script, limits=limits)
+
+    def grasp(self, target="close", fingers=None, thresholds=200, **options):
+        """
+        Closes the fingers toward `target` and stops each one when its load shows contact.
+
+        See amazingctrl.grasp.grasp() for the options and the returned contact report.
+        """
+        return grasp(self, target=target, fingers=fingers, thresholds=thresholds, **options)
+
+    def _move_finger(self, motor_ids, angles, speed):
+        """
+        Internal helper function to move a finger's servos.
+        """
+        indices = np.asarray(motor_ids) - 1
+        _check_finite(angles, speed)
+        with self._goal_lock:
+            self._goal_angles[indices] = angles
+            self._goal_speeds[indices] = speed
+            self._dirty[indices] = True
+            if self._batch_depth == 0:
+                self.flush()
 
     def index(self, angle_1, angle_2, speed):
         self._move_finger([1, 2], [angle_1, angle_2], speed)
@@ -83,63 +889,68 @@ class AmazingHand:
 
     # --- Pre-defined Gestures ---
 
+    def register_gesture(self, name, positions, speeds=None, left_positions=None):
+        """
+        Adds a custom gesture to this hand, callable with gesture(name).
+
+        :param name: Gesture name, e.g. "thumbs_up".
+        :param positions: 8 servo angles in degrees for the right hand.
+        :param speeds: One speed for every servo, or 8 speeds. Defaults to MAX_SPEED.
+        :param left_positions: Optional left-hand angles; mirrored from `positions` if omitted.
+        """
+        if speeds is None:
+            speeds = self.MAX_SPEED
+        self._custom_gestures[name] = Gesture(name, positions, speeds, left_positions)
+        self._gesture_table = None
+
+    @property
+    def gestures(self):
+        """The compiled gesture table for the current calibration and side."""
+        if self._gesture_table is None or self._gesture_table.version != registry_version():
+            gestures = dict(GESTURES)
+            gestures.update(self._custom_gestures)
+            self._gesture_table = GestureTable(gestures, self._calibration, self._side)
+        return self._gesture_table
+
+    def gesture(self, name):
+        """
+        Performs a built-in or registered gesture with one sync-write frame.
+
+        :param name: Gesture name, e.g. "open", "victory" or a registered custom gesture.
+        """
+        compiled = self.gestures[name]
+        with self._goal_lock:
+            self._goal_angles[:] = compiled.positions
+            self._goal_speeds[:] = compiled.speeds
+            if self._batch_depth:
+                self._dirty[:] = True
+                return
+            self._dirty[:] = False
+            self._write_goal_block(self.gestures.ids, compiled.payloads)
+
     def open(self):
-        self.index(-35, 35, self.MAX_SPEED)
-        self.middle(-35, 35, self.MAX_SPEED)
-        self.ring(-35, 35, self.MAX_SPEED)
-        self.thumb(-35, 35, self.MAX_SPEED)
+        self.gesture("open")
 
     def close(self):
-        self.index(90, -90, self.CLOSE_SPEED)
-        self.middle(90, -90, self.CLOSE_SPEED)
-        self.ring(90, -90, self.CLOSE_SPEED)
-        self.thumb(90, -90, self.CLOSE_SPEED + 1)
+        self.gesture("close")
 
     def point(self):
-        self.index(-40, 40, self.MAX_SPEED)
-        self.middle(90, -90, self.MAX_SPEED)
-        self.ring(90, -90, self.MAX_SPEED)
-        self.thumb(90, -90, self.MAX_SPEED)
+        self.gesture("point")
 
     def victory(self):
-        if self.side == 1: # Right Hand
-            self.index(-15, 65, self.MAX_SPEED)
-            self.middle(-65, 15, self.MAX_SPEED)
-        else: # Left Hand
-            self.index(-65, 15, self.MAX_SPEED)
-            self.middle(-15, 65, self.MAX_SPEED)
-        self.ring(90, -90, self.MAX_SPEED)
-        self.thumb(90, -90, self.MAX_SPEED)
+        self.gesture("victory")
 
     def ok(self):
-        if self.side == 1: # Right Hand
-            self.index(50, -50, self.MAX_SPEED)
-            self.middle(0, 0, self.MAX_SPEED)
-            self.ring(-20, 20, self.MAX_SPEED)
-            self.thumb(65, 12, self.MAX_SPEED)
-        else: # Left Hand
-            self.index(50, -50, self.MAX_SPEED)
-            self.middle(0, 0, self.MAX_SPEED)
-            self.ring(-20, 20, self.MAX_SPEED)
-            self.thumb(-12, -65, self.MAX_SPEED)
+        self.gesture("ok")
 
     def pinch(self):
-        if self.side == 1: # Right Hand
-            self.index(90, -90, self.MAX_SPEED)
-            self.middle(90, -90, self.MAX_SPEED)
-            self.ring(90, -90, self.MAX_SPEED)
-            self.thumb(0, -75, self.MAX_SPEED)
-        else: # Left Hand
-            self.index(90, -90, self.MAX_SPEED)
-            self.middle(90, -90, self.MAX_SPEED)
-            self.ring(90, -90, self.MAX_SPEED)
-            self.thumb(75, 5, self.MAX_SPEED)
+        self.gesture("pinch")
 
     # --- Data Reading Methods ---
     
     def read_position(self, motor_id):
         """Reads the present position of a single motor in degrees."""
-        pos_rad = self.controller.read_present_position(motor_id)
+        pos_rad = self._call_motor(motor_id, "read_present_position")
         
         # Handle different return types from rustypot
         if isinstance(pos_rad, (list, tuple)):
@@ -157,7 +968,7 @@ class AmazingHand:
 
     def read_speed(self, motor_id):
         """Reads the present speed of a single motor."""
-        speed = self.controller.read_present_speed(motor_id)
+        speed = self._call_motor(motor_id, "read_present_speed")
         
         # Handle different return types from rustypot
         if isinstance(speed, (list, tuple)):
@@ -172,7 +983,7 @@ class AmazingHand:
 
     def read_load(self, motor_id):
         """Reads the present load of a single motor."""
-        load = self.controller.read_present_load(motor_id)
+        load = self._call_motor(motor_id, "read_present_load")
         
         # Handle different return types from rustypot
         if isinstance(load, (list, tuple)):
@@ -187,7 +998,7 @@ class AmazingHand:
 
     def read_voltage(self, motor_id):
         """Reads the present voltage of a single motor."""
-        voltage = self.controller.read_present_voltage(motor_id)
+        voltage = self._call_motor(motor_id, "read_present_voltage")
         
         # Handle different return types from rustypot
         if isinstance(voltage, (list, tuple)):
@@ -202,7 +1013,7 @@ class AmazingHand:
 
     def read_temperature(self, motor_id):
         """Reads the present temperature of a single motor."""
-        temp = self.controller.read_present_temperature(motor_id)
+        temp = self._call_motor(motor_id, "read_present_temperature")
         
         # Handle different return types from rustypot
         if isinstance(temp, (list, tuple)):
@@ -215,23 +1026,193 @@ class AmazingHand:
             return float(temp.item())
         return float(temp)
 
+    def read_telemetry(self):
+        """
+        Reads the present state of all 8 motors with one block read per motor.
+
+        Position, speed, load, voltage and temperature sit in one contiguous
+        register block, so each motor costs a single transaction instead of five.
+
+        :return: A numpy structured array (see TELEMETRY_DTYPE) with one row per motor.
+                 Rows of motors that did not answer have ok=False and NaN values.
+        """
+        block = np.zeros((NUM_MOTORS, PRESENT_BLOCK_SIZE), dtype=np.uint8)
+        ok = np.zeros(NUM_MOTORS, dtype=bool)
+        deadline = self.health.cycle_deadline() if self.health is not None else None
+        for i, motor_id in enumerate(MOTOR_IDS):
+            try:
+                block[i] = self._call_motor(motor_id, "read_raw_data", PRESENT_BLOCK_ADDR, PRESENT_BLOCK_SIZE,
+                                            deadline=deadline)
+                ok[i] = True
+            except Exception:
+                pass
+        telemetry = decode_present_block(block, ok)
+        if self._telemetry_listeners:
+            now = time.monotonic()
+            for listener in self._telemetry_listeners:
+                try:
+                    listener(now, telemetry)
+                except Exception as error:
+                    # Keep sweeping: the telemetry thread and the other listeners must not stop.
+                    if not self.listener_errors:
+                        print(f"Telemetry listener {listener!r} failed: {error!r}")
+                    self.listener_errors += 1
+        return telemetry
+
+    def _read_motion_state(self):
+        """
+        Reads position, speed and load of all motors, one 6-byte block read per motor.
+
+        :return: A TELEMETRY_DTYPE array; voltage and temperature are not read (0).
+        """
+        block = np.zeros((NUM_MOTORS, PRESENT_BLOCK_SIZE), dtype=np.uint8)
+        ok = np.zeros(NUM_MOTORS, dtype=bool)
+        deadline = self.health.cycle_deadline() if self.health is not None else None
+        for i, motor_id in enumerate(MOTOR_IDS):
+            try:
+                block[i, :MOTION_BLOCK_SIZE] = self._call_motor(
+                    motor_id, "read_raw_data", PRESENT_BLOCK_ADDR, MOTION_BLOCK_SIZE, deadline=deadline)
+                ok[i] = True
+            except Exception:
+                pass
+        return decode_present_block(block, ok)
+
+    def wait_settled(self, tol_deg=2.0, timeout=3.0, speed_tol=0.05, stall_load=300,
+                     stall_time=0.1, poll_interval=0.005):
+        """
+        Waits until every joint has reached its goal, or has stalled against something.
+
+        A joint is "settled" when it is within `tol_deg` of its goal and its speed
+        is below `speed_tol`. It is "stalled" when it is still out of tolerance but
+        has not moved for `stall_time` seconds while its load is at least
+        `stall_load`: a finger blocked by an object, which will never arrive.
+        A joint whose read fails is reported as "error" and not waited for.
+        The wait ends as soon as every joint is settled, stalled or in error.
+
+        :param tol_deg: Position tolerance in degrees.
+        :param timeout: Maximum wait in seconds.
+        :param speed_tol: Speed (rad/s) below which a joint counts as stopped.
+        :param stall_load: Absolute present_load (raw, 0-1000) from which a stopped joint counts as stalled.
+        :param stall_time: How long a joint must be stopped under load to count as stalled.
+        :param poll_interval: Pause between two reads of all motors, in seconds.
+        :return: A dict with "settled" (all joints arrived), "stalled" (ids of stalled
+                 joints), "timed_out", "elapsed" (seconds) and "joints": one dict per
+                 motor with id, status ("settled", "moving", "stalled" or "error"),
+                 position, target, error (degrees), speed and load.
+        """
+        self.flush()
+        settling = SettleTracker(self._calibration + self.get_goal_pose()[0], tol_deg, speed_tol, stall_load, stall_time)
+        start = time.monotonic()
+        while True:
+            state = self._read_motion_state()
+            now = time.monotonic()
+            done = settling.update(state, now)
+            timed_out = now - start >= timeout
+            if done or timed_out:
+                break
+            time.sleep(poll_interval)
+        return settling.result(now - start, timed_out)
+
+    def move_and_wait(self, positions, tol_deg=2.0, timeout=3.0, speeds=None, **kwargs):
+        """
+        Sends a pose and waits until the hand has arrived (see wait_settled()).
+
+        :param positions: 8 servo angles in degrees, or a gesture name.
+        :param tol_deg: Position tolerance in degrees.
+        :param timeout: Maximum wait in seconds.
+        :param speeds: Goal speed(s), as for set_pose(); ignored for gestures.
+        :param kwargs: Further options of wait_settled().
+        :return: The result dict of wait_settled().
+        """
+        if isinstance(positions, str):
+            self.gesture(positions)
+        else:
+            self.set_pose(positions, speeds)
+        return self.wait_settled(tol_deg=tol_deg, timeout=timeout, **kwargs)
+
+    def start_telemetry(self, rate_hz=50, history=1000):
+        """
+        Starts sampling read_telemetry() in a background thread.
+
+        Samples go into a preallocated ring buffer; use latest() and window(seconds)
+        on the returned sampler to read them. Bus access is shared with the command
+        methods through a lock, so reads and writes never interleave mid-frame.
+
+        :param rate_hz: Sampling rate in Hz.
+        :param history: Number of samples kept in the ring buffer.
+        :return: The running TelemetrySampler.
+        """
+        self.stop_telemetry()
+        self.telemetry_sampler = TelemetrySampler(self, rate_hz=rate_hz, history=history)
+        self.telemetry_sampler.start()
+        return self.telemetry_sampler
+
+    def stop_telemetry(self):
+        """
+        Stops the background telemetry sampler, if one is running.
+        """
+        if self.telemetry_sampler is not None:
+            self.telemetry_sampler.stop()
+            self.telemetry_sampler = None
+
+    def start_polling(self, rates=None, overrides=None):
+        """
+        Starts polling each telemetry field at its own rate in a background thread.
+
+        Due fields are packed into the fewest block reads per motor, and slow
+        fields (voltage, temperature) are served from a cache tagged with the
+        sample age, leaving most of the bus to position and load.
+
+        :param rates: Dict of field -> rate in Hz, e.g. {"position_deg": 200, "temperature": 1};
+                      unlisted fields keep the defaults of telemetry.DEFAULT_POLL_RATES.
+        :param overrides: Optional dict of motor id -> {field: rate} for individual motors.
+        :return: The running PollingScheduler.
+        """
+        self.stop_polling()
+        self.polling_scheduler = PollingScheduler(self, rates=rates, overrides=overrides)
+        self.polling_scheduler.start()
+        return self.polling_scheduler
+
+    def stop_polling(self):
+        """
+        Stops the polling scheduler, if one is running.
+        """
+        if self.polling_scheduler is not None:
+            self.polling_scheduler.stop()
+            self.polling_scheduler = None
+
     def get_all_motors_status(self):
         """
         Retrieves a complete status dictionary for all 8 motors.
+
+        This is a list-of-dicts view of read_telemetry(). While a polling scheduler
+        is running (see start_polling()) the values come from its cache instead of
+        the bus, and each dict gets an "age" entry: the age in seconds of its oldest field.
         """
         status_list = []
-        for i in range(1, 9):
-            try:
-                status = {
-                    "id": i,
-                    "position": round(self.read_position(i), 2),
-                    "speed": self.read_speed(i),
-                    "load": self.read_load(i),
-                    "voltage": self.read_voltage(i),
-                    "temperature": self.read_temperature(i),
-                }
-                status_list.append(status)
-            except Exception as e:
-                print(f"Could not read status for motor {i}: {e}")
-                status_list.append({"id": i, "error": "read failed"})
+        ages = None
+        if self.polling_scheduler is not None:
+            telemetry, ages = self.polling_scheduler.latest()
+        else:
+            telemetry = self.read_telemetry()
+        for i, row in enumerate(telemetry):
+            motor_id = int(row["id"])
+            if not row["ok"]:
+                if self.health is not None and self.health.is_degraded(motor_id):
+                    # Already reported once, when it was degraded.
+                    status_list.append({"id": motor_id, "error": "degraded"})
+                    continue
+                print(f"Could not read status for motor {motor_id}")
+                status_list.append({"id": motor_id, "error": "read failed"})
+                continue
+            status_list.append({
+                "id": motor_id,
+                "position": round(float(row["position_deg"]), 2),
+                "speed": float(row["speed"]),
+                "load": float(row["load"]),
+                "voltage": float(row["voltage"]),
+                "temperature": float(row["temperature"]),
+            })
+            if ages is not None:
+                status_list[-1]["age"] = float(ages[i].max())
         return status_list
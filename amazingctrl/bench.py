@@ -0,0 +1,256 @@
+"""
+Throughput and latency benchmarks for the AmazingHand SDK.
+
+Runs against the simulated bus by default, so it works on a CI machine with no
+hardware, or against a real hand with --port:
+
+    python -m amazingctrl.bench
+    python -m amazingctrl.bench --port /dev/ttyACM0
+    python -m amazingctrl.bench --json results.json --baseline baseline.json
+
+The legacy_* entries reproduce the per-motor command and read paths the SDK
+used before set_pose() and read_telemetry(), for comparison.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from .amazingctrl import AmazingHand
+from .scs0009 import ADDR_PRESENT_POSITION, MOTOR_IDS
+from .sim import SimulatedController
+
+
+def legacy_gesture(hand, positions, speeds):
+    """
+    Sends a pose the way the SDK originally did: for each finger, two goal speed
+    writes, two goal position writes and a 5 ms sleep.
+    """
+    calibration = hand.calibration_data
+    speeds = np.broadcast_to(speeds, (len(MOTOR_IDS),))
+    for first in range(0, len(MOTOR_IDS), 2):
+        ids = MOTOR_IDS[first:first + 2]
+        for motor_id in ids:
+            hand.controller.write_goal_speed(motor_id, float(speeds[motor_id - 1]))
+        for motor_id in ids:
+            hand.controller.write_goal_position(
+                motor_id, float(np.deg2rad(calibration[motor_id - 1] + positions[motor_id - 1])))
+        time.sleep(0.005)
+
+
+def legacy_status(hand):
+    """
+    Reads the status of all motors the way the SDK originally did: five register reads per motor.
+    """
+    status_list = []
+    for motor_id in MOTOR_IDS:
+        try:
+            status_list.append({
+                "id": motor_id,
+                "position": round(hand.read_position(motor_id), 2),
+                "speed": hand.read_speed(motor_id),
+                "load": hand.read_load(motor_id),
+                "voltage": hand.read_voltage(motor_id),
+                "temperature": hand.read_temperature(motor_id),
+            })
+        except Exception:
+            status_list.append({"id": motor_id, "error": "read failed"})
+    return status_list
+
+
+def summarize(durations):
+    """
+    :param durations: Per-call durations in seconds.
+    :return: Calls per second and latency percentiles (seconds).
+    """
+    durations = np.asarray(durations, dtype=float)
+    p50, p90, p99 = np.percentile(durations, [50, 90, 99])
+    return {
+        "calls": int(durations.size),
+        "rate_hz": float(durations.size / durations.sum()),
+        "mean": float(durations.mean()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(durations.max()),
+    }
+
+
+def measure(hand, func, iterations, warmup=3):
+    """
+    Times `iterations` calls of func() and, when the controller counts them, the bus traffic per call.
+    """
+    for _ in range(warmup):
+        func()
+    controller = hand.controller
+    if hasattr(controller, "reset_stats"):
+        controller.reset_stats()
+    durations = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations[i] = time.perf_counter() - start
+    result = summarize(durations)
+    if hasattr(controller, "stats"):
+        stats = controller.stats()
+        result["frames_per_call"] = stats["frames"] / iterations
+        result["bytes_per_call"] = (stats["bytes_sent"] + stats["bytes_received"]) / iterations
+    return result
+
+
+def bench_commands(hand, iterations=200):
+    """Gestures per second through the legacy per-motor path, set_pose() and gesture()."""
+    open_pose = hand.gestures["open"]
+    close_pose = hand.gestures["close"]
+    toggle = [False]
+
+    def alternate(send):
+        toggle[0] = not toggle[0]
+        pose = open_pose if toggle[0] else close_pose
+        send(pose)
+
+    return {
+        "legacy_gesture": measure(hand, lambda: alternate(
+            lambda pose: legacy_gesture(hand, pose.positions, pose.speeds)), iterations),
+        "set_pose": measure(hand, lambda: alternate(
+            lambda pose: hand.set_pose(pose.positions, pose.speeds)), iterations),
+        "gesture": measure(hand, lambda: alternate(
+            lambda pose: hand.gesture("open" if pose is open_pose else "close")), iterations),
+    }
+
+
+def bench_telemetry(hand, iterations=200):
+    """Telemetry sweeps per second through the legacy per-register path and read_telemetry()."""
+    return {
+        "legacy_status": measure(hand, lambda: legacy_status(hand), iterations),
+        "read_telemetry": measure(hand, hand.read_telemetry, iterations),
+        "get_all_motors_status": measure(hand, hand.get_all_motors_status, iterations),
+    }
+
+
+def bench_round_trip(hand, iterations=200, motor_id=1):
+    """Round-trip time of one register read (present_position of one motor): request, reply and decoding."""
+    return measure(hand, lambda: hand._call_motor(motor_id, "read_raw_data", ADDR_PRESENT_POSITION, 2),
+                   iterations)
+
+
+def bench_latency(hand, iterations=20, step_deg=10.0, threshold_deg=1.0, timeout=1.0):
+    """
+    Command-to-motion latency: time from set_pose() until motor 1 has moved by `threshold_deg`.
+    """
+    latencies = []
+    base = hand.get_goal_pose()[0]
+    for i in range(iterations):
+        target = base.copy()
+        target[0] += step_deg if i % 2 == 0 else 0.0
+        before = hand.read_position(1)
+        start = time.perf_counter()
+        hand.set_pose(target, hand.MAX_SPEED)
+        while time.perf_counter() - start < timeout:
+            if abs(hand.read_position(1) - before) >= threshold_deg:
+                latencies.append(time.perf_counter() - start)
+                break
+        # Let the finger settle before the next step.
+        time.sleep(0.2)
+    if not latencies:
+        return {"calls": 0}
+    return summarize(latencies)
+
+
+def run_all(hand, iterations=200):
+    """
+    Runs every benchmark.
+
+    :return: A dict of benchmark name -> summary dict.
+    """
+    results = {}
+    results.update(bench_commands(hand, iterations))
+    results.update(bench_telemetry(hand, iterations))
+    results["read_round_trip"] = bench_round_trip(hand, iterations)
+    results["command_to_motion"] = bench_latency(hand, max(iterations // 10, 5))
+    return results
+
+
+def format_report(results):
+    """Formats run_all() results as a text table."""
+    lines = [f"{'benchmark':<24}{'rate/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'frames':>8}{'bytes':>8}"]
+    for name, result in results.items():
+        if not result.get("calls"):
+            lines.append(f"{name:<24}{'n/a':>10}")
+            continue
+        frames = result.get("frames_per_call")
+        size = result.get("bytes_per_call")
+        lines.append(
+            f"{name:<24}{result['rate_hz']:>10.1f}{result['p50'] * 1e3:>10.3f}{result['p90'] * 1e3:>10.3f}"
+            f"{result['p99'] * 1e3:>10.3f}"
+            f"{'' if frames is None else format(frames, '.0f'):>8}{'' if size is None else format(size, '.0f'):>8}"
+        )
+    return "\n".join(lines)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Lists the benchmarks whose rate dropped by more than `tolerance` against a baseline.
+
+    :return: A list of (name, baseline rate, current rate) tuples.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name, {}).get("rate_hz")
+        rate = result.get("rate_hz")
+        if reference and rate is not None and rate < reference * (1 - tolerance):
+            regressions.append((name, reference, rate))
+    return regressions
+
+
+def add_arguments(parser):
+    """
+    Adds the benchmark options to an argparse parser (also used by `python -m amazingctrl bench`).
+    Choosing the hand (--port) is left to the caller.
+    """
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per benchmark.")
+    parser.add_argument("--no-latency-model", action="store_true",
+                        help="Do not model wire time on the simulated bus (measures Python overhead only).")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="JSON results to compare against; exits with 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed rate drop against the baseline.")
+
+
+def run(args, hand):
+    """Runs the benchmarks for parsed add_arguments() options on `hand`; returns the exit code."""
+    hand.start()
+    try:
+        results = run_all(hand, args.iterations)
+    finally:
+        hand.stop()
+
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, reference, rate in regressions:
+            print(f"REGRESSION {name}: {rate:.1f}/s vs baseline {reference:.1f}/s")
+        if regressions:
+            return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AmazingHand SDK.")
+    parser.add_argument("--port", help="Serial port of a real hand; the simulated bus is used if omitted.")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.port:
+        hand = AmazingHand(port=args.port)
+    else:
+        hand = AmazingHand(port="sim", controller=SimulatedController(latency=not args.no_latency_model))
+    return run(args, hand)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
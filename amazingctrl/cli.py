@@ -0,0 +1,220 @@
+"""
+Diagnostics command line, run as `python -m amazingctrl`:
+
+    python -m amazingctrl scan --port /dev/ttyACM0        # which servos answer
+    python -m amazingctrl top --port /dev/ttyACM0         # live table of all motors
+    python -m amazingctrl bench --port /dev/ttyACM0       # command/telemetry rates and latencies
+    python -m amazingctrl calibrate --port /dev/ttyACM0   # save calibration offsets
+
+The port can also be given once in the AMAZINGHAND_PORT environment variable,
+and --sim runs any command against the simulated bus.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from . import bench
+from .amazingctrl import AmazingHand
+from .config import CONFIG_ENV, config_path, save_calibration
+from .scs0009 import MOTOR_IDS, NUM_MOTORS
+from .sim import SimulatedController
+from .telemetry import DEFAULT_POLL_RATES, POLL_FIELDS
+
+PORT_ENV = "AMAZINGHAND_PORT"
+# Column headers of the top table, in POLL_FIELDS order.
+FIELD_LABELS = {"position_deg": "pos", "speed": "speed", "load": "load", "voltage": "volt", "temperature": "temp"}
+
+
+def _open_hand(args):
+    if args.sim:
+        # bench's --no-latency-model turns off the simulated wire time.
+        controller = SimulatedController(latency=not getattr(args, "no_latency_model", False))
+        return AmazingHand(port="sim", side=args.side, controller=controller)
+    if not args.port:
+        raise SystemExit(f"Give --port (or set {PORT_ENV}), or --sim")
+    return AmazingHand(port=args.port, side=args.side)
+
+
+# --- scan ---
+
+def scan(args):
+    hand = _open_hand(args)
+    ids = range(1, args.max_id + 1)
+    found = hand.probe(ids, timeout=args.timeout)
+    print(f"{'id':>4}{'model':>8}{'firmware':>10}{'latency ms':>12}")
+    for motor_id, info in found.items():
+        print(f"{motor_id:>4}{info['model']:>8}{info['firmware']:>10}{info['latency'] * 1e3:>12.2f}")
+    missing = [motor_id for motor_id in MOTOR_IDS if motor_id not in found]
+    unexpected = [motor_id for motor_id in found if motor_id not in MOTOR_IDS]
+    print(f"{len(found)} servo(s) answered out of ids 1-{args.max_id}.")
+    if unexpected:
+        print(f"Unexpected ids: {unexpected}")
+    if missing:
+        print(f"Missing motors: {missing}")
+        return 1
+    return 0
+
+
+# --- top ---
+
+def format_top(telemetry, ages, stats, port):
+    """
+    Renders one frame of the top table.
+
+    :param telemetry: TELEMETRY_DTYPE array from PollingScheduler.latest().
+    :param ages: Matching (motors x fields) ages in seconds.
+    :param stats: PollingScheduler.stats().
+    :return: A list of text lines.
+    """
+    lines = [
+        f"AmazingHand {port}   bus {stats['bus_utilisation'] * 100:5.1f}%   "
+        f"frames {stats['frames']}   errors {stats['errors']}   overruns {stats['overruns']}",
+        "",
+        f"{'id':>3} {'position':>9} {'speed':>7} {'load':>6} {'voltage':>8} {'temp':>6}   age ms "
+        + "".join(f"{FIELD_LABELS[field]:>7}" for field in POLL_FIELDS),
+    ]
+    for row, age in zip(telemetry, ages):
+        motor_id = int(row["id"])
+        ages_ms = "".join("      -" if not np.isfinite(a) else f"{a * 1e3:>7.0f}" for a in age)
+        if not row["ok"]:
+            lines.append(f"{motor_id:>3} {'no reply':>9}{'':>33}   {'':>6}{ages_ms}")
+            continue
+        lines.append(
+            f"{motor_id:>3} {row['position_deg']:>8.1f}° {row['speed']:>7.2f} {row['load']:>6.0f} "
+            f"{row['voltage'] / 10:>7.1f}V {row['temperature']:>4.0f}°C   {'':>6}{ages_ms}"
+        )
+    rates = "  ".join(f"{FIELD_LABELS[field]} {rate:.1f}" for field, rate in stats["rates_hz"].items())
+    lines += ["", f"achieved Hz: {rates}"]
+    return lines
+
+
+def _parse_rates(values):
+    rates = dict(DEFAULT_POLL_RATES)
+    for value in values or []:
+        field, _, rate = value.partition("=")
+        if field not in POLL_FIELDS or not rate:
+            raise SystemExit(f"--rate expects FIELD=HZ with FIELD one of {', '.join(POLL_FIELDS)}")
+        rates[field] = float(rate)
+    return rates
+
+
+def top(args):
+    hand = _open_hand(args)
+    scheduler = hand.start_polling(_parse_rates(args.rate))
+    period = 1.0 / args.refresh
+    try:
+        if args.plain:
+            end = time.monotonic() + args.duration if args.duration else None
+            while end is None or time.monotonic() < end:
+                time.sleep(period)
+                telemetry, ages = scheduler.latest()
+                print("\n".join(format_top(telemetry, ages, scheduler.stats(), hand.port)) + "\n", flush=True)
+            return 0
+        try:
+            import curses
+        except ImportError:
+            raise SystemExit("curses is not available here (on Windows: pip install windows-curses); use --plain")
+
+        def draw(screen):
+            curses.curs_set(0)
+            screen.nodelay(True)
+            height, width = screen.getmaxyx()
+            while screen.getch() not in (ord("q"), ord("Q"), 27):
+                telemetry, ages = scheduler.latest()
+                lines = format_top(telemetry, ages, scheduler.stats(), hand.port) + ["", "q: quit"]
+                screen.erase()
+                height, width = screen.getmaxyx()
+                for y, line in enumerate(lines[:height]):
+                    screen.addnstr(y, 0, line, width - 1)
+                screen.refresh()
+                time.sleep(period)
+
+        curses.wrapper(draw)
+        return 0
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        hand.stop_polling()
+
+
+# --- bench ---
+
+def run_bench(args):
+    return bench.run(args, _open_hand(args))
+
+
+# --- calibrate ---
+
+def calibrate(args):
+    hand = _open_hand(args)
+    if args.offsets is not None:
+        offsets = args.offsets
+    else:
+        # Torque off, so the fingers can be moved by hand; the port stays open.
+        hand.stop(close=False)
+        if not args.yes:
+            input("Move every finger to its zero pose (straight, centred: both servo angles 0), "
+                  "then press Enter...")
+        positions = np.full((args.samples, NUM_MOTORS), np.nan)
+        for k in range(args.samples):
+            telemetry = hand.read_telemetry()
+            positions[k] = np.where(telemetry["ok"], telemetry["position_deg"], np.nan)
+            time.sleep(0.01)
+        missing = [motor_id for motor_id, column in zip(MOTOR_IDS, positions.T) if np.isnan(column).all()]
+        if missing:
+            print(f"Motors {missing} did not answer; calibration not saved.")
+            return 1
+        # With the servos at angle 0, the raw position is the offset itself.
+        offsets = np.nanmean(positions, axis=0).round(1).tolist()
+    path = save_calibration(hand.port, offsets, args.config)
+    print(f"Calibration for {hand.port}: {[round(float(v), 2) for v in offsets]}")
+    print(f"Saved to {path}.")
+    if args.config and os.path.abspath(config_path(args.config)) != os.path.abspath(config_path()):
+        print(f"Set {CONFIG_ENV}={path} for AmazingHand to load it.")
+    return 0
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--port", default=os.environ.get(PORT_ENV),
+                        help=f"Serial port of the hand (default: ${PORT_ENV}).")
+    common.add_argument("--sim", action="store_true", help="Use the simulated bus instead of a serial port.")
+    common.add_argument("--side", type=int, default=1, help="1 for a right hand, 2 for a left hand.")
+
+    parser = argparse.ArgumentParser(prog="python -m amazingctrl", description="AmazingHand diagnostics.")
+    commands = parser.add_subparsers(dest="command")
+
+    sub = commands.add_parser("scan", parents=[common], help="Ping servo ids and report the ones that answer.")
+    sub.add_argument("--max-id", type=int, default=len(MOTOR_IDS), help="Scan ids 1..MAX_ID (up to 253).")
+    sub.add_argument("--timeout", type=float, default=0.02, help="Reply timeout per id, in seconds.")
+    sub.set_defaults(func=scan)
+
+    sub = commands.add_parser("top", parents=[common], help="Live table of all motors.")
+    sub.add_argument("--refresh", type=float, default=20.0, help="Screen refresh rate in Hz.")
+    sub.add_argument("--rate", action="append", metavar="FIELD=HZ",
+                     help="Polling rate of a field, e.g. --rate position_deg=200; repeatable.")
+    sub.add_argument("--plain", action="store_true", help="Print frames instead of using curses.")
+    sub.add_argument("--duration", type=float, help="With --plain, stop after this many seconds.")
+    sub.set_defaults(func=top)
+
+    sub = commands.add_parser("bench", parents=[common], help="Measure command and telemetry rates and latencies.")
+    bench.add_arguments(sub)
+    sub.set_defaults(func=run_bench)
+
+    sub = commands.add_parser("calibrate", parents=[common],
+                              help="Measure or set calibration offsets and save them for this port.")
+    sub.add_argument("--offsets", type=float, nargs=NUM_MOTORS, metavar="DEG",
+                     help="Save these 8 offsets instead of measuring them.")
+    sub.add_argument("--samples", type=int, default=20, help="Readings averaged per servo.")
+    sub.add_argument("--yes", action="store_true", help="Do not wait for Enter before measuring.")
+    sub.add_argument("--config", help="Calibration file to write (default: $AMAZINGHAND_CONFIG or "
+                                      "~/.config/amazinghand/calibration.json).")
+    sub.set_defaults(func=calibrate)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return args.func(args)
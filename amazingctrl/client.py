@@ -0,0 +1,198 @@
+"""
+Client of the local hand server (see amazingctrl.server).
+
+    with HandClient(("127.0.0.1", 9880)) as client:
+        client.subscribe(20, callback=lambda t, telemetry: print(telemetry["position_deg"]))
+        client.gesture("open")
+        client.set_pose([90, -90] * 4, priority=5)
+"""
+import socket
+import threading
+
+import numpy as np
+
+from .scs0009 import NUM_MOTORS
+from .server import (
+    ACK_FORMAT,
+    ACK_OK,
+    ACK_REJECTED,
+    MSG_ACK,
+    MSG_GESTURE,
+    MSG_RELEASE,
+    MSG_SET_POSE,
+    MSG_SUBSCRIBE,
+    MSG_TELEMETRY,
+    POSE_FORMAT,
+    SUBSCRIBE_FORMAT,
+    decode_telemetry,
+    encode_message,
+    recv_message,
+)
+
+
+class HandClient:
+    """
+    A connection to a HandServer.
+
+    Commands block until the server has acknowledged them. Telemetry arrives on
+    a reader thread and is passed to the subscription callback.
+    """
+
+    def __init__(self, address, timeout=2.0):
+        """
+        :param address: (host, port) of the server's TCP listener, or the path of its Unix socket.
+        :param timeout: Seconds to wait for a command's acknowledgement.
+        """
+        if isinstance(address, str):
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.connect(address)
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending = {}
+        self._latest = None
+        self._callback = None
+        self.received = 0
+        # Exceptions raised by the subscription callback; only the first is printed.
+        self.callback_errors = 0
+        self.closed = False
+        self._thread = threading.Thread(target=self._receive, name="amazinghand-client", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._thread.join()
+
+    # --- Requests ---
+
+    def _request(self, kind, payload=b"", priority=0):
+        """
+        Sends a request and waits for its acknowledgement.
+
+        :return: (status, detail).
+        """
+        event = threading.Event()
+        with self._lock:
+            if self.closed:
+                raise ConnectionError("Disconnected from the hand server")
+            self._next_id = (self._next_id + 1) % 0x10000
+            request_id = self._next_id
+            self._pending[request_id] = [event, None]
+            self._sock.sendall(encode_message(kind, payload, priority, request_id))
+        acknowledged = event.wait(self.timeout)
+        with self._lock:
+            reply = self._pending.pop(request_id)[1]
+        if reply is not None:
+            return reply
+        if not acknowledged:
+            raise TimeoutError("The hand server did not acknowledge the request")
+        raise ConnectionError("Disconnected from the hand server")
+
+    def _command(self, kind, payload, priority):
+        status, detail = self._request(kind, payload, priority)
+        if status == ACK_REJECTED:
+            return False
+        if status != ACK_OK:
+            raise RuntimeError(detail)
+        return True
+
+    def set_pose(self, positions, speeds=None, priority=0):
+        """
+        Sends goal positions and speeds for all 8 servos.
+
+        :param positions: 8 angles in degrees; NaN keeps a joint's goal.
+        :param speeds: One speed or 8; the server's MAX_SPEED by default.
+        :param priority: 0-255; see the server's priority rules.
+        :return: False if a client with a higher priority holds control.
+        """
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape != (NUM_MOTORS,):
+            raise ValueError(f"Expected {NUM_MOTORS} positions, got shape {positions.shape}")
+        speeds = np.broadcast_to(np.nan if speeds is None else np.asarray(speeds, dtype=float), (NUM_MOTORS,))
+        return self._command(MSG_SET_POSE, POSE_FORMAT.pack(*positions, *speeds), priority)
+
+    def gesture(self, name, priority=0):
+        """
+        Performs a gesture known to the server.
+
+        :return: False if a client with a higher priority holds control.
+        """
+        return self._command(MSG_GESTURE, name.encode(), priority)
+
+    def release(self):
+        """Gives up control, so that lower-priority clients can command the hand again."""
+        self._command(MSG_RELEASE, b"", 0)
+
+    def subscribe(self, rate_hz, callback=None):
+        """
+        Subscribes to telemetry.
+
+        :param rate_hz: Requested rate; the server sends every n-th sweep closest to it.
+                        0 unsubscribes.
+        :param callback: Optional callable(timestamp, telemetry) run on the reader thread
+                         for each sample; keep it short.
+        :return: The rate granted by the server, in Hz.
+        """
+        self._callback = callback
+        status, detail = self._request(MSG_SUBSCRIBE, SUBSCRIBE_FORMAT.pack(rate_hz))
+        if status != ACK_OK:
+            raise RuntimeError(detail)
+        return float(detail) if detail else 0.0
+
+    def latest(self):
+        """
+        :return: The last telemetry sample as (timestamp, sweep number, TELEMETRY_DTYPE
+                 array), or None before the first one.
+        """
+        return self._latest
+
+    # --- Reader ---
+
+    def _receive(self):
+        while True:
+            try:
+                message = recv_message(self._sock)
+            except (OSError, ValueError):
+                message = None
+            if message is None:
+                break
+            kind, _, request_id, payload = message
+            if kind == MSG_TELEMETRY:
+                self._latest = decode_telemetry(payload)
+                self.received += 1
+                callback = self._callback
+                if callback is not None:
+                    try:
+                        callback(self._latest[0], self._latest[2])
+                    except Exception as error:
+                        # Keep receiving: a failing callback must not stall the commands.
+                        if not self.callback_errors:
+                            print(f"Telemetry callback failed: {error!r}")
+                        self.callback_errors += 1
+            elif kind == MSG_ACK:
+                (status,) = ACK_FORMAT.unpack_from(payload)
+                with self._lock:
+                    pending = self._pending.get(request_id)
+                if pending is not None:
+                    pending[1] = (status, payload[ACK_FORMAT.size:].decode())
+                    pending[0].set()
+        # Wake up requests still waiting for an acknowledgement.
+        with self._lock:
+            self.closed = True
+            for event, _ in self._pending.values():
+                event.set()
@@ -0,0 +1,70 @@
+"""
+Per-hand calibration file.
+
+`python -m amazingctrl calibrate` stores the calibration offsets of each hand,
+keyed by serial port, in a JSON file:
+
+    {"calibration": {"/dev/ttyACM0": [3, 0, -5, -8, -2, 5, -12, 0]}}
+
+An AmazingHand created without calibration_data loads its entry from there.
+The file is ~/.config/amazinghand/calibration.json, or the path in the
+AMAZINGHAND_CONFIG environment variable.
+"""
+import json
+import os
+
+from .scs0009 import NUM_MOTORS
+
+CONFIG_ENV = "AMAZINGHAND_CONFIG"
+DEFAULT_CONFIG_PATH = os.path.join("~", ".config", "amazinghand", "calibration.json")
+
+
+def config_path(path=None):
+    """The calibration file in use: `path`, $AMAZINGHAND_CONFIG or the default location."""
+    return os.path.expanduser(path or os.environ.get(CONFIG_ENV) or DEFAULT_CONFIG_PATH)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def load_calibration(port, path=None):
+    """
+    :param port: Serial port of the hand.
+    :param path: Calibration file; see config_path().
+    :return: The 8 stored offsets for `port`, or None if there are none.
+    """
+    offsets = _read(config_path(path)).get("calibration", {}).get(str(port))
+    if offsets is None:
+        return None
+    if len(offsets) != NUM_MOTORS:
+        raise ValueError(f"Calibration of {port} in {config_path(path)} has {len(offsets)} values, "
+                         f"expected {NUM_MOTORS}")
+    return [float(value) for value in offsets]
+
+
+def save_calibration(port, offsets, path=None):
+    """
+    Stores the offsets of the hand on `port`, keeping the other hands' entries.
+    The file is replaced atomically.
+
+    :return: The path written.
+    """
+    offsets = [round(float(value), 2) for value in offsets]
+    if len(offsets) != NUM_MOTORS:
+        raise ValueError(f"Expected {NUM_MOTORS} calibration values, got {len(offsets)}")
+    path = config_path(path)
+    config = _read(path)
+    config.setdefault("calibration", {})[str(port)] = offsets
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp, path)
+    return path
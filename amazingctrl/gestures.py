@@ -0,0 +1,150 @@
+"""
+Gesture definitions for the AmazingHand.
+
+Gestures are plain data: 8 servo angles (degrees, right hand) and 8 speeds.
+Left-hand variants are derived by mirroring unless given explicitly. A
+GestureTable compiles every gesture once for a given calibration and side into
+ready-to-send goal frames, so triggering a gesture does no per-call math.
+"""
+import numpy as np
+
+from .scs0009 import MOTOR_IDS, NUM_MOTORS, encode_position, encode_speed, pack_goal_block
+
+RIGHT_HAND = 1
+LEFT_HAND = 2
+
+MAX_SPEED = 7
+CLOSE_SPEED = 3
+
+
+class Gesture:
+    """
+    A named pose.
+
+    :ivar positions: 8 servo angles in degrees for the right hand.
+    :ivar speeds: 8 goal speeds.
+    :ivar left_positions: Explicit left-hand angles, or None to mirror `positions`.
+    """
+
+    def __init__(self, name, positions, speeds=MAX_SPEED, left_positions=None):
+        self.name = name
+        self.positions = _as_pose(positions)
+        self.speeds = np.broadcast_to(np.asarray(speeds, dtype=float), (NUM_MOTORS,)).copy()
+        self.left_positions = None if left_positions is None else _as_pose(left_positions)
+
+    def pose(self, side=RIGHT_HAND):
+        """Servo angles of this gesture for the given side."""
+        if side == RIGHT_HAND:
+            return self.positions
+        if self.left_positions is not None:
+            return self.left_positions
+        return mirror(self.positions)
+
+
+def _as_pose(positions):
+    positions = np.asarray(positions, dtype=float)
+    if positions.shape != (NUM_MOTORS,):
+        raise ValueError(f"Expected {NUM_MOTORS} positions, got shape {positions.shape}")
+    return positions
+
+
+def mirror(positions):
+    """
+    Mirrors poses between the right and left hand.
+
+    Each finger's servos swap roles and turn the other way:
+    (angle_1, angle_2) becomes (-angle_2, -angle_1).
+
+    :param positions: One or more poses, with the 8 joints on the last axis.
+    """
+    positions = np.asarray(positions, dtype=float)
+    fingers = positions.reshape(positions.shape[:-1] + (NUM_MOTORS // 2, 2))
+    # Adding 0.0 turns the -0.0 produced for zero angles back into 0.0.
+    return -fingers[..., ::-1].reshape(positions.shape) + 0.0
+
+
+# Built-in gestures, defined for the right hand.
+GESTURES = {}
+
+
+def registry_version():
+    """Counter bumped on every register_gesture(), so compiled tables can tell they are stale."""
+    return _registry_version[0]
+
+
+_registry_version = [0]
+
+
+def register_gesture(name, positions, speeds=MAX_SPEED, left_positions=None):
+    """
+    Adds a gesture to the global registry, available to every AmazingHand.
+
+    :param name: Gesture name, e.g. "thumbs_up".
+    :param positions: 8 servo angles in degrees for the right hand.
+    :param speeds: One speed for every servo, or 8 speeds.
+    :param left_positions: Optional left-hand angles; mirrored from `positions` if omitted.
+    :return: The registered Gesture.
+    """
+    gesture = Gesture(name, positions, speeds, left_positions)
+    GESTURES[name] = gesture
+    _registry_version[0] += 1
+    return gesture
+
+
+register_gesture("open", [-35, 35, -35, 35, -35, 35, -35, 35])
+register_gesture("close", [90, -90, 90, -90, 90, -90, 90, -90],
+                 [CLOSE_SPEED] * 6 + [CLOSE_SPEED + 1] * 2)
+register_gesture("point", [-40, 40, 90, -90, 90, -90, 90, -90])
+register_gesture("victory", [-15, 65, -65, 15, 90, -90, 90, -90])
+register_gesture("ok", [50, -50, 0, 0, -20, 20, 65, 12])
+# The left-hand pinch thumb is tuned by hand rather than mirrored.
+register_gesture("pinch", [90, -90, 90, -90, 90, -90, 0, -75],
+                 left_positions=[90, -90, 90, -90, 90, -90, 75, 5])
+
+
+class CompiledGesture:
+    """
+    A gesture resolved for one hand: angles, speeds and the packed goal frame.
+    """
+
+    def __init__(self, positions, speeds, payloads):
+        self.positions = positions
+        self.speeds = speeds
+        self.payloads = payloads
+
+
+class GestureTable:
+    """
+    Gestures compiled for a given calibration and side.
+    """
+
+    def __init__(self, gestures, calibration, side):
+        """
+        :param gestures: Mapping of name to Gesture.
+        :param calibration: 8 calibration offsets in degrees.
+        :param side: RIGHT_HAND or LEFT_HAND.
+        """
+        calibration = np.asarray(calibration, dtype=float)
+        names = list(gestures)
+        positions = np.array([gestures[name].pose(side) for name in names]).reshape(-1, NUM_MOTORS)
+        speeds = np.array([gestures[name].speeds for name in names]).reshape(-1, NUM_MOTORS)
+        payloads = pack_goal_block(encode_position(np.deg2rad(calibration + positions)).ravel(),
+                                   encode_speed(speeds).ravel())
+        self.ids = list(MOTOR_IDS)
+        self.version = registry_version()
+        self._table = {
+            name: CompiledGesture(positions[i], speeds[i], payloads[i * NUM_MOTORS:(i + 1) * NUM_MOTORS])
+            for i, name in enumerate(names)
+        }
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def __getitem__(self, name):
+        try:
+            return self._table[name]
+        except KeyError:
+            raise KeyError(f"Unknown gesture {name!r}") from None
+
+    def names(self):
+        return list(self._table)
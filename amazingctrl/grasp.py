@@ -0,0 +1,157 @@
+"""
+Load-threshold adaptive grasping for the AmazingHand.
+
+grasp() closes the fingers along a minimum-jerk trajectory and, on every
+control tick, reads only the present_load register of the servos of the
+fingers still moving. As soon as a finger's load crosses its threshold, the
+finger stops at the contact position (optionally pressing a few degrees
+further to keep a grip), while the other fingers carry on. Instead of
+stalling every servo against the object, the hand wraps around it and
+reports where each finger touched.
+"""
+import time
+
+import numpy as np
+
+from .loop import ControlLoop
+from .scs0009 import (
+    MOTOR_IDS,
+    NUM_MOTORS,
+    PRESENT_BLOCK_ADDR,
+    PRESENT_BLOCK_SIZE,
+    PRESENT_FIELDS,
+    decode_present_block,
+)
+from .sequence import FINGERS
+from .trajectory import plan
+
+
+def _read_field(hand, indices, field):
+    """
+    Reads one present-state field of the given servos, one minimal read each.
+
+    :return: (values, ok) arrays; values are decoded as in read_telemetry().
+    """
+    offset, size = PRESENT_FIELDS[field]
+    block = np.zeros((len(indices), PRESENT_BLOCK_SIZE), dtype=np.uint8)
+    ok = np.zeros(len(indices), dtype=bool)
+    for row, i in enumerate(indices):
+        try:
+            block[row, offset:offset + size] = hand._call_motor(
+                MOTOR_IDS[i], "read_raw_data", PRESENT_BLOCK_ADDR + offset, size)
+            ok[row] = True
+        except Exception:
+            pass
+    values = decode_present_block(block, ok, ids=[MOTOR_IDS[i] for i in indices])[field]
+    return values, ok
+
+
+def grasp(hand, target="close", fingers=None, thresholds=200, duration=1.0, rate_hz=100,
+          squeeze_deg=0.0, confirm_ticks=2, settle_time=0.3):
+    """
+    Closes the fingers toward `target`, stopping each one when it touches something.
+
+    :param hand: The AmazingHand to drive.
+    :param target: Final pose if nothing is touched: a gesture name or 8 angles in degrees.
+    :param fingers: Fingers to close ("index", "middle", "ring", "thumb"); all by default.
+                    The others keep their current goal.
+    :param thresholds: Absolute present_load (raw, 0-1000) that means contact; one value
+                       or a dict of finger -> value covering every finger in `fingers`.
+    :param duration: Time to reach `target` without contact, in seconds.
+    :param rate_hz: Control rate: loads are read and goals sent once per tick.
+    :param squeeze_deg: After contact, hold the goal this many degrees past the
+                        contact position (toward the target) to keep a grip; 0 stops the finger there.
+    :param confirm_ticks: Consecutive ticks over the threshold needed to report contact,
+                          to ignore single-sample load spikes.
+    :param settle_time: How long to keep watching for contacts after the trajectory ends.
+    :return: A dict with "elapsed" (seconds) and "fingers": finger -> {"contact": bool,
+             "time": seconds from the start or None, "position": the 2 servo angles
+             at contact (or at the end), "load": the 2 loads at contact (or at the end)};
+             "position" and "load" are None when the servos could not be read.
+    """
+    if fingers is None:
+        fingers = list(FINGERS)
+    unknown = set(fingers) - set(FINGERS)
+    if unknown:
+        raise ValueError(f"Unknown fingers {sorted(unknown)}, expected some of {sorted(FINGERS)}")
+    if not isinstance(thresholds, dict):
+        thresholds = {finger: thresholds for finger in fingers}
+    missing = [finger for finger in fingers if finger not in thresholds]
+    if missing:
+        raise ValueError(f"No threshold for fingers {missing}")
+
+    hand.flush()
+    start = hand.get_goal_pose()[0]
+    goal = np.array(hand.gestures[target].positions if isinstance(target, str) else target, dtype=float)
+    if goal.shape != (NUM_MOTORS,):
+        raise ValueError(f"Expected {NUM_MOTORS} positions, got shape {goal.shape}")
+    # Fingers that are not grasping stay where they are.
+    moving = np.zeros(NUM_MOTORS, dtype=bool)
+    for finger in fingers:
+        moving[list(FINGERS[finger])] = True
+    goal[~moving] = start[~moving]
+    trajectory = plan([start, goal], [duration], rate_hz=rate_hz)
+    direction = np.sign(goal - start)
+    calibration = np.asarray(hand.calibration_data)
+
+    active = list(fingers)
+    over = {finger: 0 for finger in fingers}
+    results = {finger: {"contact": False, "time": None, "position": None, "load": None} for finger in fingers}
+    setpoint = start.copy()
+    speeds = hand.get_goal_pose()[1]
+    servo_speeds = trajectory.servo_speeds()
+    end = trajectory.duration + settle_time
+
+    def tick(t):
+        k = min(int(round(t * rate_hz)), len(trajectory) - 1)
+        indices = [i for finger in active for i in FINGERS[finger]]
+        loads, ok = _read_field(hand, indices, "load")
+        loads = dict(zip(indices, np.where(ok, np.abs(loads), 0.0)))
+
+        for finger in list(active):
+            pair = list(FINGERS[finger])
+            if max(loads[i] for i in pair) >= thresholds[finger]:
+                over[finger] += 1
+            else:
+                over[finger] = 0
+            if over[finger] < confirm_ticks:
+                continue
+            positions, position_ok = _read_field(hand, pair, "position_deg")
+            if position_ok.all():
+                contact = positions - calibration[pair]
+                setpoint[pair] = contact + direction[pair] * squeeze_deg
+                position = contact.tolist()
+            else:
+                # Without the contact position, hold the last goal rather than
+                # sending NaN (raw 0, the end stop) into the object.
+                position = None
+            speeds[pair] = hand.CLOSE_SPEED
+            results[finger].update(contact=True, time=t, position=position,
+                                   load=[float(loads[i]) for i in pair])
+            active.remove(finger)
+
+        for finger in active:
+            pair = list(FINGERS[finger])
+            setpoint[pair] = trajectory.positions[k, pair]
+            speeds[pair] = servo_speeds[k, pair]
+        hand.set_pose(setpoint, speeds)
+        if not active or t >= end:
+            loop.stop()
+
+    loop = ControlLoop(tick, rate_hz=rate_hz, hand=hand)
+    started = time.monotonic()
+    loop.run()
+    elapsed = time.monotonic() - started
+
+    # Fingers without contact: report where they ended.
+    if active:
+        indices = [i for finger in active for i in FINGERS[finger]]
+        positions, position_ok = _read_field(hand, indices, "position_deg")
+        loads, load_ok = _read_field(hand, indices, "load")
+        for n, finger in enumerate(active):
+            pair = list(FINGERS[finger])
+            rows = slice(2 * n, 2 * n + 2)
+            position = (positions[rows] - calibration[pair]).tolist() if position_ok[rows].all() else None
+            load = np.abs(loads[rows]).tolist() if load_ok[rows].all() else None
+            results[finger].update(position=position, load=load)
+    return {"elapsed": elapsed, "fingers": results}
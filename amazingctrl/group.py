@@ -0,0 +1,182 @@
+"""
+Coordinating several AmazingHands, each on its own serial port.
+
+HandGroup gives every hand a dedicated worker thread, so the buses run in
+parallel instead of one after another. Synchronized commands are prepared on
+every worker first and released together through a barrier, so coordinated
+gestures start within one bus frame of each other.
+"""
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .trajectory import plan
+
+
+class HandGroup:
+    """
+    A set of named AmazingHands driven concurrently.
+
+        group = HandGroup({"left": AmazingHand("/dev/ttyACM0", side=2),
+                           "right": AmazingHand("/dev/ttyACM1", side=1)})
+        group.start()
+        group.gesture("victory")
+        group.set_pose({"left": pose_l, "right": pose_r})
+    """
+
+    def __init__(self, hands):
+        """
+        :param hands: A dict of name -> AmazingHand, or a list of hands (named by their port).
+        """
+        if not isinstance(hands, dict):
+            hands = {hand.port: hand for hand in hands}
+        self.hands = dict(hands)
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"amazinghand-{name}")
+            for name in self.hands
+        }
+
+    def __getitem__(self, name):
+        return self.hands[name]
+
+    def __iter__(self):
+        return iter(self.hands)
+
+    def __len__(self):
+        return len(self.hands)
+
+    def close(self):
+        """
+        Shuts down the worker threads. Call stop() first to release the motors.
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+    def _per_hand(self, value):
+        """Expands a single value to every hand, or checks a per-hand dict."""
+        if isinstance(value, dict):
+            unknown = set(value) - set(self.hands)
+            if unknown:
+                raise KeyError(f"Unknown hands: {sorted(unknown)}")
+            return value
+        return {name: value for name in self.hands}
+
+    def run(self, func, names=None, synchronized=False):
+        """
+        Calls func(hand) for several hands concurrently, one call per worker thread.
+
+        With synchronized=True, commands sent by `func` are only buffered (see
+        AmazingHand.batch()); every worker then waits at a barrier and all of
+        them flush their bus at the same moment.
+
+        :param func: Function called with each AmazingHand.
+        :param names: Hands to run on; all of them by default.
+        :param synchronized: Release the buffered commands of all hands together.
+        :return: A dict of name -> return value of func.
+        """
+        names = list(self.hands) if names is None else list(names)
+        return self._dispatch({name: func for name in names}, synchronized)
+
+    def _dispatch(self, calls, synchronized=False, barrier_first=False):
+        """
+        Runs calls[name](hand) on each hand's worker thread and collects the results.
+
+        :param synchronized: Buffer the commands and flush all hands after a barrier.
+        :param barrier_first: Wait at a barrier before calling, so long-running
+                              calls (e.g. trajectories) start together.
+        """
+        barrier = threading.Barrier(len(calls)) if synchronized or barrier_first else None
+
+        def call(name):
+            hand = self.hands[name]
+            if barrier is None:
+                return calls[name](hand)
+            try:
+                if barrier_first:
+                    barrier.wait()
+                    return calls[name](hand)
+                with hand.batch():
+                    result = calls[name](hand)
+                    barrier.wait()
+                return result
+            except BaseException:
+                # Release the other workers instead of leaving them at the barrier.
+                barrier.abort()
+                raise
+
+        futures = {name: self._executors[name].submit(call, name) for name in calls}
+        return {name: future.result() for name, future in futures.items()}
+
+    def start(self):
+        self.run(lambda hand: hand.start())
+
+    def stop(self):
+        self.run(lambda hand: hand.stop())
+
+    def set_pose(self, positions, speeds=None, synchronized=True):
+        """
+        Sends a pose to every hand.
+
+        :param positions: One 8-element pose for all hands, or a dict of name -> pose.
+        :param speeds: One speed/speed list for all hands, or a dict of name -> speeds.
+        :param synchronized: Start all hands within one bus frame of each other.
+        """
+        positions = self._per_hand(positions)
+        speeds = self._per_hand(speeds)
+        calls = {
+            name: functools.partial(_set_pose, positions=positions[name], speeds=speeds.get(name))
+            for name in positions
+        }
+        self._dispatch(calls, synchronized)
+
+    def gesture(self, name, synchronized=True):
+        """
+        Performs a gesture on every hand (each with its own side and calibration).
+
+        :param name: Gesture name for all hands, or a dict of hand name -> gesture name.
+        :param synchronized: Start all hands within one bus frame of each other.
+        """
+        gestures = self._per_hand(name)
+        calls = {hand_name: functools.partial(_gesture, name=gesture) for hand_name, gesture in gestures.items()}
+        self._dispatch(calls, synchronized)
+
+    def move_to(self, positions, duration, rate_hz=100, method="min_jerk"):
+        """
+        Moves every hand smoothly to its target pose; all trajectories start together.
+
+        :param positions: One 8-element pose for all hands, or a dict of name -> pose.
+        :param duration: Transition time in seconds.
+        """
+        positions = self._per_hand(positions)
+        calls = {}
+        for name, target in positions.items():
+            hand = self.hands[name]
+            trajectory = plan([hand.get_goal_pose()[0], target], [duration], rate_hz=rate_hz, method=method)
+            calls[name] = functools.partial(_play, compiled=hand.compile_trajectory(trajectory))
+        self._dispatch(calls, barrier_first=True)
+
+    def read_telemetry(self):
+        """
+        Reads the telemetry of all hands concurrently.
+
+        :return: A dict of name -> TELEMETRY_DTYPE array.
+        """
+        return self.run(lambda hand: hand.read_telemetry())
+
+    def get_all_motors_status(self):
+        """
+        :return: A dict of name -> list of status dicts (see AmazingHand.get_all_motors_status()).
+        """
+        return self.run(lambda hand: hand.get_all_motors_status())
+
+
+def _set_pose(hand, positions, speeds):
+    hand.set_pose(positions, speeds)
+
+
+def _gesture(hand, name):
+    hand.gesture(name)
+
+
+def _play(hand, compiled):
+    hand.play_trajectory(compiled)
@@ -0,0 +1,216 @@
+"""
+Timeout budgets and a per-motor circuit breaker for the AmazingHand bus.
+
+Without it, a servo that stopped answering costs the full bus timeout on every
+read, and a telemetry sweep stalls the control thread for seconds. A
+HealthMonitor (installed with AmazingHand.enable_health()) instead:
+
+- shortens the reply timeout of every call (the per-call budget),
+- stops a telemetry sweep once its per-cycle budget is spent,
+- retries a failed read a bounded number of times, with exponential backoff,
+- marks a servo degraded after `failure_threshold` consecutive failures. Reads
+  of a degraded servo fail immediately and goal writes skip it,
+- probes degraded servos from a background thread and restores them,
+  goals and torque included, as soon as they answer again.
+"""
+import threading
+import time
+
+import numpy as np
+
+from .scs0009 import IDENTITY_BLOCK_ADDR, IDENTITY_BLOCK_SIZE, MOTOR_IDS, NUM_MOTORS
+
+OK = "ok"
+DEGRADED = "degraded"
+
+
+class MotorUnavailableError(RuntimeError):
+    """
+    Raised instead of talking to a servo that is degraded, or when the cycle budget is spent.
+    """
+
+    def __init__(self, motor_id, reason):
+        super().__init__(f"motor {motor_id}: {reason}")
+        self.motor_id = motor_id
+        self.reason = reason
+
+
+class HealthMonitor:
+    """
+    Per-motor failure tracking, retries and recovery probing for one AmazingHand.
+    """
+
+    def __init__(self, hand, failure_threshold=3, call_timeout=0.01, cycle_budget=0.02,
+                 retries=1, backoff=0.001, probe_interval=0.5):
+        """
+        :param hand: The AmazingHand to supervise.
+        :param failure_threshold: Consecutive failures after which a servo is degraded.
+        :param call_timeout: Reply timeout of every bus call, in seconds.
+        :param cycle_budget: Time a telemetry sweep may spend on the bus, in seconds;
+                             servos not read by then are reported as failed. None disables it.
+        :param retries: Extra attempts of a failed read, within the cycle budget.
+        :param backoff: Pause before the first retry, doubled for each further one, in seconds.
+        :param probe_interval: Seconds between two probes of the degraded servos.
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.hand = hand
+        self.failure_threshold = failure_threshold
+        self.call_timeout = call_timeout
+        self.cycle_budget = cycle_budget
+        self.retries = retries
+        self.backoff = backoff
+        self.probe_interval = probe_interval
+
+        self._lock = threading.Lock()
+        self._degraded = np.zeros(NUM_MOTORS, dtype=bool)
+        self._consecutive = np.zeros(NUM_MOTORS, dtype=np.int64)
+        self._failures = np.zeros(NUM_MOTORS, dtype=np.int64)
+        self._skipped = np.zeros(NUM_MOTORS, dtype=np.int64)
+        self._degraded_since = [None] * NUM_MOTORS
+        self._last_error = [None] * NUM_MOTORS
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Applies the per-call timeout and starts the recovery probe thread."""
+        self.apply_timeout()
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="amazinghand-health", daemon=True)
+            self._thread.start()
+
+    def apply_timeout(self):
+        """Sets the per-call timeout on the hand's current controller, e.g. after a reconnect."""
+        self.hand._set_timeout(self.call_timeout)
+
+    def stop(self):
+        """Stops the probe thread and restores the hand's bus timeout."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.hand._set_timeout(self.hand._bus_timeout)
+
+    # --- State ---
+
+    def is_degraded(self, motor_id):
+        return bool(self._degraded[motor_id - 1])
+
+    def available(self, indices):
+        """
+        :param indices: Indices into the 8-element pose arrays (motor id - 1).
+        :return: Boolean mask of the servos that are not degraded.
+        """
+        return ~self._degraded[indices]
+
+    def degraded_ids(self):
+        return [motor_id for motor_id, degraded in zip(MOTOR_IDS, self._degraded) if degraded]
+
+    def status(self):
+        """
+        :return: A dict of motor id -> {"state", "failures", "consecutive_failures",
+                 "skipped", "degraded_since", "last_error"}.
+        """
+        with self._lock:
+            return {
+                motor_id: {
+                    "state": DEGRADED if self._degraded[i] else OK,
+                    "failures": int(self._failures[i]),
+                    "consecutive_failures": int(self._consecutive[i]),
+                    "skipped": int(self._skipped[i]),
+                    "degraded_since": self._degraded_since[i],
+                    "last_error": self._last_error[i],
+                }
+                for i, motor_id in enumerate(MOTOR_IDS)
+            }
+
+    def _success(self, i):
+        self._consecutive[i] = 0
+
+    def _failure(self, i, error):
+        """Counts a failure; returns True if it degraded the servo."""
+        with self._lock:
+            self._failures[i] += 1
+            self._consecutive[i] += 1
+            self._last_error[i] = str(error)
+            if not self._degraded[i] and self._consecutive[i] >= self.failure_threshold:
+                self._degraded[i] = True
+                self._degraded_since[i] = time.monotonic()
+                print(f"Motor {MOTOR_IDS[i]} degraded after {self._consecutive[i]} consecutive failures: {error}")
+                return True
+        return False
+
+    def _skip(self, i, reason):
+        with self._lock:
+            self._skipped[i] += 1
+        raise MotorUnavailableError(MOTOR_IDS[i], reason)
+
+    # --- Calls ---
+
+    def cycle_deadline(self):
+        """Deadline (time.monotonic()) of a sweep starting now, or None without a cycle budget."""
+        return None if self.cycle_budget is None else time.monotonic() + self.cycle_budget
+
+    def call(self, motor_id, method, *args, deadline=None):
+        """
+        Calls controller.<method>(motor_id, *args) with retries and failure tracking.
+
+        :param deadline: Optional time.monotonic() after which no attempt is started.
+        :raises MotorUnavailableError: If the servo is degraded or the deadline has passed.
+        """
+        i = motor_id - 1
+        attempt = 0
+        while True:
+            if self._degraded[i]:
+                self._skip(i, "degraded")
+            if deadline is not None and time.monotonic() >= deadline:
+                self._skip(i, "cycle budget exhausted")
+            try:
+                with self.hand._bus_lock:
+                    result = getattr(self.hand.controller, method)(motor_id, *args)
+            except Exception as error:
+                delay = self.backoff * 2 ** attempt
+                if self._failure(i, error) or attempt >= self.retries:
+                    raise
+                if deadline is not None and time.monotonic() + delay + self.call_timeout > deadline:
+                    # A retry that may time out would eat the rest of the sweep's budget.
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._success(i)
+            return result
+
+    # --- Recovery ---
+
+    def probe_degraded(self):
+        """
+        Queries every degraded servo once and restores those that answer.
+
+        :return: The ids of the servos that recovered.
+        """
+        recovered = []
+        for motor_id in self.degraded_ids():
+            try:
+                with self.hand._bus_lock:
+                    self.hand.controller.read_raw_data(motor_id, IDENTITY_BLOCK_ADDR, IDENTITY_BLOCK_SIZE)
+            except Exception:
+                continue
+            i = motor_id - 1
+            with self._lock:
+                self._degraded[i] = False
+                self._consecutive[i] = 0
+                self._degraded_since[i] = None
+            print(f"Motor {motor_id} recovered.")
+            recovered.append(motor_id)
+        if recovered:
+            self.hand._restore_motors(recovered)
+        return recovered
+
+    def _run(self):
+        while not self._stop_event.wait(self.probe_interval):
+            if self._degraded.any():
+                self.probe_degraded()
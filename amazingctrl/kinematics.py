@@ -0,0 +1,267 @@
+"""
+Finger kinematics of the AmazingHand.
+
+Each finger is a parallel mechanism driven by two servos. Turning both servos
+the opposite way curls the finger (flexion) and turning them the same way
+swings it sideways (abduction):
+
+    flexion   = (angle_1 - angle_2) / 2
+    abduction = (angle_1 + angle_2) / 2
+
+All angles are in degrees, before calibration, as passed to index()/set_pose().
+Joint angles are side-independent: a left-hand pose is mirrored (see
+gestures.mirror()) to its right-hand equivalent before conversion, so the same
+flexion/abduction gives mirrored servo angles on the two hands.
+
+FingerModel adds the fingertip position. The distal phalanx is coupled to the
+proximal one (distal angle = coupling * proximal angle), so the tip moves on a
+known curve for each abduction. The inverse uses a precomputed dense table of
+that curve with linear interpolation. Every function works on whole batches
+(any leading shape, e.g. time samples x fingers), with no Python loop over
+samples; HandKinematics looks up all four fingers in one pass.
+"""
+import numpy as np
+
+from .gestures import RIGHT_HAND, mirror
+from .scs0009 import NUM_MOTORS
+
+NUM_FINGERS = NUM_MOTORS // 2
+FINGER_NAMES = ("index", "middle", "ring", "thumb")
+
+
+def servo_to_joint(positions, side=RIGHT_HAND):
+    """
+    Converts servo angles to finger joint angles.
+
+    :param positions: Servo angles in degrees, shape (..., 8).
+    :param side: RIGHT_HAND or LEFT_HAND.
+    :return: Array of shape (..., 4, 2): (flexion, abduction) of each finger, in degrees.
+    """
+    positions = np.asarray(positions, dtype=float)
+    if positions.shape[-1] != NUM_MOTORS:
+        raise ValueError(f"Expected {NUM_MOTORS} servo angles on the last axis, got shape {positions.shape}")
+    if side != RIGHT_HAND:
+        positions = mirror(positions)
+    pairs = positions.reshape(positions.shape[:-1] + (NUM_FINGERS, 2))
+    joints = np.empty_like(pairs)
+    joints[..., 0] = (pairs[..., 0] - pairs[..., 1]) * 0.5
+    joints[..., 1] = (pairs[..., 0] + pairs[..., 1]) * 0.5
+    return joints
+
+
+def joint_to_servo(joints, side=RIGHT_HAND):
+    """
+    Converts finger joint angles to servo angles; the inverse of servo_to_joint().
+
+    :param joints: (flexion, abduction) in degrees, shape (..., 4, 2).
+    :param side: RIGHT_HAND or LEFT_HAND.
+    :return: Servo angles in degrees, shape (..., 8), ready for set_pose().
+    """
+    joints = np.asarray(joints, dtype=float)
+    if joints.shape[-2:] != (NUM_FINGERS, 2):
+        raise ValueError(f"Expected joints of shape (..., {NUM_FINGERS}, 2), got {joints.shape}")
+    pairs = np.empty_like(joints)
+    pairs[..., 0] = joints[..., 1] + joints[..., 0]
+    pairs[..., 1] = joints[..., 1] - joints[..., 0]
+    positions = pairs.reshape(joints.shape[:-2] + (NUM_MOTORS,))
+    if side != RIGHT_HAND:
+        positions = mirror(positions)
+    return positions
+
+
+def _planar(flexion_rad, proximal, distal, coupling):
+    """Tip position in the curl plane; the geometry arguments broadcast against `flexion_rad`."""
+    tip = flexion_rad * (1.0 + coupling)
+    reach = proximal * np.cos(flexion_rad) + distal * np.cos(tip)
+    height = proximal * np.sin(flexion_rad) + distal * np.sin(tip)
+    return reach, height
+
+
+def _forward(joints, proximal, distal, coupling):
+    reach, height = _planar(np.deg2rad(joints[..., 0]), proximal, distal, coupling)
+    abduction = np.deg2rad(joints[..., 1])
+    tips = np.empty(joints.shape[:-1] + (3,))
+    tips[..., 0] = reach * np.sin(abduction)
+    tips[..., 1] = height
+    tips[..., 2] = reach * np.cos(abduction)
+    return tips
+
+
+def _lookup(tips, finger, max_distance, steps, size, flexion_table, reach_table):
+    """
+    Inverse table lookup for a batch of tips (see FingerModel.__init__ for the tables).
+
+    :param tips: (x, y, z), shape (..., 3).
+    :param finger: Finger index of each tip, broadcast against the batch.
+    :param max_distance: Tip distance of the straight finger, per finger.
+    :param steps: Grid step in u of each table (finger x curled/extended).
+    :param size: Number of samples per table.
+    :param flexion_table: All tables of flexion (degrees), flattened.
+    :param reach_table: The reach at the same samples, flattened.
+    :return: (flexion, abduction) in degrees, shape (..., 2).
+    """
+    x, y, z = tips[..., 0], tips[..., 1], tips[..., 2]
+    distance = np.sqrt(x * x + y * y + z * z)
+    table = 2 * finger + (y < 0)
+    # Fractional sample index; distances outside the table clamp to its ends.
+    position = np.sqrt(np.maximum(max_distance[finger] - distance, 0.0)) / steps[table]
+    np.clip(position, 0.0, size - 1, out=position)
+    k = np.minimum(position.astype(np.intp), size - 2)
+    w = position - k
+    k += table * size
+    flexion = flexion_table[k] + w * (flexion_table[k + 1] - flexion_table[k])
+    reach = reach_table[k] + w * (reach_table[k + 1] - reach_table[k])
+
+    joints = np.empty(tips.shape[:-1] + (2,))
+    joints[..., 0] = flexion
+    # Curled far enough, the tip is behind the base joint (negative reach)
+    # and the side angle has to be measured from -z.
+    sign = np.where(reach < 0, -1.0, 1.0)
+    joints[..., 1] = np.rad2deg(np.arctan2(sign * x, sign * z))
+    return joints
+
+
+class FingerModel:
+    """
+    Fingertip geometry of one finger.
+
+    Finger frame, with the finger straight along +z: +y points toward the palm
+    (flexion) and +x to the side abduction turns toward. Lengths are in metres.
+    The default lengths are nominal; measure your build for accurate fingertip
+    positions.
+    """
+
+    def __init__(self, proximal=0.048, distal=0.042, coupling=0.8, flexion_range=(-45.0, 110.0),
+                 table_size=4096):
+        """
+        :param proximal: Length of the proximal phalanx, base joint to distal joint.
+        :param distal: Length from the distal joint to the fingertip.
+        :param coupling: Distal joint angle per degree of flexion.
+        :param flexion_range: Flexion angles (degrees) covered by the inverse table,
+                              from extended (negative) to curled (positive).
+        :param table_size: Number of samples in each of the two inverse tables.
+        """
+        if coupling <= 0:
+            raise ValueError("coupling must be positive, or the tip distance does not identify the flexion")
+        if not flexion_range[0] < 0 < flexion_range[1]:
+            raise ValueError("flexion_range must span zero")
+        self.proximal = proximal
+        self.distal = distal
+        self.coupling = coupling
+        self.flexion_range = flexion_range
+        self.table_size = table_size
+
+        # The distance from the base joint to the tip only depends on the distal
+        # angle and is largest with the finger straight, shrinking as it curls
+        # or extends. Flexion and extension give the same distance, so there is
+        # one table per side of zero: [curled, extended].
+        #
+        # Near straight the flexion grows like the square root of the distance
+        # lost, so the tables are sampled uniformly in u = sqrt(max_distance -
+        # distance), where the flexion is smooth. A lookup is then a direct
+        # index and one linear interpolation, without a search.
+        self._max_distance = proximal + distal
+        self._flexion_table = np.empty((2, table_size))
+        self._reach_table = np.empty((2, table_size))
+        self._steps = np.empty(2)
+        for side, end in enumerate((flexion_range[1], flexion_range[0])):
+            dense = np.linspace(0.0, end, 8 * table_size)
+            reach, height = self._planar(np.deg2rad(dense))
+            u = np.sqrt(np.maximum(self._max_distance - np.hypot(reach, height), 0.0))
+            if np.any(np.diff(u) <= 0):
+                raise ValueError("The tip distance must change monotonically over flexion_range; "
+                                 "reduce the range or the coupling")
+            grid = np.linspace(0.0, u[-1], table_size)
+            self._flexion_table[side] = np.interp(grid, u, dense)
+            self._reach_table[side] = self._planar(np.deg2rad(self._flexion_table[side]))[0]
+            self._steps[side] = grid[1]
+
+    def _planar(self, flexion_rad):
+        """Tip position in the curl plane: (reach along the straight finger, height toward the palm)."""
+        return _planar(flexion_rad, self.proximal, self.distal, self.coupling)
+
+    def forward(self, joints):
+        """
+        Fingertip positions of a batch of joint angles.
+
+        :param joints: (flexion, abduction) in degrees, shape (..., 2).
+        :return: (x, y, z) in metres, shape (..., 3).
+        """
+        joints = np.asarray(joints, dtype=float)
+        return _forward(joints, self.proximal, self.distal, self.coupling)
+
+    def inverse(self, tips):
+        """
+        Joint angles reaching a batch of fingertip positions, by table interpolation.
+
+        Flexion comes from the distance of the tip to the base joint and
+        abduction from its side angle, so targets off the reachable surface
+        map to the nearest flexion with the same distance. Distances outside
+        the table are clamped to the flexion range.
+
+        :param tips: (x, y, z) in metres, shape (..., 3).
+        :return: (flexion, abduction) in degrees, shape (..., 2).
+        """
+        tips = np.asarray(tips, dtype=float)
+        return _lookup(tips, 0, np.array([self._max_distance]), self._steps, self.table_size,
+                       self._flexion_table.ravel(), self._reach_table.ravel())
+
+
+class HandKinematics:
+    """
+    Servo angles <-> joint angles <-> fingertip positions for a whole hand.
+
+        kinematics = HandKinematics(side=hand.side)
+        joints = kinematics.joints(trajectory.positions)     # (samples, 4, 2)
+        tips = kinematics.fingertips(trajectory.positions)   # (samples, 4, 3)
+        hand.set_pose(kinematics.servo_angles(tips[-1]))
+    """
+
+    def __init__(self, side=RIGHT_HAND, models=None):
+        """
+        :param side: RIGHT_HAND or LEFT_HAND.
+        :param models: Optional dict of finger name -> FingerModel; FingerModel() for the others.
+        """
+        self.side = side
+        models = models or {}
+        self.models = [models.get(name) or FingerModel() for name in FINGER_NAMES]
+
+        # The geometry of the four fingers as arrays, broadcast over the finger axis.
+        self._proximal = np.array([model.proximal for model in self.models])
+        self._distal = np.array([model.distal for model in self.models])
+        self._coupling = np.array([model.coupling for model in self.models])
+        # The inverse tables of all fingers side by side, for one lookup over the whole hand.
+        self._table_size = self.models[0].table_size
+        if any(model.table_size != self._table_size for model in self.models):
+            raise ValueError("All finger models must have the same table_size")
+        self._max_distance = np.array([model._max_distance for model in self.models])
+        self._steps = np.concatenate([model._steps for model in self.models])
+        self._flexion_table = np.concatenate([model._flexion_table.ravel() for model in self.models])
+        self._reach_table = np.concatenate([model._reach_table.ravel() for model in self.models])
+
+    def joints(self, positions):
+        """Servo angles (..., 8) to (flexion, abduction) (..., 4, 2); see servo_to_joint()."""
+        return servo_to_joint(positions, self.side)
+
+    def servo_angles_from_joints(self, joints):
+        """(flexion, abduction) (..., 4, 2) to servo angles (..., 8); see joint_to_servo()."""
+        return joint_to_servo(joints, self.side)
+
+    def fingertips(self, positions):
+        """
+        :param positions: Servo angles in degrees, shape (..., 8).
+        :return: Fingertip positions in each finger's frame, shape (..., 4, 3).
+        """
+        return _forward(self.joints(positions), self._proximal, self._distal, self._coupling)
+
+    def servo_angles(self, tips):
+        """
+        :param tips: Fingertip positions in each finger's frame, shape (..., 4, 3).
+        :return: Servo angles in degrees, shape (..., 8).
+        """
+        tips = np.asarray(tips, dtype=float)
+        if tips.shape[-2:] != (NUM_FINGERS, 3):
+            raise ValueError(f"Expected fingertips of shape (..., {NUM_FINGERS}, 3), got {tips.shape}")
+        joints = _lookup(tips, np.arange(NUM_FINGERS), self._max_distance, self._steps, self._table_size,
+                         self._flexion_table, self._reach_table)
+        return self.servo_angles_from_joints(joints)
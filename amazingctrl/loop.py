@@ -0,0 +1,150 @@
+"""
+Fixed-rate control loop for the AmazingHand.
+
+ControlLoop calls a user callback on absolute deadlines (start + k * period),
+so bus latency or a slow tick does not make the loop rate drift. Commands that
+the callback sends to the hand are coalesced into one bus flush per tick.
+"""
+import threading
+import time
+
+import numpy as np
+
+# Upper edges of the wake-up latency histogram bins, in seconds.
+LATENCY_BINS = (50e-6, 100e-6, 200e-6, 500e-6, 1e-3, 2e-3, 5e-3, 10e-3, float("inf"))
+
+
+class ControlLoop:
+    """
+    Calls `callback(t)` at a fixed rate, where t is the scheduled tick time in
+    seconds since the loop started.
+    """
+
+    def __init__(self, callback, rate_hz=100, hand=None, spin=0.0005, history=10000):
+        """
+        :param callback: Function called once per tick with the scheduled tick time.
+        :param rate_hz: Loop rate in Hz (e.g. 100-500).
+        :param hand: Optional AmazingHand. Commands sent to it during a tick are
+                     buffered and written in a single flush at the end of the tick.
+        :param spin: How long before each deadline to stop sleeping and busy-wait,
+                     in seconds. Trades CPU for lower jitter; 0 disables spinning.
+        :param history: Number of recent ticks kept for the latency statistics.
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.callback = callback
+        self.period = 1.0 / rate_hz
+        self.hand = hand
+        self.spin = spin
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self._latencies = np.zeros(history)
+        self._durations = np.zeros(history)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration=None):
+        """
+        Runs the loop in a background thread.
+
+        :param duration: Optional run time in seconds; runs until stop() otherwise.
+        """
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self.run, args=(duration,),
+                                        name="amazinghand-control-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the loop after the current tick. Safe to call from the callback.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def run(self, duration=None):
+        """
+        Runs the loop in the calling thread until stop() is called or `duration` elapses.
+
+        :param duration: Optional run time in seconds.
+        """
+        self._stop_event.clear()
+        start = time.perf_counter()
+        k = 0
+        while not self._stop_event.is_set():
+            deadline = start + k * self.period
+            if duration is not None and deadline - start >= duration:
+                break
+            self._wait_until(deadline)
+
+            woke = time.perf_counter()
+            self._tick(deadline - start)
+            done = time.perf_counter()
+
+            slot = self.ticks % len(self._latencies)
+            self._latencies[slot] = woke - deadline
+            self._durations[slot] = done - woke
+            self.ticks += 1
+
+            k += 1
+            next_deadline = start + k * self.period
+            if done > next_deadline:
+                # The tick ran past the next deadline: drop the ticks that were
+                # missed instead of running them back to back.
+                self.overruns += 1
+                missed = int((done - next_deadline) // self.period) + 1
+                self.skipped += missed
+                k += missed
+
+    def _tick(self, t):
+        if self.hand is None:
+            self.callback(t)
+            return
+        with self.hand.batch():
+            self.callback(t)
+
+    def _wait_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin:
+            self._stop_event.wait(remaining - self.spin)
+        while time.perf_counter() < deadline:
+            pass
+
+    def stats(self):
+        """
+        Summarizes the timing of the recent ticks.
+
+        :return: A dict with tick/overrun counts, wake-up latency percentiles
+                 (seconds after the deadline), the mean callback duration and a
+                 latency histogram as a list of (bin upper edge, count) pairs.
+        """
+        n = min(self.ticks, len(self._latencies))
+        latencies = self._latencies[:n]
+        stats = {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "period": self.period,
+        }
+        if n == 0:
+            return stats
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        counts = np.bincount(np.searchsorted(LATENCY_BINS, latencies), minlength=len(LATENCY_BINS))
+        stats.update({
+            "latency_p50": float(p50),
+            "latency_p90": float(p90),
+            "latency_p99": float(p99),
+            "latency_max": float(latencies.max()),
+            "jitter_std": float(latencies.std()),
+            "duration_mean": float(self._durations[:n].mean()),
+            "histogram": list(zip(LATENCY_BINS, counts.tolist())),
+        })
+        return stats
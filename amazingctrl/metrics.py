@@ -0,0 +1,390 @@
+"""
+Per-transaction instrumentation of the servo bus.
+
+InstrumentedController wraps a bus controller (rustypot's Scs0009PyController
+or SimulatedController) and records, for every register read or write, the
+call count, latency histogram, timeouts, errors and bytes on the wire, keyed by
+operation, register and motor. AmazingHand.enable_metrics() installs it;
+when metrics are disabled the hand talks to the bare controller, so there is no
+overhead at all.
+
+The data is available as a Python snapshot or in the Prometheus text format,
+written to a file (e.g. for node_exporter's textfile collector) or served on a
+localhost HTTP endpoint:
+
+    metrics = hand.enable_metrics()
+    ...
+    metrics.snapshot()
+    metrics.write_prometheus("/var/lib/node_exporter/amazinghand.prom")
+    server = metrics.serve(port=9464)     # http://127.0.0.1:9464/metrics
+"""
+import bisect
+import collections
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from .scs0009 import (
+    REGISTERS,
+    REGISTER_SIZES,
+    ping_frame_bytes,
+    read_frame_bytes,
+    sync_write_frame_bytes,
+    write_frame_bytes,
+)
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+METRIC_PREFIX = "amazinghand_bus"
+# Motor label of transactions addressed to several servos at once.
+SYNC_MOTOR = "sync"
+
+
+class _Series:
+    """
+    Counters of one (operation, register, motor) combination.
+    """
+
+    __slots__ = ("calls", "errors", "timeouts", "bytes_sent", "bytes_received",
+                 "latency_sum", "latency_max", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_sum": self.latency_sum,
+            "latency_max": self.latency_max,
+            "latency_mean": self.latency_sum / self.calls if self.calls else 0.0,
+            "latency_buckets": dict(zip(LATENCY_BUCKETS + (float("inf"),), self.buckets)),
+        }
+
+
+class BusMetrics:
+    """
+    Thread-safe store of bus transaction metrics.
+    """
+
+    def __init__(self, labels=None, error_log=100):
+        """
+        :param labels: Constant labels added to every exported series, e.g. {"port": "/dev/ttyACM0"}.
+        :param error_log: Number of recent failures kept by errors().
+        """
+        self.labels = dict(labels or {})
+        self._series = {}
+        self._errors = collections.deque(maxlen=error_log)
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def record(self, op, register, motor, latency, sent, received, error=None, timeout=False):
+        """
+        Accounts for one transaction.
+
+        :param op: Operation: "read", "write", "sync_write", "sync_read" or "ping".
+        :param register: Register name; block transfers are labelled with the first register and
+                         their length, e.g. "present_position[8]".
+        :param motor: Motor id, or SYNC_MOTOR for multi-servo frames.
+        :param latency: Duration of the call in seconds.
+        :param sent: Bytes sent.
+        :param received: Bytes received.
+        :param error: The exception raised by the call, if any.
+        :param timeout: Whether the call failed because the servo did not answer.
+        """
+        key = (op, register, str(motor))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.calls += 1
+            series.bytes_sent += sent
+            series.bytes_received += received
+            series.latency_sum += latency
+            if latency > series.latency_max:
+                series.latency_max = latency
+            series.buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            if timeout:
+                series.timeouts += 1
+            elif error is not None:
+                series.errors += 1
+            if timeout or error is not None:
+                self._errors.append({
+                    "time": time.time(),
+                    "op": op,
+                    "register": register,
+                    "motor": key[2],
+                    "timeout": timeout,
+                    "error": "" if error is None else str(error),
+                })
+
+    def reset(self):
+        """Clears every counter and the error log."""
+        with self._lock:
+            self._series.clear()
+            self._errors.clear()
+            self._started = time.time()
+
+    def snapshot(self):
+        """
+        :return: A list of dicts, one per (op, register, motor) series, with its
+                 counters and latency histogram (bucket upper bound -> count).
+        """
+        with self._lock:
+            items = sorted(self._series.items())
+            rows = []
+            for (op, register, motor), series in items:
+                row = {"op": op, "register": register, "motor": motor}
+                row.update(series.as_dict())
+                rows.append(row)
+        return rows
+
+    def totals(self):
+        """
+        :return: Counters summed over every series, plus the time since the last reset.
+        """
+        totals = {"calls": 0, "errors": 0, "timeouts": 0, "bytes_sent": 0, "bytes_received": 0,
+                  "latency_sum": 0.0}
+        with self._lock:
+            for series in self._series.values():
+                for name in totals:
+                    totals[name] += getattr(series, name)
+            totals["elapsed"] = time.time() - self._started
+        return totals
+
+    def errors(self):
+        """
+        :return: The most recent failed transactions, oldest first.
+        """
+        with self._lock:
+            return list(self._errors)
+
+    def to_prometheus(self):
+        """
+        :return: Every series in the Prometheus text exposition format.
+        """
+        counters = (
+            ("calls_total", "calls", "Bus transactions."),
+            ("errors_total", "errors", "Bus transactions that failed with an error other than a timeout."),
+            ("timeouts_total", "timeouts", "Bus transactions the servo did not answer."),
+            ("bytes_sent_total", "bytes_sent", "Bytes sent on the bus."),
+            ("bytes_received_total", "bytes_received", "Bytes received from the bus."),
+        )
+        with self._lock:
+            items = sorted(self._series.items())
+            lines = []
+            for suffix, attr, help_text in counters:
+                name = f"{METRIC_PREFIX}_{suffix}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for key, series in items:
+                    lines.append(f"{name}{{{self._labels(key)}}} {getattr(series, attr)}")
+
+            name = f"{METRIC_PREFIX}_latency_seconds"
+            lines.append(f"# HELP {name} Duration of bus transactions.")
+            lines.append(f"# TYPE {name} histogram")
+            for key, series in items:
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, series.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {series.calls}')
+                lines.append(f"{name}_sum{{{labels}}} {series.latency_sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {series.calls}")
+        return "\n".join(lines) + "\n"
+
+    def _labels(self, key):
+        op, register, motor = key
+        labels = dict(self.labels, op=op, register=register, motor=motor)
+        return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+    def write_prometheus(self, path):
+        """
+        Writes to_prometheus() to `path`, replacing the file atomically so a
+        scraper never reads a partial dump.
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """
+        Serves to_prometheus() at http://host:port/metrics from a background thread.
+
+        :return: The running MetricsServer; call its stop() method to shut it down.
+        """
+        server = MetricsServer(self, port=port, host=host)
+        server.start()
+        return server
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """
+    Minimal HTTP endpoint exposing a BusMetrics in the Prometheus text format.
+    """
+
+    def __init__(self, metrics, port=9464, host="127.0.0.1"):
+        """
+        :param metrics: The BusMetrics to expose.
+        :param port: TCP port; 0 picks a free one (see the `port` attribute).
+        :param host: Interface to bind. Keep the default to stay reachable from localhost only.
+        """
+        self.metrics = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?")[0] not in ("/", "/metrics"):
+                    handler.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass
+
+        self._server = HTTPServer((host, port), Handler)
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="amazinghand-metrics",
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+def _is_timeout(error):
+    text = str(error).lower()
+    return "timed out" in text or "timeout" in text
+
+
+def _register_name(addr, length):
+    """Label of a raw transfer: the first register, plus the length for block transfers."""
+    entry = REGISTERS.get(addr)
+    if entry is None:
+        return f"addr_{addr}[{length}]"
+    name, size = entry
+    return name if length == size else f"{name}[{length}]"
+
+
+def _transaction(method, args):
+    """
+    Describes a controller call: (op, register, motor, bytes sent, bytes received on success).
+    Returns None for methods that are not bus transactions.
+    """
+    if method == "ping":
+        sent, received = ping_frame_bytes()
+        return "ping", "-", args[0], sent, received
+    if method == "read_raw_data":
+        motor_id, addr, length = args[:3]
+        sent, received = read_frame_bytes(length)
+        return "read", _register_name(addr, length), motor_id, sent, received
+    if method == "write_raw_data":
+        motor_id, addr, data = args[:3]
+        sent, received = write_frame_bytes(len(data))
+        return "write", _register_name(addr, len(data)), motor_id, sent, received
+    if method == "sync_write_raw_data":
+        ids, addr, data = args[:3]
+        length = len(data[0]) if len(data) else 0
+        sent, received = sync_write_frame_bytes(len(ids), length)
+        return "sync_write", _register_name(addr, length), SYNC_MOTOR, sent, received
+    for prefix, op in (("sync_write_", "sync_write"), ("sync_read_", "sync_read"),
+                       ("write_", "write"), ("read_", "read")):
+        if method.startswith(prefix):
+            register = method[len(prefix):]
+            size = REGISTER_SIZES.get(register, 2)
+            if op == "sync_write":
+                sent, received = sync_write_frame_bytes(len(args[0]), size)
+                return op, register, SYNC_MOTOR, sent, received
+            if op == "sync_read":
+                # The SCS0009 has no SYNC READ; the controller issues one READ per servo.
+                sent, received = read_frame_bytes(size)
+                count = len(args[0])
+                return op, register, SYNC_MOTOR, sent * count, received * count
+            sent, received = (write_frame_bytes if op == "write" else read_frame_bytes)(size)
+            return op, register, args[0], sent, received
+    return None
+
+
+class InstrumentedController:
+    """
+    Transparent proxy around a bus controller that records every transaction in a BusMetrics.
+
+    Attributes that are not bus transactions (scan, set_timeout, stats...) are passed through.
+    """
+
+    def __init__(self, controller, metrics=None):
+        """
+        :param controller: The controller to wrap.
+        :param metrics: The BusMetrics to record into; a new one by default.
+        """
+        self.controller = controller
+        self.metrics = metrics if metrics is not None else BusMetrics()
+
+    def __getattr__(self, name):
+        attr = getattr(self.controller, name)
+        if not callable(attr) or name == "scan" or not (
+                name == "ping" or name.startswith(("read_", "write_", "sync_write_", "sync_read_"))):
+            return attr
+        wrapper = self._wrap(name, attr)
+        # Cache the wrapper so later lookups skip __getattr__.
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def _wrap(self, name, method):
+        record = self.metrics.record
+        perf_counter = time.perf_counter
+
+        def call(*args):
+            info = _transaction(name, args)
+            start = perf_counter()
+            try:
+                result = method(*args)
+            except Exception as error:
+                latency = perf_counter() - start
+                if info is not None:
+                    op, register, motor, sent, _ = info
+                    record(op, register, motor, latency, sent, 0, error, _is_timeout(error))
+                raise
+            latency = perf_counter() - start
+            if info is not None:
+                op, register, motor, sent, received = info
+                if name == "ping" and not result:
+                    record(op, register, motor, latency, sent, 0, timeout=True)
+                else:
+                    record(op, register, motor, latency, sent, received)
+            return result
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
@@ -0,0 +1,619 @@
+"""
+Out-of-process bus I/O for the AmazingHand.
+
+ProcessAmazingHand runs the AmazingHand, and with it the serial bus, in a
+dedicated child process. Garbage collection, heavy numpy work or a busy GIL in
+the application then no longer delays bus frames.
+
+The hot path never pickles anything. Goal poses and telemetry are exchanged
+through shared-memory numpy buffers, each guarded by a sequence counter
+(a seqlock). The writer makes the counter odd, writes and makes it even again.
+The reader retries until it has copied the buffer between two equal, even
+counter values.
+
+- Goals (set_pose(), the finger and gesture methods) are computed in the parent
+  and published to the goal buffer. The worker wakes up, writes the newest
+  goals to the bus and skips the ones that were overwritten meanwhile.
+- The worker reads the telemetry of all motors at `telemetry_rate_hz` into the
+  state buffer. read_telemetry() and the read_* methods return the latest
+  sweep without touching the bus.
+- Everything else (start(), stop(), move_to(), wait_settled(), probe(), ...)
+  is forwarded to the child's AmazingHand as a pickled call over a pipe and
+  blocks until it returns. Other public attributes (present_ids,
+  position_deadband, ...) are read and assigned in the child the same way.
+
+In the child, the goal writer, the forwarded calls and the telemetry sweeps
+take turns on the AmazingHand through one lock, so a goal update never
+interleaves with a forwarded call changing the same goal state.
+
+The child is started with the "spawn" method, so scripts using it need an
+`if __name__ == "__main__":` guard, and a custom controller is passed as a
+picklable factory (e.g. the SimulatedController class) instead of an instance.
+"""
+import ctypes
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from .amazingctrl import AmazingHand, _check_finite
+from .gestures import CLOSE_SPEED, GESTURES, MAX_SPEED, Gesture, GestureTable, registry_version
+from .kinematics import joint_to_servo
+from .scs0009 import MOTOR_IDS, NUM_MOTORS, TELEMETRY_DTYPE
+
+# Per-motor telemetry fields in the state buffer, after its timestamp.
+STATE_FIELDS = ("position_deg", "speed", "load", "voltage", "temperature", "ok")
+STATE_SIZE = 1 + NUM_MOTORS * len(STATE_FIELDS)
+
+# Counters shared by both processes.
+GOAL_SEQ, APPLIED_SEQ, STATE_SEQ = range(3)
+
+
+class _Buffers:
+    """
+    The shared-memory blocks of one worker, with numpy views on them.
+
+    Only the RawArrays are pickled when the child is spawned; the views are
+    rebuilt on each side.
+    """
+
+    def __init__(self, ctx):
+        self.counters_raw = ctx.RawArray(ctypes.c_uint64, 3)
+        self.goal_raw = ctx.RawArray(ctypes.c_double, 2 * NUM_MOTORS)
+        self.state_raw = ctx.RawArray(ctypes.c_double, STATE_SIZE)
+        self._views()
+
+    def __getstate__(self):
+        return {"counters_raw": self.counters_raw, "goal_raw": self.goal_raw, "state_raw": self.state_raw}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._views()
+
+    def _views(self):
+        self.counters = np.frombuffer(self.counters_raw, dtype=np.uint64)
+        self.goal = np.frombuffer(self.goal_raw, dtype=np.float64)
+        self.state = np.frombuffer(self.state_raw, dtype=np.float64)
+
+
+def _write_locked(counters, seq, buffer, values):
+    """Seqlock write: odd counter while `buffer` is being updated."""
+    counters[seq] += 1
+    buffer[:] = values
+    counters[seq] += 1
+    return int(counters[seq])
+
+
+def _read_locked(counters, seq, buffer):
+    """Seqlock read: a consistent copy of `buffer` and the counter it belongs to."""
+    while True:
+        before = int(counters[seq])
+        if before & 1:
+            continue
+        values = buffer.copy()
+        if int(counters[seq]) == before:
+            return values, before
+
+
+def _serve_calls(conn, hand, hand_lock, stop_event, wake):
+    """Child side of the control pipe: runs forwarded calls until closed."""
+    while not stop_event.is_set():
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        op, name, args, kwargs = request
+        with hand_lock:
+            try:
+                if op == "shutdown":
+                    result = None
+                    stop_event.set()
+                elif op == "get":
+                    result = getattr(hand, name)
+                elif op == "set":
+                    setattr(hand, name, args[0])
+                    result = None
+                else:
+                    result = getattr(hand, name)(*args, **kwargs)
+                reply = ("ok", result)
+            except Exception as error:
+                reply = ("error", error)
+            goals = hand.get_goal_pose()
+        try:
+            conn.send(reply + goals)
+        except Exception as error:
+            # Unpicklable result or exception.
+            conn.send(("error", RuntimeError(f"{name}: {error!r}")) + goals)
+    stop_event.set()
+    wake.set()
+
+
+def _worker(conn, buffers, wake, port, side, calibration_data, controller_factory, telemetry_rate_hz, cpu):
+    """Entry point of the I/O process."""
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    # The goal writer must not wait the default 5 ms for the GIL behind a telemetry read.
+    sys.setswitchinterval(0.0005)
+    try:
+        controller = controller_factory() if controller_factory is not None else None
+        hand = AmazingHand(port, side=side, calibration_data=calibration_data, controller=controller)
+    except Exception as error:
+        conn.send(("error", error))
+        return
+    conn.send(("ok", hand.get_goal_pose()))
+
+    stop_event = threading.Event()
+    # Every use of the hand below holds this lock (see the module docstring).
+    hand_lock = threading.Lock()
+    server = threading.Thread(target=_serve_calls, args=(conn, hand, hand_lock, stop_event, wake),
+                              name="amazinghand-process-calls", daemon=True)
+    server.start()
+    # Goals get their own thread so that they are written as soon as they are
+    # published; behind the hand lock they wait for at most the sweep or
+    # forwarded call in progress.
+    writer = threading.Thread(target=_write_goals, args=(hand, hand_lock, buffers, wake, stop_event),
+                              name="amazinghand-process-goals", daemon=True)
+    writer.start()
+
+    state = np.empty(STATE_SIZE)
+    period = 1.0 / telemetry_rate_hz if telemetry_rate_hz else None
+    next_sweep = time.monotonic()
+    while not stop_event.is_set():
+        if period is None:
+            stop_event.wait()
+            break
+        if stop_event.wait(max(next_sweep - time.monotonic(), 0.0)):
+            break
+        now = time.monotonic()
+        with hand_lock:
+            telemetry = hand.read_telemetry()
+        state[0] = time.monotonic()
+        for k, field in enumerate(STATE_FIELDS):
+            state[1 + k::len(STATE_FIELDS)] = telemetry[field]
+        _write_locked(buffers.counters, STATE_SEQ, buffers.state, state)
+        next_sweep += period
+        if next_sweep < now:
+            # Overran: restart the schedule instead of sweeping back to back.
+            next_sweep = now + period
+    writer.join(timeout=1.0)
+    server.join(timeout=1.0)
+
+
+def _write_goals(hand, hand_lock, buffers, wake, stop_event):
+    """Writes the newest published goals; intermediate ones published meanwhile are skipped."""
+    counters = buffers.counters
+    while not stop_event.is_set():
+        if not wake.wait(0.1):
+            continue
+        wake.clear()
+        if stop_event.is_set():
+            return
+        if counters[GOAL_SEQ] == counters[APPLIED_SEQ]:
+            continue
+        with hand_lock:
+            goal, seq = _read_locked(counters, GOAL_SEQ, buffers.goal)
+            try:
+                hand.set_pose(goal[:NUM_MOTORS], goal[NUM_MOTORS:])
+            except Exception as error:
+                print(f"Failed to write goals: {error}")
+        counters[APPLIED_SEQ] = seq
+
+
+class ProcessAmazingHand:
+    """
+    An AmazingHand whose bus runs in a child process.
+
+        if __name__ == "__main__":
+            with ProcessAmazingHand("/dev/ttyACM0") as hand:
+                hand.gesture("open")
+                hand.move_and_wait("close")
+                print(hand.read_telemetry())
+
+    Goal and telemetry methods work on shared memory (see the module docstring).
+    Any other AmazingHand method is forwarded to the child and returns its result,
+    and other public attributes are read from and assigned in the child.
+    """
+
+    # Public attributes that live in the parent only.
+    _LOCAL_ATTRIBUTES = frozenset({"port", "MAX_SPEED", "CLOSE_SPEED"})
+
+    def __init__(self, port, side=1, calibration_data=None, controller_factory=None,
+                 telemetry_rate_hz=100, cpu=None, start_timeout=10.0):
+        """
+        :param port: The serial port, as for AmazingHand.
+        :param side: 1 for Right Hand (default), 2 for Left Hand.
+        :param calibration_data: A list of 8 calibration values for the servos.
+        :param controller_factory: Optional picklable callable returning the bus transport,
+                                   called in the child, e.g. amazingctrl.sim.SimulatedController.
+        :param telemetry_rate_hz: Rate of the worker's telemetry sweeps; 0 disables them.
+        :param cpu: Optional CPU the worker is pinned to (Linux only).
+        :param start_timeout: Seconds to wait for the worker to open the bus.
+        """
+        self.port = port
+        self.MAX_SPEED = MAX_SPEED
+        self.CLOSE_SPEED = CLOSE_SPEED
+        self._side = side
+        self._custom_gestures = {}
+        self._gesture_table = None
+        self._batch_depth = 0
+        self._goal_lock = threading.Lock()
+        self._call_lock = threading.Lock()
+
+        ctx = multiprocessing.get_context("spawn")
+        self._buffers = _Buffers(ctx)
+        self._wake = ctx.Event()
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker, name="amazinghand-io", daemon=True,
+            args=(child_conn, self._buffers, self._wake, port, side, calibration_data,
+                  controller_factory, telemetry_rate_hz, cpu),
+        )
+        self._process.start()
+        child_conn.close()
+        if not self._conn.poll(start_timeout):
+            self._process.terminate()
+            raise TimeoutError(f"The I/O process did not start within {start_timeout} s")
+        status, value = self._conn.recv()
+        if status == "error":
+            self._process.join()
+            raise value
+        self._goal_angles, self._goal_speeds = value
+        self._calibration = np.asarray(self._get("calibration_data"), dtype=float)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        self.shutdown()
+
+    # --- Forwarded calls ---
+
+    def _request(self, op, name, args=(), kwargs=None):
+        with self._call_lock:
+            if self._conn is None:
+                raise RuntimeError("The I/O process is closed")
+            self._conn.send((op, name, args, kwargs or {}))
+            status, value, angles, speeds = self._conn.recv()
+        # Forwarded motions (move_to(), grasp(), ...) change the goals in the child.
+        with self._goal_lock:
+            self._goal_angles, self._goal_speeds = angles, speeds
+        if status == "error":
+            raise value
+        return value
+
+    def call(self, name, *args, **kwargs):
+        """
+        Calls an AmazingHand method in the I/O process and returns its result.
+        Arguments and result must be picklable.
+        """
+        return self._request("call", name, args, kwargs)
+
+    def _get(self, name):
+        return self._request("get", name)
+
+    def _set(self, name, value):
+        return self._request("set", name, (value,))
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if callable(getattr(AmazingHand, name, None)):
+            forward = lambda *args, **kwargs: self.call(name, *args, **kwargs)
+            forward.__name__ = name
+            return forward
+        # Instance attributes and properties of the child's AmazingHand.
+        try:
+            return self._get(name)
+        except AttributeError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+
+    def __setattr__(self, name, value):
+        if name.startswith("_") or name in self._LOCAL_ATTRIBUTES or hasattr(type(self), name):
+            super().__setattr__(name, value)
+        else:
+            self._set(name, value)
+
+    def shutdown(self):
+        """
+        Shuts down the I/O process. Call stop() first to release the motors.
+        """
+        if self._conn is None:
+            return
+        try:
+            self._request("shutdown", None)
+        except (EOFError, OSError):
+            pass
+        self._wake.set()
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self._conn = None
+
+    def start(self, probe=True):
+        return self.call("start", probe=probe)
+
+    def stop(self):
+        # Goals still in flight would otherwise be written after the torque is released.
+        self.wait_sent()
+        return self.call("stop")
+
+    # --- Configuration ---
+
+    @property
+    def side(self):
+        """1 for Right Hand, 2 for Left Hand; changed in both processes."""
+        return self._side
+
+    @side.setter
+    def side(self, side):
+        self._set("side", side)
+        self._side = side
+        self._gesture_table = None
+
+    @property
+    def calibration_data(self):
+        """The 8 calibration offsets in degrees, as a tuple; changed in both processes."""
+        return tuple(self._calibration.tolist())
+
+    @calibration_data.setter
+    def calibration_data(self, calibration_data):
+        self._set("calibration_data", calibration_data)
+        self._calibration = np.asarray(calibration_data, dtype=float)
+        self._gesture_table = None
+
+    # --- Goals ---
+
+    def _publish(self):
+        """Hands the current goals over to the I/O process."""
+        with self._goal_lock:
+            goal = np.concatenate([self._goal_angles, self._goal_speeds])
+            _write_locked(self._buffers.counters, GOAL_SEQ, self._buffers.goal, goal)
+        self._wake.set()
+
+    def wait_sent(self, timeout=1.0):
+        """
+        Waits until the I/O process has written the last published goals to the bus.
+
+        :return: False on timeout.
+        """
+        counters = self._buffers.counters
+        target = int(counters[GOAL_SEQ])
+        deadline = time.monotonic() + timeout
+        while int(counters[APPLIED_SEQ]) < target:
+            if time.monotonic() >= deadline or not self._process.is_alive():
+                return False
+            time.sleep(0.0002)
+        return True
+
+    def set_pose(self, positions, speeds=None):
+        """Sets goal positions and speeds for all 8 servos; see AmazingHand.set_pose()."""
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape != (NUM_MOTORS,):
+            raise ValueError(f"Expected {NUM_MOTORS} positions, got shape {positions.shape}")
+        if speeds is None:
+            speeds = self.MAX_SPEED
+        _check_finite(positions, speeds)
+        with self._goal_lock:
+            self._goal_angles[:] = positions
+            self._goal_speeds[:] = speeds
+        if self._batch_depth == 0:
+            self._publish()
+
+    def set_joints(self, joints, speeds=None):
+        """Sets finger joint angles; see AmazingHand.set_joints()."""
+        self.set_pose(joint_to_servo(joints, self._side), speeds)
+
+    @contextmanager
+    def batch(self):
+        """
+        Publishes the goals set inside the block once, when it closes.
+        If the block raises, its goals are discarded, as in AmazingHand.batch().
+        """
+        saved = self.get_goal_pose()
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self._goal_lock:
+                self._goal_angles[:], self._goal_speeds[:] = saved
+            raise
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._publish()
+
+    def flush(self):
+        """Publishes the current goals."""
+        self._publish()
+
+    def get_goal_pose(self):
+        """
+        :return: The last commanded (positions, speeds), as in AmazingHand.get_goal_pose().
+        """
+        with self._goal_lock:
+            return self._goal_angles.copy(), self._goal_speeds.copy()
+
+    def _move_finger(self, motor_ids, angles, speed):
+        indices = np.asarray(motor_ids) - 1
+        _check_finite(angles, speed)
+        with self._goal_lock:
+            self._goal_angles[indices] = angles
+            self._goal_speeds[indices] = speed
+        if self._batch_depth == 0:
+            self._publish()
+
+    def index(self, angle_1, angle_2, speed):
+        self._move_finger([1, 2], [angle_1, angle_2], speed)
+
+    def middle(self, angle_1, angle_2, speed):
+        self._move_finger([3, 4], [angle_1, angle_2], speed)
+
+    def ring(self, angle_1, angle_2, speed):
+        self._move_finger([5, 6], [angle_1, angle_2], speed)
+
+    def thumb(self, angle_1, angle_2, speed):
+        self._move_finger([7, 8], [angle_1, angle_2], speed)
+
+    # --- Gestures ---
+
+    def register_gesture(self, name, positions, speeds=None, left_positions=None):
+        """Adds a custom gesture to this hand, in both processes; see AmazingHand.register_gesture()."""
+        if speeds is None:
+            speeds = self.MAX_SPEED
+        self.call("register_gesture", name, positions, speeds, left_positions)
+        self._custom_gestures[name] = Gesture(name, positions, speeds, left_positions)
+        self._gesture_table = None
+
+    @property
+    def gestures(self):
+        """The compiled gesture table for the current calibration and side."""
+        if self._gesture_table is None or self._gesture_table.version != registry_version():
+            gestures = dict(GESTURES)
+            gestures.update(self._custom_gestures)
+            self._gesture_table = GestureTable(gestures, self._calibration, self._side)
+        return self._gesture_table
+
+    def gesture(self, name):
+        compiled = self.gestures[name]
+        self.set_pose(compiled.positions, compiled.speeds)
+
+    def open(self):
+        self.gesture("open")
+
+    def close(self):
+        self.gesture("close")
+
+    def point(self):
+        self.gesture("point")
+
+    def victory(self):
+        self.gesture("victory")
+
+    def ok(self):
+        self.gesture("ok")
+
+    def pinch(self):
+        self.gesture("pinch")
+
+    def move_and_wait(self, positions, tol_deg=2.0, timeout=3.0, speeds=None, **kwargs):
+        """
+        Sends a pose or gesture and waits in the I/O process until the hand has arrived.
+
+        Gesture names are resolved here, so gestures registered with the
+        module-level register_gesture() in the parent work too.
+        """
+        if isinstance(positions, str):
+            compiled = self.gestures[positions]
+            positions = compiled.positions
+            speeds = compiled.speeds if speeds is None else speeds
+        self.flush()
+        return self.call("move_and_wait", positions, tol_deg, timeout, speeds, **kwargs)
+
+    def grasp(self, target="close", fingers=None, thresholds=200, **options):
+        """Runs an adaptive grasp in the I/O process; see AmazingHand.grasp()."""
+        if isinstance(target, str):
+            target = self.gestures[target].positions
+        self.flush()
+        return self.call("grasp", target, fingers, thresholds, **options)
+
+    # --- Telemetry ---
+
+    def latest(self, fresh=False, timeout=1.0):
+        """
+        Returns the last telemetry sweep of the I/O process.
+
+        :param fresh: Wait for a sweep that starts after this call instead of
+                      returning the last one.
+        :return: (telemetry, age): a TELEMETRY_DTYPE array and the age of the sweep
+                 in seconds (inf before the first sweep).
+        """
+        counters = self._buffers.counters
+        if fresh:
+            # The sweep in progress may have started before this call: wait for the next one.
+            target = (int(counters[STATE_SEQ]) & ~1) + 4
+            deadline = time.monotonic() + timeout
+            while int(counters[STATE_SEQ]) < target:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("No telemetry sweep from the I/O process")
+                time.sleep(0.0005)
+        state, seq = _read_locked(counters, STATE_SEQ, self._buffers.state)
+        telemetry = np.empty(NUM_MOTORS, dtype=TELEMETRY_DTYPE)
+        telemetry["id"] = MOTOR_IDS
+        if seq == 0:
+            for field in STATE_FIELDS[:-1]:
+                telemetry[field] = np.nan
+            telemetry["ok"] = False
+            return telemetry, float("inf")
+        for k, field in enumerate(STATE_FIELDS):
+            telemetry[field] = state[1 + k::len(STATE_FIELDS)]
+        return telemetry, float(time.monotonic() - state[0])
+
+    def read_telemetry(self, fresh=False):
+        """
+        :return: The last telemetry sweep as a TELEMETRY_DTYPE array; see latest().
+        """
+        return self.latest(fresh)[0]
+
+    def _read_field(self, motor_id, field):
+        row = self.read_telemetry()[motor_id - 1]
+        if not row["ok"]:
+            raise RuntimeError(f"No telemetry for motor {motor_id}")
+        return float(row[field])
+
+    def read_position(self, motor_id):
+        return self._read_field(motor_id, "position_deg")
+
+    def read_speed(self, motor_id):
+        return self._read_field(motor_id, "speed")
+
+    def read_load(self, motor_id):
+        return self._read_field(motor_id, "load")
+
+    def read_voltage(self, motor_id):
+        return self._read_field(motor_id, "voltage")
+
+    def read_temperature(self, motor_id):
+        return self._read_field(motor_id, "temperature")
+
+    def get_all_motors_status(self):
+        """
+        The last telemetry sweep as a list of dicts, as in AmazingHand.get_all_motors_status(),
+        with the age of the sweep in seconds under "age".
+        """
+        telemetry, age = self.latest()
+        status_list = []
+        for row in telemetry:
+            motor_id = int(row["id"])
+            if not row["ok"]:
+                status_list.append({"id": motor_id, "error": "read failed", "age": age})
+                continue
+            status_list.append({
+                "id": motor_id,
+                "position": round(float(row["position_deg"]), 2),
+                "speed": float(row["speed"]),
+                "load": float(row["load"]),
+                "voltage": float(row["voltage"]),
+                "temperature": float(row["temperature"]),
+                "age": age,
+            })
+        return status_list
+
+    def stats(self):
+        """
+        :return: A dict with the number of goal updates published, the number of
+                 the last one written by the worker (older unwritten ones were
+                 superseded), and the telemetry sweeps completed.
+        """
+        counters = self._buffers.counters
+        return {
+            "goals_published": int(counters[GOAL_SEQ]) // 2,
+            "last_goal_written": int(counters[APPLIED_SEQ]) // 2,
+            "telemetry_sweeps": int(counters[STATE_SEQ]) // 2,
+        }
@@ -0,0 +1,300 @@
+"""
+Compact binary recording and replay of AmazingHand telemetry and commands.
+
+A recording is a directory with one append-only, memory-mapped file per column
+and a small header.json. Columns have a fixed dtype and grow in chunks; the
+header holds the number of committed rows and is replaced atomically after the
+column data has been flushed, so a crash loses at most the rows written since
+the last commit and never leaves a header pointing at missing data.
+
+load_recording() maps the columns back as numpy arrays without any parsing.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .scs0009 import NUM_MOTORS
+
+FORMAT_NAME = "amazingctrl-recording"
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+
+# Columns of each stream: name -> (dtype, per-row shape).
+TELEMETRY_COLUMNS = {
+    "t": ("<f8", ()),
+    "position_deg": ("<f4", (NUM_MOTORS,)),
+    "speed": ("<f4", (NUM_MOTORS,)),
+    "load": ("<f4", (NUM_MOTORS,)),
+    "voltage": ("<f4", (NUM_MOTORS,)),
+    "temperature": ("<f4", (NUM_MOTORS,)),
+    "ok": ("|b1", (NUM_MOTORS,)),
+}
+COMMAND_COLUMNS = {
+    "t": ("<f8", ()),
+    "positions": ("<f4", (NUM_MOTORS,)),
+    "speeds": ("<f4", (NUM_MOTORS,)),
+}
+
+
+class _Column:
+    """
+    One append-only memory-mapped column file, grown `chunk_rows` at a time.
+    """
+
+    def __init__(self, path, dtype, shape, chunk_rows, rows=0):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.chunk_rows = chunk_rows
+        self.row_bytes = self.dtype.itemsize * int(np.prod(self.shape, dtype=int))
+        self.capacity = 0
+        self._map = None
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        self._grow(max(rows, 1))
+
+    def _grow(self, min_rows):
+        capacity = -(-min_rows // self.chunk_rows) * self.chunk_rows
+        if self._map is not None:
+            self._map.flush()
+            self._map = None
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * self.row_bytes)
+        self._map = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(capacity,) + self.shape)
+        self.capacity = capacity
+
+    def write(self, row, value):
+        if row >= self.capacity:
+            self._grow(row + 1)
+        self._map[row] = value
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self, rows):
+        self._map.flush()
+        self._map = None
+        # Drop the unused tail of the last chunk.
+        with open(self.path, "r+b") as f:
+            f.truncate(rows * self.row_bytes)
+
+
+class _Stream:
+    """
+    A table of columns sharing one row counter.
+    """
+
+    def __init__(self, directory, name, columns, chunk_rows):
+        self.name = name
+        self.columns = columns
+        self.rows = 0
+        self._files = {
+            column: _Column(os.path.join(directory, f"{name}.{column}.bin"), dtype, shape, chunk_rows)
+            for column, (dtype, shape) in columns.items()
+        }
+
+    def append(self, values):
+        row = self.rows
+        for column, file in self._files.items():
+            file.write(row, values[column])
+        self.rows = row + 1
+
+    def flush(self):
+        for file in self._files.values():
+            file.flush()
+
+    def close(self):
+        for file in self._files.values():
+            file.close(self.rows)
+
+    def describe(self):
+        return {
+            "rows": self.rows,
+            "columns": {column: {"dtype": dtype, "shape": list(shape)}
+                        for column, (dtype, shape) in self.columns.items()},
+        }
+
+
+class Recorder:
+    """
+    Records telemetry samples and issued commands to a recording directory.
+
+        recorder = Recorder("run-001.amzrec")
+        recorder.attach(hand)        # records every command and telemetry read
+        ...
+        recorder.close()
+    """
+
+    def __init__(self, path, chunk_rows=4096, commit_interval=1.0):
+        """
+        :param path: Recording directory; created if needed. Existing recordings are not appended to.
+        :param chunk_rows: Rows added to each column file whenever it fills up.
+        :param commit_interval: Seconds between header commits. Rows written since
+                                the last commit are lost if the process crashes.
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, HEADER_FILE)):
+            raise FileExistsError(f"{path} already contains a recording")
+        self.path = path
+        self.commit_interval = commit_interval
+        self.telemetry = _Stream(path, "telemetry", TELEMETRY_COLUMNS, chunk_rows)
+        self.commands = _Stream(path, "commands", COMMAND_COLUMNS, chunk_rows)
+        self._lock = threading.Lock()
+        self._last_commit = time.monotonic()
+        self._hand = None
+        self.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def attach(self, hand):
+        """
+        Records every command sent by `hand` and every telemetry sweep it reads.
+        """
+        self.detach()
+        hand.add_command_listener(self.record_command)
+        hand.add_telemetry_listener(self.record_telemetry)
+        self._hand = hand
+
+    def detach(self):
+        if self._hand is not None:
+            self._hand.remove_command_listener(self.record_command)
+            self._hand.remove_telemetry_listener(self.record_telemetry)
+            self._hand = None
+
+    def record_telemetry(self, timestamp, telemetry):
+        """
+        Appends one telemetry sweep.
+
+        :param timestamp: Monotonic timestamp (time.monotonic()).
+        :param telemetry: A TELEMETRY_DTYPE array, as returned by AmazingHand.read_telemetry().
+        """
+        values = {"t": timestamp}
+        for column in TELEMETRY_COLUMNS:
+            if column != "t":
+                values[column] = telemetry[column]
+        self._append(self.telemetry, values)
+
+    def record_command(self, timestamp, positions, speeds):
+        """
+        Appends one issued command.
+
+        :param timestamp: Monotonic timestamp (time.monotonic()).
+        :param positions: The 8 goal angles in degrees.
+        :param speeds: The 8 goal speeds.
+        """
+        self._append(self.commands, {"t": timestamp, "positions": positions, "speeds": speeds})
+
+    def _append(self, stream, values):
+        with self._lock:
+            stream.append(values)
+            if time.monotonic() - self._last_commit >= self.commit_interval:
+                self._commit()
+
+    def commit(self):
+        """
+        Makes every row written so far durable.
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        self.telemetry.flush()
+        self.commands.flush()
+        header = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "streams": {stream.name: stream.describe() for stream in (self.telemetry, self.commands)},
+        }
+        tmp = os.path.join(self.path, HEADER_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(header, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, HEADER_FILE))
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        """
+        Commits the remaining rows and trims the column files.
+        """
+        self.detach()
+        with self._lock:
+            self._commit()
+            self.telemetry.close()
+            self.commands.close()
+
+
+def load_recording(path):
+    """
+    Maps a recording's committed rows as read-only numpy arrays.
+
+    :param path: Recording directory.
+    :return: A dict of stream name ("telemetry", "commands") -> dict of column -> array.
+    """
+    with open(os.path.join(path, HEADER_FILE)) as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} {FORMAT_NAME}")
+    streams = {}
+    for name, stream in header["streams"].items():
+        rows = stream["rows"]
+        columns = {}
+        for column, spec in stream["columns"].items():
+            shape = (rows,) + tuple(spec["shape"])
+            file = os.path.join(path, f"{name}.{column}.bin")
+            if rows == 0:
+                columns[column] = np.zeros(shape, dtype=spec["dtype"])
+            else:
+                columns[column] = np.memmap(file, dtype=spec["dtype"], mode="r", shape=shape)
+        streams[name] = columns
+    return streams
+
+
+def replay(hand, recording, speed=1.0, start=None, end=None, stop_event=None):
+    """
+    Re-issues a recorded command stream to a hand with the original timing.
+
+    :param hand: The AmazingHand to drive.
+    :param recording: A recording directory or the result of load_recording().
+    :param speed: Playback speed factor; 2.0 replays twice as fast. Goal speeds
+                  are scaled by the same factor so the servos keep up.
+    :param start: Optional start time, in seconds from the first command.
+    :param end: Optional end time, in seconds from the first command.
+    :param stop_event: Optional threading.Event that aborts the replay when set.
+    :return: The number of commands issued.
+    """
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    if not isinstance(recording, dict):
+        recording = load_recording(recording)
+    commands = recording["commands"]
+    times = np.asarray(commands["t"], dtype=float)
+    if len(times) == 0:
+        return 0
+    offsets = times - times[0]
+    first = 0 if start is None else int(np.searchsorted(offsets, start, side="left"))
+    last = len(times) if end is None else int(np.searchsorted(offsets, end, side="right"))
+    positions = np.asarray(commands["positions"][first:last], dtype=float)
+    speeds = np.asarray(commands["speeds"][first:last], dtype=float) * speed
+    deadlines = (offsets[first:last] - offsets[first]) / speed
+
+    t0 = time.perf_counter()
+    for i, deadline in enumerate(deadlines):
+        delay = t0 + deadline - time.perf_counter()
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return i
+            else:
+                time.sleep(delay)
+        elif stop_event is not None and stop_event.is_set():
+            return i
+        hand.set_pose(positions[i], speeds[i])
+    return len(deadlines)
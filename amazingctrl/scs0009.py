@@ -0,0 +1,202 @@
+"""
+Register map and raw encoding helpers for the SCS0009 servos of the AmazingHand.
+
+rustypot converts one value at a time; these helpers do the same conversions on
+whole numpy arrays so a full-hand command can be packed into a single frame.
+"""
+import numpy as np
+
+# Motor ids, in the order used by every 8-element pose array:
+# index (1, 2), middle (3, 4), ring (5, 6), thumb (7, 8).
+MOTOR_IDS = (1, 2, 3, 4, 5, 6, 7, 8)
+NUM_MOTORS = len(MOTOR_IDS)
+
+# Control table addresses (see Scs0009PyController.registers()).
+ADDR_MAX_TORQUE_LIMIT = 16
+ADDR_TORQUE_ENABLE = 40
+ADDR_GOAL_POSITION = 42
+ADDR_GOAL_TIME = 44
+ADDR_GOAL_SPEED = 46
+ADDR_PRESENT_POSITION = 56
+
+# Names and sizes (bytes) of the registers the SDK touches, by address.
+REGISTERS = {
+    0: ("firmware_major_version", 1),
+    1: ("firmware_minor_version", 1),
+    3: ("model_number", 2),
+    16: ("max_torque_limit", 2),
+    40: ("torque_enable", 1),
+    42: ("goal_position", 2),
+    44: ("goal_time", 2),
+    46: ("goal_speed", 2),
+    56: ("present_position", 2),
+    58: ("present_speed", 2),
+    60: ("present_load", 2),
+    62: ("present_voltage", 1),
+    63: ("present_temperature", 1),
+    65: ("status", 1),
+    66: ("moving", 1),
+}
+REGISTER_SIZES = {name: size for name, size in REGISTERS.values()}
+
+# firmware_major_version, firmware_minor_version, (reserved) and model_number
+# are contiguous: one read identifies a servo.
+IDENTITY_BLOCK_ADDR = 0
+IDENTITY_BLOCK_SIZE = 5
+
+# goal_position, goal_time and goal_speed are contiguous, so one sync write
+# starting at goal_position carries both position and speed for each servo.
+GOAL_BLOCK_ADDR = ADDR_GOAL_POSITION
+GOAL_BLOCK_SIZE = 6
+
+# present_position, present_speed, present_load, present_voltage and
+# present_temperature are contiguous: one read returns the whole state.
+PRESENT_BLOCK_ADDR = ADDR_PRESENT_POSITION
+PRESENT_BLOCK_SIZE = 8
+# present_position, present_speed and present_load only: enough to follow a motion.
+MOTION_BLOCK_SIZE = 6
+# (offset, size) of each telemetry field inside the present-state block.
+PRESENT_FIELDS = {
+    "position_deg": (0, 2),
+    "speed": (2, 2),
+    "load": (4, 2),
+    "voltage": (6, 1),
+    "temperature": (7, 1),
+}
+
+# 1024 encoder steps over 300 degrees, centred on step 511.
+STEPS_PER_RAD = 1024 / np.deg2rad(300.0)
+POSITION_CENTER = 511
+POSITION_MAX = 1023
+SPEED_MAX = 0x7FFF
+# Full scale of max_torque_limit and present_load.
+TORQUE_LIMIT_MAX = 1000
+
+# Instruction packets: FF FF id length instruction params... checksum.
+FRAME_OVERHEAD = 6
+BROADCAST_ID = 0xFE
+
+# Bits per byte on the wire (start bit + 8 data bits + stop bit).
+BITS_PER_BYTE = 10
+
+# One row per motor, as returned by AmazingHand.read_telemetry().
+TELEMETRY_DTYPE = np.dtype([
+    ("id", np.uint8),
+    ("position_deg", np.float64),
+    ("speed", np.float64),
+    ("load", np.float64),
+    ("voltage", np.float64),
+    ("temperature", np.float64),
+    ("ok", np.bool_),
+])
+
+
+def encode_position(pos_rad):
+    """
+    Converts goal positions in radians to raw register steps, like rustypot's AnglePosition.
+    """
+    raw = np.trunc(POSITION_CENTER + np.asarray(pos_rad, dtype=float) * STEPS_PER_RAD)
+    return np.clip(raw, 0, POSITION_MAX).astype(np.int64)
+
+
+def encode_speed(speed):
+    """
+    Converts goal speeds in rad/s to raw register steps, like rustypot's Velocity.
+    Negative speeds are clamped to 0, as rustypot does.
+    """
+    raw = np.trunc(np.asarray(speed, dtype=float) * STEPS_PER_RAD)
+    return np.clip(raw, 0, SPEED_MAX).astype(np.int64)
+
+
+def pack_goal_block(pos_raw, speed_raw):
+    """
+    Packs raw goal positions and speeds into one goal_position..goal_speed block per servo.
+
+    :param pos_raw: Raw goal positions, one per servo.
+    :param speed_raw: Raw goal speeds, one per servo.
+    :return: A list of 6-byte payloads, ready for sync_write_raw_data.
+    """
+    pos_raw = np.asarray(pos_raw, dtype=np.int64)
+    speed_raw = np.asarray(speed_raw, dtype=np.int64)
+    block = np.zeros((pos_raw.size, GOAL_BLOCK_SIZE), dtype=np.uint8)
+    # Multi-byte registers are big endian on the SCS0009; goal_time stays 0.
+    block[:, 0] = pos_raw >> 8
+    block[:, 1] = pos_raw & 0xFF
+    block[:, 4] = speed_raw >> 8
+    block[:, 5] = speed_raw & 0xFF
+    return [bytes(row) for row in block]
+
+
+def unpack_goal_block(payloads):
+    """
+    Inverse of pack_goal_block.
+
+    :param payloads: 6-byte goal blocks, one per servo.
+    :return: A (pos_raw, speed_raw) tuple of int64 arrays.
+    """
+    block = np.frombuffer(b"".join(payloads), dtype=np.uint8).reshape(-1, GOAL_BLOCK_SIZE).astype(np.int64)
+    return (block[:, 0] << 8) | block[:, 1], (block[:, 4] << 8) | block[:, 5]
+
+
+def pack_words(raw):
+    """
+    Packs raw 2-byte register values, one per servo, as big-endian payloads for sync_write_raw_data.
+    """
+    raw = np.asarray(raw, dtype=">u2")
+    return [bytes(word) for word in raw.reshape(-1, 1)]
+
+
+def _sign_magnitude(raw, sign_bit):
+    """
+    Decodes sign-magnitude register values (the SCS0009's encoding for speed and load).
+    """
+    magnitude = raw & ((1 << sign_bit) - 1)
+    return np.where(raw & (1 << sign_bit), -magnitude, magnitude)
+
+
+def decode_present_block(block, ok=None, ids=MOTOR_IDS):
+    """
+    Decodes raw present-state blocks of several servos in one vectorized step.
+
+    :param block: An (n, 8) uint8 array, one PRESENT_BLOCK_SIZE read per servo.
+    :param ok: Optional boolean array marking which rows were read successfully.
+               Rows that were not are filled with NaN.
+    :param ids: The motor id of each row.
+    :return: A TELEMETRY_DTYPE structured array with one row per servo.
+    """
+    block = np.asarray(block, dtype=np.int64)
+    word = (block[:, 0::2] << 8) | block[:, 1::2]
+    out = np.empty(len(block), dtype=TELEMETRY_DTYPE)
+    out["id"] = ids
+    out["position_deg"] = np.rad2deg((word[:, 0] - POSITION_CENTER) / STEPS_PER_RAD)
+    out["speed"] = _sign_magnitude(word[:, 1], 15) / STEPS_PER_RAD
+    out["load"] = _sign_magnitude(word[:, 2], 10)
+    out["voltage"] = block[:, 6]
+    out["temperature"] = block[:, 7]
+    if ok is None:
+        out["ok"] = True
+    else:
+        out["ok"] = ok
+        for field in ("position_deg", "speed", "load", "voltage", "temperature"):
+            out[field][~out["ok"]] = np.nan
+    return out
+
+
+def read_frame_bytes(length):
+    """Bytes sent and received by a READ of `length` bytes."""
+    return FRAME_OVERHEAD + 2, FRAME_OVERHEAD + length
+
+
+def write_frame_bytes(length):
+    """Bytes sent and received by a WRITE of `length` bytes."""
+    return FRAME_OVERHEAD + 1 + length, FRAME_OVERHEAD
+
+
+def sync_write_frame_bytes(count, length):
+    """Bytes sent by a SYNC WRITE of `length` bytes to `count` servos (there is no reply)."""
+    return FRAME_OVERHEAD + 2 + count * (1 + length), 0
+
+
+def ping_frame_bytes():
+    """Bytes sent and received by a PING."""
+    return FRAME_OVERHEAD, FRAME_OVERHEAD
@@ -0,0 +1,253 @@
+"""
+Declarative gesture sequences for the AmazingHand.
+
+A sequence script lists poses (gesture names or 8-element arrays) with their
+transition times, holds, loops and per-finger overrides. Angles are written
+for a right hand; on a left hand, literal poses and finger overrides are
+mirrored like the gestures (see amazingctrl.gestures.mirror()):
+
+    {
+        "rate_hz": 100,
+        "defaults": {"duration": 0.8, "hold": 0.2, "blend": 0.3},
+        "steps": [
+            {"pose": "open"},
+            {"repeat": 3, "steps": [
+                {"pose": "close", "duration": 0.6},
+                {"pose": "open", "fingers": {"thumb": [0, -75]}}
+            ]},
+            {"pose": [90, -90, 90, -90, 90, -90, 75, 5], "hold": 1.0, "blend": 0}
+        ]
+    }
+
+The whole script is planned ahead of time into one Trajectory: every step is a
+minimum-jerk transition from the previous pose, and with a `blend` (seconds of
+overlap) the next transition starts before the previous one has finished. The
+transitions are superposed, so blended motion stays smooth and still ends
+exactly on each pose. Joint limits are checked on the planned setpoints, before
+anything is sent, and the result is streamed on a fixed-rate loop by
+AmazingHand.play_trajectory().
+"""
+import json
+
+import numpy as np
+
+from .gestures import RIGHT_HAND, mirror
+from .scs0009 import NUM_MOTORS, POSITION_CENTER, POSITION_MAX, STEPS_PER_RAD
+from .trajectory import Trajectory
+
+# Pose indices of each finger's two servos.
+FINGERS = {"index": (0, 1), "middle": (2, 3), "ring": (4, 5), "thumb": (6, 7)}
+STEP_DEFAULTS = {"duration": 1.0, "hold": 0.0, "blend": 0.0}
+
+# Angles (degrees, calibration included) the servos can be commanded to.
+POSITION_RANGE_DEG = (
+    float(np.rad2deg(-POSITION_CENTER / STEPS_PER_RAD)),
+    float(np.rad2deg((POSITION_MAX - POSITION_CENTER) / STEPS_PER_RAD)),
+)
+
+
+def load_sequence(path):
+    """
+    Reads a sequence script from a JSON or YAML (.yaml/.yml, needs PyYAML) file.
+
+    :return: The script as a dict.
+    """
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Reading YAML sequences requires PyYAML: pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _expand(steps, defaults, path=""):
+    """Flattens nested repeat blocks into a list of (label, step) with defaults applied."""
+    flat = []
+    for i, step in enumerate(steps):
+        label = f"{path}{i}"
+        if "repeat" in step:
+            count = int(step["repeat"])
+            if count < 0:
+                raise ValueError(f"Step {label}: repeat must not be negative")
+            if "steps" not in step:
+                raise ValueError(f"Step {label}: 'repeat' needs 'steps'")
+            inner = dict(defaults)
+            inner.update({key: step[key] for key in STEP_DEFAULTS if key in step})
+            for k in range(count):
+                flat.extend(_expand(step["steps"], inner, f"{label}.{k}."))
+            continue
+        if "pose" not in step and "fingers" not in step:
+            raise ValueError(f"Step {label}: expected 'pose', 'fingers' or 'repeat'")
+        resolved = dict(defaults)
+        resolved.update(step)
+        flat.append((label, resolved))
+    return flat
+
+
+def _resolve_pose(label, step, previous, gestures, side=RIGHT_HAND):
+    """The 8 servo angles of a step for `side`; gestures come from `gestures`, already sided."""
+    pose = step.get("pose")
+    if pose is None:
+        positions = previous.copy()
+    elif isinstance(pose, str):
+        if gestures is None or pose not in gestures:
+            raise ValueError(f"Step {label}: unknown gesture {pose!r}")
+        positions = np.array(gestures[pose].positions, dtype=float)
+    else:
+        positions = np.array(pose, dtype=float)
+        if positions.shape != (NUM_MOTORS,):
+            raise ValueError(f"Step {label}: expected {NUM_MOTORS} angles, got shape {positions.shape}")
+        if side != RIGHT_HAND:
+            positions = mirror(positions)
+    for finger, angles in step.get("fingers", {}).items():
+        if finger not in FINGERS:
+            raise ValueError(f"Step {label}: unknown finger {finger!r}, expected one of {sorted(FINGERS)}")
+        angles = np.array(angles, dtype=float)
+        if angles.shape != (2,):
+            raise ValueError(f"Step {label}: expected 2 angles for {finger!r}, got shape {angles.shape}")
+        if side != RIGHT_HAND:
+            angles = -angles[::-1]
+        positions[list(FINGERS[finger])] = angles
+    return positions
+
+
+def plan_sequence(script, gestures=None, start=None, limits=None, side=RIGHT_HAND, hold_time=None):
+    """
+    Plans a sequence script into a single Trajectory.
+
+    :param script: A script dict (see the module docstring) or a path to a JSON/YAML file.
+    :param gestures: Gesture lookup for named poses, e.g. AmazingHand.gestures.
+    :param start: The 8-element pose the hand starts from; the script's "start"
+                  pose, or its first pose, by default.
+    :param limits: Optional (lower, upper) joint limits in degrees (one value or
+                   8 each); overrides the script's "limits".
+    :param side: Side the literal angles are mirrored for (RIGHT_HAND: as written).
+                 `gestures` and `start` must already be for this side.
+    :param hold_time: Optional callable(seconds) -> seconds applied to every
+                      step's hold, e.g. ThermalLimiter.hold_time().
+    :return: A Trajectory.
+    :raises ValueError: If the script is malformed or a setpoint leaves the limits.
+    """
+    if isinstance(script, str):
+        script = load_sequence(script)
+    rate_hz = float(script.get("rate_hz", 100))
+    defaults = dict(STEP_DEFAULTS)
+    defaults.update(script.get("defaults", {}))
+    steps = _expand(script.get("steps", []) * int(script.get("loop", 1)), defaults)
+    if not steps:
+        raise ValueError("The sequence has no steps")
+
+    if start is None and "start" in script:
+        start = _resolve_pose("start", {"pose": script["start"]}, None, gestures, side)
+    previous = None if start is None else np.array(start, dtype=float)
+
+    # Start time, duration and pose change of every transition.
+    starts, durations, deltas, labels = [], [], [], []
+    t = 0.0
+    end = 0.0
+    for label, step in steps:
+        positions = _resolve_pose(label, step, previous if previous is not None else np.zeros(NUM_MOTORS),
+                                  gestures, side)
+        if previous is None:
+            start = previous = positions
+        duration = float(step["duration"])
+        hold = float(step["hold"])
+        blend = float(step["blend"])
+        if duration <= 0 or hold < 0 or blend < 0:
+            raise ValueError(f"Step {label}: duration must be positive, hold and blend not negative")
+        if hold_time is not None:
+            hold = hold_time(hold)
+        starts.append(t)
+        durations.append(duration)
+        deltas.append(positions - previous)
+        labels.append(label)
+        end = max(end, t + duration + hold)
+        # The next transition starts `blend` seconds before this one has finished and held.
+        t = max(t + duration + hold - blend, t)
+        previous = positions
+
+    n = int(np.floor(end * rate_hz + 1e-9)) + 1
+    times = np.arange(n) / rate_hz
+    if times[-1] < end:
+        times = np.append(times, end)
+        n += 1
+
+    # Superpose the transitions: each adds delta * s(tau) over its window and the
+    # full delta afterwards (accumulated with one cumsum).
+    positions = np.tile(np.asarray(start, dtype=float), (n, 1))
+    velocities = np.zeros((n, NUM_MOTORS))
+    completed = np.zeros((n + 1, NUM_MOTORS))
+    for t0, duration, delta in zip(starts, durations, deltas):
+        first, last = np.searchsorted(times, [t0, t0 + duration], side="left")
+        tau = ((times[first:last] - t0) / duration)[:, None]
+        positions[first:last] += delta * tau ** 3 * (10 - 15 * tau + 6 * tau ** 2)
+        velocities[first:last] += delta * 30 * tau ** 2 * (1 - tau) ** 2 / duration
+        completed[last] += delta
+    positions += np.cumsum(completed, axis=0)[:n]
+    trajectory = Trajectory(times, positions, velocities, rate_hz)
+
+    if limits is None and "limits" in script:
+        limits = (script["limits"]["lower"], script["limits"]["upper"])
+    if limits is not None:
+        check_limits(trajectory, limits[0], limits[1], labels=(labels, starts))
+    return trajectory
+
+
+def check_limits(trajectory, lower, upper, labels=None):
+    """
+    Checks that every setpoint of a trajectory lies within [lower, upper].
+
+    :param lower: Lower joint limits in degrees, one value or 8.
+    :param upper: Upper joint limits in degrees, one value or 8.
+    :param labels: Optional (step labels, step start times), used to name the
+                   offending step in the error.
+    :raises ValueError: On the first setpoint outside the limits.
+    """
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), (NUM_MOTORS,))
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), (NUM_MOTORS,))
+    outside = (trajectory.positions < lower) | (trajectory.positions > upper)
+    if not outside.any():
+        return
+    k, joint = np.argwhere(outside)[0]
+    t = float(trajectory.times[k])
+    where = f"t={t:.2f}s"
+    if labels is not None:
+        names, starts = labels
+        step = max(int(np.searchsorted(starts, t, side="right")) - 1, 0)
+        where = f"step {names[step]}, {where}"
+    raise ValueError(
+        f"Joint {joint + 1} reaches {trajectory.positions[k, joint]:.1f} deg at {where}, "
+        f"outside [{lower[joint]:.1f}, {upper[joint]:.1f}]"
+    )
+
+
+def run_sequence(hand, script, start=None, limits=None):
+    """
+    Plans a sequence for `hand` and streams it on a fixed-rate loop.
+
+    Named poses use the hand's gestures and literal angles are mirrored for a
+    left hand, so one script drives either side. With a ThermalLimiter
+    installed (AmazingHand.enable_thermal()), the holds are shortened by its
+    hold_time() as it stands when the sequence is planned. Besides `limits`,
+    every setpoint is checked against the servo range with the hand's calibration
+    before anything is sent.
+
+    :param hand: The AmazingHand to drive.
+    :param script: A script dict or a path to a JSON/YAML file.
+    :param start: Starting pose; the hand's last commanded pose by default.
+    :param limits: Optional (lower, upper) joint limits in degrees.
+    :return: The planned Trajectory.
+    """
+    if isinstance(script, str):
+        script = load_sequence(script)
+    if start is None and "start" not in script:
+        start = hand.get_goal_pose()[0]
+    hold_time = hand.thermal.hold_time if hand.thermal is not None else None
+    trajectory = plan_sequence(script, gestures=hand.gestures, start=start, limits=limits, side=hand.side,
+                               hold_time=hold_time)
+    calibration = np.asarray(hand.calibration_data)
+    check_limits(trajectory, POSITION_RANGE_DEG[0] - calibration, POSITION_RANGE_DEG[1] - calibration)
+    hand.play_trajectory(trajectory)
+    return trajectory
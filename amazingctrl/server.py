@@ -0,0 +1,429 @@
+"""
+Local hand server: one process owns the bus, many clients share it.
+
+    python -m amazingctrl.server --port /dev/ttyACM0
+    python -m amazingctrl.server --sim --unix /tmp/amazinghand.sock
+
+Clients (see amazingctrl.client.HandClient) connect over TCP or a Unix socket.
+They send poses and gestures with a priority and subscribe to telemetry at
+their own rate. The server reads each telemetry sweep once, encodes it once
+and fans the same bytes out to every subscriber due for it. A slow subscriber
+drops samples instead of holding up the others.
+
+Priorities: the client that last commanded the hand holds control for
+`claim_timeout` seconds after each command. During that time, commands from
+other clients with a lower priority are rejected. Equal or higher priorities
+take over.
+
+Wire format: every message is a HEADER (type, priority, request id, payload
+length; little-endian) followed by its payload:
+
+- MSG_SET_POSE: POSE_FORMAT, 8 angles in degrees then 8 speeds. A NaN angle
+  keeps that joint's goal and a NaN speed means MAX_SPEED.
+- MSG_GESTURE: the gesture name, UTF-8.
+- MSG_SUBSCRIBE: SUBSCRIBE_FORMAT, the telemetry rate in Hz; 0 unsubscribes.
+- MSG_RELEASE: no payload; gives up control.
+- MSG_ACK (server): ACK_FORMAT status, then a UTF-8 detail; echoes the request id.
+- MSG_TELEMETRY (server): SAMPLE_FORMAT (timestamp, sweep number) followed by
+  8 rows of WIRE_DTYPE.
+"""
+import argparse
+import os
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .amazingctrl import AmazingHand
+from .scs0009 import NUM_MOTORS, TELEMETRY_DTYPE
+from .sim import SimulatedController
+from .sockets import remove_stale_socket
+
+HEADER = struct.Struct("<BBHI")
+POSE_FORMAT = struct.Struct(f"<{2 * NUM_MOTORS}f")
+SUBSCRIBE_FORMAT = struct.Struct("<f")
+ACK_FORMAT = struct.Struct("<B")
+SAMPLE_FORMAT = struct.Struct("<dQ")
+WIRE_DTYPE = TELEMETRY_DTYPE.newbyteorder("<")
+
+MSG_SET_POSE = 1
+MSG_GESTURE = 2
+MSG_SUBSCRIBE = 3
+MSG_RELEASE = 4
+MSG_ACK = 128
+MSG_TELEMETRY = 129
+
+ACK_OK = 0
+ACK_REJECTED = 1
+ACK_ERROR = 2
+
+MAX_PAYLOAD = 4096
+DEFAULT_TCP_PORT = 9880
+
+
+def encode_message(kind, payload=b"", priority=0, request_id=0):
+    return HEADER.pack(kind, priority, request_id, len(payload)) + payload
+
+
+def recv_exact(sock, size):
+    """
+    Reads exactly `size` bytes from a stream socket.
+
+    :return: The bytes, or None if the peer closed the connection.
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            return None
+        received += n
+    return bytes(buffer)
+
+
+def recv_message(sock):
+    """
+    :return: (kind, priority, request_id, payload), or None if the peer closed the connection.
+    """
+    header = recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    kind, priority, request_id, length = HEADER.unpack(header)
+    if length > MAX_PAYLOAD:
+        raise ValueError(f"Message of {length} bytes exceeds the {MAX_PAYLOAD}-byte limit")
+    payload = recv_exact(sock, length) if length else b""
+    if payload is None:
+        return None
+    return kind, priority, request_id, payload
+
+
+def decode_telemetry(payload):
+    """
+    :return: (timestamp, sweep number, TELEMETRY_DTYPE array) of a MSG_TELEMETRY payload.
+    """
+    timestamp, sequence = SAMPLE_FORMAT.unpack_from(payload)
+    telemetry = np.frombuffer(payload, dtype=WIRE_DTYPE, offset=SAMPLE_FORMAT.size).astype(TELEMETRY_DTYPE)
+    return timestamp, sequence, telemetry
+
+
+class _Session:
+    """
+    One connected client: its outgoing queue, writer thread and subscription.
+    """
+
+    def __init__(self, sock, name, queue_size):
+        self.sock = sock
+        self.name = name
+        self.decimation = 0
+        self.countdown = 0
+        self.dropped = 0
+        self.accepted = 0
+        self.rejected = 0
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name=f"amazinghand-server-{name}", daemon=True)
+        self._thread.start()
+
+    def send(self, data):
+        """Queues a reply; waits for room, replies are never dropped."""
+        self._queue.put(data)
+
+    def offer(self, data):
+        """Queues a telemetry frame unless the client is behind, in which case it is dropped."""
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _run(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                return
+
+
+class HandServer:
+    """
+    Serves one AmazingHand to several local clients.
+
+        hand = AmazingHand("/dev/ttyACM0")
+        server = HandServer(hand, tcp=("127.0.0.1", 9880))
+        server.start()
+        ...
+        server.stop()
+    """
+
+    def __init__(self, hand, tcp=("127.0.0.1", DEFAULT_TCP_PORT), unix=None, telemetry_rate_hz=100,
+                 claim_timeout=0.5, queue_size=64):
+        """
+        :param hand: The AmazingHand to serve; the server starts and stops it.
+        :param tcp: (host, port) to listen on, None for no TCP. Port 0 picks a free one
+                    (see `tcp_address`). Keep a loopback host: there is no authentication.
+        :param unix: Path of a Unix socket to listen on, or None.
+        :param telemetry_rate_hz: Rate at which telemetry is read for the subscribers.
+                                  Subscribers get every n-th sweep closest to their rate.
+        :param claim_timeout: Seconds a client keeps control after its last command.
+        :param queue_size: Outgoing messages buffered per client before telemetry is dropped.
+        """
+        if tcp is None and unix is None:
+            raise ValueError("Give a TCP address, a Unix socket path or both")
+        self.hand = hand
+        self.telemetry_rate_hz = telemetry_rate_hz
+        self.claim_timeout = claim_timeout
+        self.queue_size = queue_size
+
+        # _lock guards the session list and the sweep number; it is taken by the
+        # telemetry fan-out, so it is never held across a bus write.
+        self._lock = threading.Lock()
+        self._sessions = []
+        # _command_lock guards control ownership and serializes the client commands.
+        self._command_lock = threading.Lock()
+        self._owner = None
+        self._owner_priority = 0
+        self._owner_time = 0.0
+        self._sequence = 0
+        self._servers = []
+        self._threads = []
+        self.tcp_address = None
+        self.unix_path = unix
+
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(handler):
+                server._serve(handler.request, handler.client_address)
+
+        if tcp is not None:
+            class TCPServer(socketserver.ThreadingTCPServer):
+                allow_reuse_address = True
+                daemon_threads = True
+
+            tcp_server = TCPServer(tcp, Handler, bind_and_activate=True)
+            self.tcp_address = tcp_server.server_address[:2]
+            self._servers.append(tcp_server)
+        if unix is not None:
+            if not hasattr(socket, "AF_UNIX"):
+                raise OSError("Unix sockets are not supported on this platform")
+            remove_stale_socket(unix)
+
+            class UnixServer(socketserver.ThreadingUnixStreamServer):
+                daemon_threads = True
+
+            self._servers.append(UnixServer(unix, Handler))
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Starts the hand, the telemetry reads and the listeners."""
+        self.hand.start()
+        self.hand.add_telemetry_listener(self._fan_out)
+        if self.telemetry_rate_hz:
+            self.hand.start_telemetry(rate_hz=self.telemetry_rate_hz)
+        for server in self._servers:
+            thread = threading.Thread(target=server.serve_forever, name="amazinghand-server", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Disconnects every client, stops the listeners and releases the hand."""
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+        self.hand.remove_telemetry_listener(self._fan_out)
+        self.hand.stop()
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+    def serve_forever(self):
+        """Starts the server and blocks until Ctrl-C."""
+        self.start()
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # --- Clients ---
+
+    def _serve(self, sock, address):
+        if sock.family != getattr(socket, "AF_UNIX", None):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        session = _Session(sock, str(address) or "unix", self.queue_size)
+        with self._lock:
+            self._sessions.append(session)
+        try:
+            while True:
+                try:
+                    message = recv_message(sock)
+                except (OSError, ValueError):
+                    break
+                if message is None:
+                    break
+                kind, priority, request_id, payload = message
+                status, detail = self._dispatch(session, kind, priority, payload)
+                session.send(encode_message(MSG_ACK, ACK_FORMAT.pack(status) + detail.encode(),
+                                            request_id=request_id))
+        finally:
+            with self._lock:
+                self._sessions.remove(session)
+            with self._command_lock:
+                if self._owner is session:
+                    self._owner = None
+            session.close()
+
+    def _claim(self, session, priority):
+        """Gives control to `session` if it outranks the current owner; call with _command_lock held."""
+        now = time.monotonic()
+        if (self._owner is None or self._owner is session or priority >= self._owner_priority
+                or now - self._owner_time > self.claim_timeout):
+            self._owner = session
+            self._owner_priority = priority
+            self._owner_time = now
+            return True
+        return False
+
+    def _dispatch(self, session, kind, priority, payload):
+        """Runs one client request; returns (ack status, detail)."""
+        try:
+            if kind == MSG_SUBSCRIBE:
+                (rate_hz,) = SUBSCRIBE_FORMAT.unpack(payload)
+                return self._subscribe(session, rate_hz)
+            if kind == MSG_RELEASE:
+                with self._command_lock:
+                    if self._owner is session:
+                        self._owner = None
+                return ACK_OK, ""
+            if kind == MSG_SET_POSE:
+                values = np.array(POSE_FORMAT.unpack(payload))
+                command = self._set_pose, values[:NUM_MOTORS], values[NUM_MOTORS:]
+            elif kind == MSG_GESTURE:
+                name = payload.decode()
+                if name not in self.hand.gestures:
+                    return ACK_ERROR, f"Unknown gesture {name!r}"
+                command = self.hand.gesture, name
+            else:
+                return ACK_ERROR, f"Unknown message type {kind}"
+            with self._command_lock:
+                if not self._claim(session, priority):
+                    session.rejected += 1
+                    return ACK_REJECTED, f"Hand controlled at priority {self._owner_priority}"
+                session.accepted += 1
+                # Under the lock, so that a client that just lost control cannot
+                # overwrite the new owner's command.
+                command[0](*command[1:])
+            return ACK_OK, ""
+        except Exception as error:
+            return ACK_ERROR, str(error)
+
+    def _set_pose(self, positions, speeds):
+        current = self.hand.get_goal_pose()[0]
+        keep = np.isnan(positions)
+        positions[keep] = current[keep]
+        speeds[np.isnan(speeds)] = self.hand.MAX_SPEED
+        self.hand.set_pose(positions, speeds)
+
+    def _subscribe(self, session, rate_hz):
+        if rate_hz <= 0:
+            session.decimation = 0
+            return ACK_OK, ""
+        if not self.telemetry_rate_hz:
+            return ACK_ERROR, "Telemetry is disabled on this server"
+        session.decimation = max(1, int(round(self.telemetry_rate_hz / rate_hz)))
+        session.countdown = 0
+        return ACK_OK, f"{self.telemetry_rate_hz / session.decimation:g}"
+
+    def _fan_out(self, timestamp, telemetry):
+        """Telemetry listener: encodes the sweep once and queues it for the subscribers due."""
+        with self._lock:
+            subscribers = [session for session in self._sessions if session.decimation]
+            self._sequence += 1
+            sequence = self._sequence
+        if not subscribers:
+            return
+        payload = SAMPLE_FORMAT.pack(timestamp, sequence) + telemetry.astype(WIRE_DTYPE).tobytes()
+        frame = encode_message(MSG_TELEMETRY, payload)
+        for session in subscribers:
+            session.countdown -= 1
+            if session.countdown <= 0:
+                session.countdown = session.decimation
+                session.offer(frame)
+
+    def stats(self):
+        """
+        :return: A dict with the telemetry sweeps read and, per connected client,
+                 commands accepted and rejected, the subscription decimation and
+                 the telemetry frames dropped.
+        """
+        owner = self._owner
+        with self._lock:
+            return {
+                "sweeps": self._sequence,
+                "clients": [
+                    {"name": session.name, "accepted": session.accepted, "rejected": session.rejected,
+                     "decimation": session.decimation, "dropped": session.dropped,
+                     "owner": session is owner}
+                    for session in self._sessions
+                ],
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve an AmazingHand to local clients.")
+    parser.add_argument("--port", help="Serial port of the hand.")
+    parser.add_argument("--sim", action="store_true", help="Serve a simulated hand instead of a serial port.")
+    parser.add_argument("--side", type=int, default=1, help="1 for a right hand, 2 for a left hand.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP interface to listen on.")
+    parser.add_argument("--tcp-port", type=int, default=DEFAULT_TCP_PORT, help="TCP port; -1 disables TCP.")
+    parser.add_argument("--unix", help="Also listen on this Unix socket path.")
+    parser.add_argument("--telemetry-rate", type=float, default=100, help="Telemetry read rate in Hz; 0 disables it.")
+    parser.add_argument("--claim-timeout", type=float, default=0.5,
+                        help="Seconds a client keeps control after its last command.")
+    args = parser.parse_args(argv)
+
+    if args.sim:
+        hand = AmazingHand(port="sim", side=args.side, controller=SimulatedController())
+    elif args.port:
+        hand = AmazingHand(port=args.port, side=args.side)
+    else:
+        parser.error("Give --port or --sim")
+    tcp = None if args.tcp_port < 0 else (args.host, args.tcp_port)
+    server = HandServer(hand, tcp=tcp, unix=args.unix, telemetry_rate_hz=args.telemetry_rate,
+                        claim_timeout=args.claim_timeout)
+    where = [f"tcp://{server.tcp_address[0]}:{server.tcp_address[1]}"] if server.tcp_address else []
+    if args.unix:
+        where.append(f"unix://{args.unix}")
+    print(f"Serving the AmazingHand on {', '.join(where)} (Ctrl-C to stop).")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
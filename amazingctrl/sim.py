@@ -0,0 +1,374 @@
+"""
+In-process simulation of the AmazingHand's SCS0009 servo bus.
+
+SimulatedController implements the parts of rustypot's Scs0009PyController
+used by the SDK on top of per-servo register memory, so an AmazingHand can run
+without hardware:
+
+    hand = AmazingHand(port="sim", controller=SimulatedController())
+
+Servos move toward their goal at the commanded speed (rate-limited first-order
+response), report a synthetic load and heat up with it. Every transaction can
+be delayed by a wire-time model of the 1 Mbaud bus, and bytes and frames are
+counted so the cost of each API can be compared.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+from .scs0009 import (
+    ADDR_GOAL_POSITION,
+    ADDR_MAX_TORQUE_LIMIT,
+    ADDR_GOAL_SPEED,
+    ADDR_PRESENT_POSITION,
+    ADDR_TORQUE_ENABLE,
+    BITS_PER_BYTE,
+    MOTOR_IDS,
+    POSITION_CENTER,
+    POSITION_MAX,
+    STEPS_PER_RAD,
+    TORQUE_LIMIT_MAX,
+    encode_position,
+    encode_speed,
+    ping_frame_bytes,
+    read_frame_bytes,
+    sync_write_frame_bytes,
+    write_frame_bytes,
+)
+
+MODEL_NUMBER = 1284
+FIRMWARE_VERSION = (1, 3)
+REGISTER_SIZE = 86
+
+ADDR_FIRMWARE_MAJOR = 0
+ADDR_FIRMWARE_MINOR = 1
+ADDR_MODEL = 3
+ADDR_ID = 5
+ADDR_PRESENT_SPEED = 58
+ADDR_PRESENT_LOAD = 60
+ADDR_PRESENT_VOLTAGE = 62
+ADDR_PRESENT_TEMPERATURE = 63
+ADDR_MOVING = 66
+
+
+class SimulatedController:
+    """
+    A simulated SCS0009 bus with the same method names as Scs0009PyController.
+    """
+
+    def __init__(self, ids=MOTOR_IDS, baudrate=1000000, timeout=0.5, latency=True,
+                 frame_latency=50e-6, max_speed=10.0, time_constant=0.02,
+                 load_gain=4.0, stall_gain=15.0, ambient_temperature=25.0,
+                 thermal_gain=0.03, thermal_time_constant=120.0, voltage=74):
+        """
+        :param ids: Ids of the servos present on the bus; other ids time out.
+        :param baudrate: Bus speed used by the wire-time model.
+        :param timeout: Time spent waiting for a servo that is not present, in seconds.
+        :param latency: Whether transactions take their modelled wire time. With
+                        False, calls return immediately but bytes are still counted.
+        :param frame_latency: Fixed cost per frame (USB adapter turnaround), in seconds.
+        :param max_speed: Servo speed at goal speed 0 ("full speed") and upper limit, in rad/s.
+        :param time_constant: Time constant of the final approach to the goal, in seconds.
+        :param load_gain: Load per rad/s of motion.
+        :param stall_gain: Load per degree of position error when blocked by an obstacle.
+        :param ambient_temperature: Starting and ambient temperature, in degrees Celsius.
+        :param thermal_gain: Steady-state temperature rise per unit of load.
+        :param thermal_time_constant: Thermal time constant, in seconds.
+        :param voltage: Reported present_voltage (raw, 0.1 V units).
+        """
+        self.ids = tuple(ids)
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.latency = latency
+        self.frame_latency = frame_latency
+        self.max_speed = max_speed * STEPS_PER_RAD
+        self.time_constant = time_constant
+        self.load_gain = load_gain / STEPS_PER_RAD
+        self.stall_gain = stall_gain
+        self.ambient_temperature = ambient_temperature
+        self.thermal_gain = thermal_gain
+        self.thermal_time_constant = thermal_time_constant
+
+        n = len(self.ids)
+        self._index = {motor_id: i for i, motor_id in enumerate(self.ids)}
+        # Control table of every servo, one row per servo.
+        self._registers = np.zeros((n, REGISTER_SIZE), dtype=np.uint8)
+        self._position = np.full(n, float(POSITION_CENTER))
+        self._velocity = np.zeros(n)
+        self._load = np.zeros(n)
+        self._temperature = np.full(n, float(ambient_temperature))
+        # Per-servo obstacle: (position steps, direction) the servo cannot move past.
+        self._obstacles = {}
+        regs = self._registers
+        regs[:, ADDR_FIRMWARE_MAJOR], regs[:, ADDR_FIRMWARE_MINOR] = FIRMWARE_VERSION
+        _set_words(regs, ADDR_MODEL, MODEL_NUMBER)
+        regs[:, ADDR_ID] = self.ids
+        _set_words(regs, ADDR_MAX_TORQUE_LIMIT, TORQUE_LIMIT_MAX)
+        _set_words(regs, ADDR_GOAL_POSITION, POSITION_CENTER)
+        regs[:, ADDR_PRESENT_VOLTAGE] = voltage
+
+        self._lock = threading.Lock()
+        self._open = True
+        self._last_update = time.perf_counter()
+        self.reset_stats()
+
+    # --- Statistics ---
+
+    def reset_stats(self):
+        """Clears the frame and byte counters."""
+        self.frames = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.timeouts = 0
+        self.bus_time = 0.0
+
+    def stats(self):
+        """
+        :return: A dict with frames, bytes sent/received, timeouts and modelled bus time (seconds).
+        """
+        return {
+            "frames": self.frames,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "timeouts": self.timeouts,
+            "bus_time": self.bus_time,
+        }
+
+    def _transaction(self, sent, received, motor_id=None):
+        """Accounts for one frame and waits for its wire time; raises if the servo is absent."""
+        if not self._open:
+            raise RuntimeError("Serial port is closed")
+        present = motor_id is None or motor_id in self._index
+        if not present:
+            received = 0
+        wire_time = self.frame_latency + (sent + received) * BITS_PER_BYTE / self.baudrate
+        self.frames += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.bus_time += wire_time
+        if not present:
+            self.timeouts += 1
+            if self.latency:
+                time.sleep(self.timeout)
+            raise RuntimeError(f"motor {motor_id}: Operation timed out")
+        if self.latency:
+            _sleep_precise(wire_time)
+
+    # --- Physics ---
+
+    def set_obstacle(self, motor_id, position_deg=None):
+        """
+        Blocks a servo at a position, as if the finger touched an object.
+
+        The servo cannot move past `position_deg` in the direction it was moving
+        toward it; pushing against it raises the load. None removes the obstacle.
+        """
+        i = self._index[motor_id]
+        with self._lock:
+            self._update()
+            if position_deg is None:
+                self._obstacles.pop(i, None)
+                return
+            steps = POSITION_CENTER + math.radians(position_deg) * STEPS_PER_RAD
+            self._obstacles[i] = (steps, 1.0 if steps >= self._position[i] else -1.0)
+
+    def _goal(self):
+        regs = self._registers
+        goal = _words(regs, ADDR_GOAL_POSITION).astype(float)
+        speed = (_words(regs, ADDR_GOAL_SPEED) & 0x7FFF).astype(float)
+        speed[speed == 0] = self.max_speed
+        torque = regs[:, ADDR_TORQUE_ENABLE] == 1
+        return goal, np.minimum(speed, self.max_speed), torque
+
+    def _update(self):
+        """Advances the servo state to the current time."""
+        now = time.perf_counter()
+        dt = now - self._last_update
+        self._last_update = now
+        if dt <= 0:
+            return
+        goal, speed, torque = self._goal()
+        tau = self.time_constant
+
+        # Rate-limited first-order response: move at `speed` until the error is
+        # below speed * tau, then decay exponentially toward the goal.
+        error = np.where(torque, goal - self._position, 0.0)
+        threshold = speed * tau
+        linear_time = np.maximum(np.abs(error) - threshold, 0.0) / speed
+        linear = dt <= linear_time
+        step = np.sign(error) * speed * dt
+        remaining = np.maximum(dt - linear_time, 0.0)
+        settled_error = np.sign(error) * np.minimum(np.abs(error), threshold) * np.exp(-remaining / tau)
+        new_position = np.where(linear, self._position + step, np.where(torque, goal - settled_error, self._position))
+
+        blocked_error = np.zeros(len(self.ids))
+        for i, (limit, direction) in self._obstacles.items():
+            if (new_position[i] - limit) * direction > 0:
+                new_position[i] = limit
+                blocked_error[i] = max((goal[i] - limit) * direction, 0.0) * direction
+        self._velocity = (new_position - self._position) / dt
+        self._position = new_position
+
+        blocked_deg = np.rad2deg(blocked_error / STEPS_PER_RAD)
+        # A servo cannot push harder than its torque limit.
+        limit = np.minimum(_words(self._registers, ADDR_MAX_TORQUE_LIMIT), TORQUE_LIMIT_MAX)
+        self._load = np.clip(self._velocity * self.load_gain + blocked_deg * self.stall_gain, -limit, limit)
+        self._load[~torque] = 0.0
+        target = self.ambient_temperature + self.thermal_gain * np.abs(self._load)
+        decay = math.exp(-dt / self.thermal_time_constant)
+        self._temperature = target + (self._temperature - target) * decay
+
+        regs = self._registers
+        _set_words(regs, ADDR_PRESENT_POSITION, np.clip(np.round(self._position), 0, POSITION_MAX))
+        _set_words(regs, ADDR_PRESENT_SPEED, _to_sign_magnitude(self._velocity, 15))
+        _set_words(regs, ADDR_PRESENT_LOAD, _to_sign_magnitude(self._load, 10))
+        regs[:, ADDR_PRESENT_TEMPERATURE] = np.clip(np.round(self._temperature), 0, 255)
+        regs[:, ADDR_MOVING] = np.abs(self._velocity) > 1.0
+
+    # --- Raw access ---
+
+    def _read(self, motor_id, addr, length):
+        sent, received = read_frame_bytes(length)
+        with self._lock:
+            self._transaction(sent, received, motor_id)
+            self._update()
+            return self._registers[self._index[motor_id], addr:addr + length].tolist()
+
+    def _write(self, motor_id, addr, data):
+        sent, received = write_frame_bytes(len(data))
+        with self._lock:
+            self._transaction(sent, received, motor_id)
+            self._update()
+            self._registers[self._index[motor_id], addr:addr + len(data)] = list(data)
+
+    def read_raw_data(self, id, addr, length):
+        return self._read(id, addr, length)
+
+    def write_raw_data(self, id, addr, data):
+        self._write(id, addr, data)
+
+    def sync_write_raw_data(self, ids, addr, data):
+        ids = list(ids)
+        length = len(data[0]) if data else 0
+        sent, received = sync_write_frame_bytes(len(ids), length)
+        with self._lock:
+            self._transaction(sent, received)
+            self._update()
+            for motor_id, payload in zip(ids, data):
+                if motor_id in self._index:
+                    self._registers[self._index[motor_id], addr:addr + len(payload)] = list(payload)
+
+    # --- Scs0009PyController API ---
+
+    def write_torque_enable(self, id, value):
+        self._write(id, ADDR_TORQUE_ENABLE, [value])
+
+    def sync_write_torque_enable(self, ids, values):
+        self.sync_write_raw_data(ids, ADDR_TORQUE_ENABLE, [[value] for value in values])
+
+    def read_torque_enable(self, id):
+        return self._read(id, ADDR_TORQUE_ENABLE, 1)
+
+    def write_goal_position(self, id, value):
+        self._write(id, ADDR_GOAL_POSITION, int(encode_position(value)).to_bytes(2, "big"))
+
+    def sync_write_goal_position(self, ids, values):
+        raw = encode_position(values)
+        self.sync_write_raw_data(ids, ADDR_GOAL_POSITION, [int(v).to_bytes(2, "big") for v in raw])
+
+    def write_goal_speed(self, id, value):
+        self._write(id, ADDR_GOAL_SPEED, int(encode_speed(value)).to_bytes(2, "big"))
+
+    def sync_write_goal_speed(self, ids, values):
+        raw = encode_speed(values)
+        self.sync_write_raw_data(ids, ADDR_GOAL_SPEED, [int(v).to_bytes(2, "big") for v in raw])
+
+    def read_present_position(self, id):
+        raw = _word(self._read(id, ADDR_PRESENT_POSITION, 2))
+        return [(raw - POSITION_CENTER) / STEPS_PER_RAD]
+
+    def read_present_speed(self, id):
+        return [_from_sign_magnitude(_word(self._read(id, ADDR_PRESENT_SPEED, 2)), 15) / STEPS_PER_RAD]
+
+    def read_present_load(self, id):
+        return [_from_sign_magnitude(_word(self._read(id, ADDR_PRESENT_LOAD, 2)), 10)]
+
+    def read_present_voltage(self, id):
+        return self._read(id, ADDR_PRESENT_VOLTAGE, 1)
+
+    def read_present_temperature(self, id):
+        return self._read(id, ADDR_PRESENT_TEMPERATURE, 1)
+
+    def read_model_number(self, id):
+        return [_word(self._read(id, ADDR_MODEL, 2))]
+
+    def read_firmware_major_version(self, id):
+        return self._read(id, ADDR_FIRMWARE_MAJOR, 1)
+
+    def read_firmware_minor_version(self, id):
+        return self._read(id, ADDR_FIRMWARE_MINOR, 1)
+
+    def ping(self, id):
+        sent, received = ping_frame_bytes()
+        with self._lock:
+            try:
+                self._transaction(sent, received, id)
+            except RuntimeError:
+                return False
+        return True
+
+    def scan(self, ids=None):
+        found = {}
+        for motor_id in (range(254) if ids is None else ids):
+            try:
+                found[motor_id] = self.read_model_number(motor_id)[0]
+            except RuntimeError:
+                pass
+        return found
+
+    def set_timeout(self, timeout):
+        if not timeout >= 0 or math.isinf(timeout):
+            raise ValueError("timeout must be a finite, non-negative number of seconds")
+        self.timeout = timeout
+
+    def is_open(self):
+        return self._open
+
+    def close(self):
+        self._open = False
+
+
+def _word(data):
+    return (data[0] << 8) | data[1]
+
+
+def _words(regs, addr):
+    """Big-endian 16-bit registers of every servo."""
+    return (regs[:, addr].astype(np.int64) << 8) | regs[:, addr + 1]
+
+
+def _set_words(regs, addr, values):
+    values = np.asarray(values).astype(np.int64)
+    regs[:, addr] = values >> 8
+    regs[:, addr + 1] = values & 0xFF
+
+
+def _to_sign_magnitude(values, sign_bit):
+    magnitude = np.minimum(np.round(np.abs(values)), (1 << sign_bit) - 1).astype(np.int64)
+    return np.where((values < 0) & (magnitude > 0), magnitude | (1 << sign_bit), magnitude)
+
+
+def _from_sign_magnitude(raw, sign_bit):
+    magnitude = raw & ((1 << sign_bit) - 1)
+    return -magnitude if raw & (1 << sign_bit) else magnitude
+
+
+def _sleep_precise(duration):
+    """Sleeps for sub-millisecond durations, which time.sleep() overshoots."""
+    deadline = time.perf_counter() + duration
+    if duration > 0.002:
+        time.sleep(duration - 0.001)
+    while time.perf_counter() < deadline:
+        pass
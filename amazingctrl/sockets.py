@@ -0,0 +1,34 @@
+"""
+Socket helpers shared by the hand server and the teleoperation input.
+"""
+import os
+import socket
+import stat
+
+
+def remove_stale_socket(path, kind=socket.SOCK_STREAM):
+    """
+    Deletes the Unix socket file at `path` if it was left behind by a server
+    that is gone, so that it can be bound again.
+
+    :param kind: socket.SOCK_STREAM or socket.SOCK_DGRAM, the type of the socket to bind.
+    :raises FileExistsError: If `path` is not a socket, or a server still listens on it.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, kind)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        # Nobody is listening any more.
+        os.unlink(path)
+        return
+    except OSError:
+        pass
+    finally:
+        probe.close()
+    raise FileExistsError(f"{path} is in use by another server")
@@ -0,0 +1,468 @@
+"""
+Background telemetry sampling for the AmazingHand.
+
+A TelemetrySampler thread reads the present state of all motors at a fixed rate
+and stores it in a TelemetryBuffer, a preallocated numpy ring buffer that the
+control thread can read without blocking the bus.
+
+A PollingScheduler instead polls every field (and optionally every motor) at
+its own rate, so fast-changing fields such as position get most of the bus
+while voltage and temperature are served from a cache tagged with their age.
+"""
+import threading
+import time
+
+import numpy as np
+
+from .scs0009 import (
+    BITS_PER_BYTE,
+    MOTOR_IDS,
+    NUM_MOTORS,
+    PRESENT_BLOCK_ADDR,
+    PRESENT_BLOCK_SIZE,
+    PRESENT_FIELDS,
+    TELEMETRY_DTYPE,
+    decode_present_block,
+    read_frame_bytes,
+)
+
+# Fields stored per motor and per sample, in the order of the buffer's last axis.
+TELEMETRY_FIELDS = ("position_deg", "speed", "load", "voltage", "temperature", "ok")
+
+
+class TelemetryBuffer:
+    """
+    Fixed-size ring buffer of telemetry samples (samples x motors x fields).
+
+    Every sample is written twice, at slot i and slot i + size, so the most
+    recent samples are always one contiguous slice and window() can return
+    views instead of copies (valid until the next append). A sequence counter lets readers detect a
+    concurrent write without taking a lock.
+    """
+
+    def __init__(self, history, num_motors=NUM_MOTORS):
+        """
+        :param history: Number of samples kept.
+        :param num_motors: Number of motors per sample.
+        """
+        if history < 1:
+            raise ValueError("history must be at least 1")
+        self.history = history
+        # One spare slot: the slot being overwritten next is never part of a window.
+        self._size = history + 1
+        self._times = np.full(2 * self._size, np.nan)
+        self._data = np.full((2 * self._size, num_motors, len(TELEMETRY_FIELDS)), np.nan)
+        self._count = 0
+        self._seq = 0
+
+    def __len__(self):
+        return min(self._count, self.history)
+
+    @property
+    def count(self):
+        """Total number of samples appended since creation."""
+        return self._count
+
+    def append(self, timestamp, telemetry):
+        """
+        Stores one sample.
+
+        :param timestamp: Monotonic timestamp of the sample (time.monotonic()).
+        :param telemetry: A TELEMETRY_DTYPE array, as returned by AmazingHand.read_telemetry().
+        """
+        slot = self._count % self._size
+        self._seq += 1  # odd while the slot is being written
+        for k, field in enumerate(TELEMETRY_FIELDS):
+            self._data[slot, :, k] = telemetry[field]
+        self._data[slot + self._size] = self._data[slot]
+        self._times[slot] = self._times[slot + self._size] = timestamp
+        self._count += 1
+        self._seq += 1
+
+    def latest(self):
+        """
+        Returns a copy of the most recent sample.
+
+        :return: A (timestamp, values) tuple where values is a (motors x fields) array,
+                 or None if no sample has been stored yet.
+        """
+        while True:
+            seq = self._seq
+            count = self._count
+            if count == 0:
+                return None
+            slot = (count - 1) % self._size
+            timestamp = self._times[slot]
+            values = self._data[slot].copy()
+            if seq % 2 == 0 and seq == self._seq:
+                return timestamp, values
+
+    def window(self, seconds=None, copy=False):
+        """
+        Returns the samples of the last `seconds`, oldest first.
+
+        By default the returned arrays are views into the ring buffer, valid
+        only until the next append(): the slots they cover are written again as
+        soon as the buffer wraps, which for a full buffer is the very next
+        sample. Use them right away on the sampling thread, or pass copy=True
+        when another thread is appending (e.g. a running TelemetrySampler).
+
+        :param seconds: Length of the window, or None for the whole history.
+        :param copy: Return consistent copies instead of views, retrying if a
+                     sample was appended while copying.
+        :return: A (timestamps, values) tuple of shapes (n,) and (n x motors x fields).
+        """
+        while True:
+            seq = self._seq
+            count = self._count
+            n = min(count, self.history)
+            end = (count - 1) % self._size + self._size + 1
+            times = self._times[end - n:end]
+            data = self._data[end - n:end]
+            if seconds is not None and n:
+                start = np.searchsorted(times, times[-1] - seconds, side="left")
+                times, data = times[start:], data[start:]
+            if not copy:
+                return times, data
+            times, data = times.copy(), data.copy()
+            if seq % 2 == 0 and seq == self._seq:
+                return times, data
+
+    def field(self, name):
+        """Index of a field along the buffer's last axis."""
+        return TELEMETRY_FIELDS.index(name)
+
+
+class TelemetrySampler:
+    """
+    Thread that samples AmazingHand.read_telemetry() at a fixed rate into a TelemetryBuffer.
+    """
+
+    def __init__(self, hand, rate_hz=50, history=1000):
+        """
+        :param hand: The AmazingHand to sample.
+        :param rate_hz: Sampling rate in Hz.
+        :param history: Number of samples kept in the ring buffer.
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.hand = hand
+        self.period = 1.0 / rate_hz
+        self.buffer = TelemetryBuffer(history)
+        self.overruns = 0
+        # Failed sweeps, and the exception of the last one; sampling carries on.
+        self.errors = 0
+        self.last_error = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="amazinghand-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def latest(self):
+        """Most recent sample as (timestamp, motors x fields array), see TelemetryBuffer.latest()."""
+        return self.buffer.latest()
+
+    def window(self, seconds=None, copy=True):
+        """
+        The last `seconds` of samples, see TelemetryBuffer.window(). Copies by
+        default, since the sampler thread keeps appending; views (copy=False)
+        are only valid until its next sample.
+        """
+        return self.buffer.window(seconds, copy)
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                telemetry = self.hand.read_telemetry()
+            except Exception as error:
+                # e.g. the port closed under us: count it and retry next period,
+                # instead of leaving latest() stale with no sign of why.
+                if not self.errors:
+                    print(f"Telemetry sweep failed: {error!r}")
+                self.errors += 1
+                self.last_error = error
+            else:
+                self.buffer.append(time.monotonic(), telemetry)
+
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # Missed one or more periods: count them and realign instead of bursting.
+                missed = int(-delay // self.period) + 1
+                self.overruns += missed
+                deadline += missed * self.period
+                delay += missed * self.period
+            self._stop_event.wait(delay)
+
+
+# Default polling rates in Hz of PollingScheduler.
+DEFAULT_POLL_RATES = {
+    "position_deg": 200.0,
+    "speed": 100.0,
+    "load": 100.0,
+    "voltage": 0.5,
+    "temperature": 1.0,
+}
+POLL_FIELDS = tuple(PRESENT_FIELDS)
+
+
+def plan_spans(offsets):
+    """
+    Groups register ranges into the fewest read spans.
+
+    Two ranges are read in one frame whenever the unwanted bytes between them
+    cost less than the overhead of a second frame.
+
+    :param offsets: (offset, size) pairs inside the present-state block.
+    :return: A list of (offset, size) spans, sorted by offset.
+    """
+    frame_cost = sum(read_frame_bytes(0))
+    spans = []
+    for offset, size in sorted(offsets):
+        if spans:
+            start, length = spans[-1]
+            gap = offset - (start + length)
+            if gap < frame_cost:
+                spans[-1] = (start, max(length, offset + size - start))
+                continue
+        spans.append((offset, size))
+    return spans
+
+
+class PollingScheduler:
+    """
+    Multi-rate telemetry poller.
+
+    Each (motor, field) pair has its own period. On every tick the fields that
+    are due are packed, per motor, into the fewest contiguous block reads (see
+    plan_spans()); fields that happen to sit inside a span are refreshed for
+    free. The SCS0009 has no sync read, so a motor costs at least one frame
+    whenever any of its fields is due.
+
+        scheduler = hand.start_polling({"position_deg": 200, "load": 100, "temperature": 1})
+        telemetry, ages = scheduler.latest()
+    """
+
+    def __init__(self, hand, rates=None, overrides=None, baudrate=1000000):
+        """
+        :param hand: The AmazingHand to poll.
+        :param rates: Dict of field -> rate in Hz, merged over DEFAULT_POLL_RATES.
+                      A rate of 0 or None stops polling that field.
+        :param overrides: Optional dict of motor id -> {field: rate} for individual motors.
+        :param baudrate: Bus baud rate, used to report bus utilisation.
+        """
+        merged = dict(DEFAULT_POLL_RATES)
+        merged.update(rates or {})
+        unknown = set(merged) - set(POLL_FIELDS)
+        for motor_rates in (overrides or {}).values():
+            unknown |= set(motor_rates) - set(POLL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown telemetry fields: {sorted(unknown)}; expected one of {POLL_FIELDS}")
+        self.hand = hand
+        self.baudrate = baudrate
+
+        # Period in seconds of every (motor, field) pair; inf when not polled.
+        rates = np.array([[merged[field] or 0.0 for field in POLL_FIELDS]] * NUM_MOTORS, dtype=float)
+        for motor_id, motor_rates in (overrides or {}).items():
+            for field, rate in motor_rates.items():
+                rates[MOTOR_IDS.index(motor_id), POLL_FIELDS.index(field)] = rate or 0.0
+        if (rates < 0).any():
+            raise ValueError("rates must not be negative")
+        if not (rates > 0).any():
+            raise ValueError("at least one field must have a positive rate")
+        with np.errstate(divide="ignore"):
+            self.periods = np.where(rates > 0, 1.0 / rates, np.inf)
+
+        self._offsets = [PRESENT_FIELDS[field] for field in POLL_FIELDS]
+        self._values = np.full((NUM_MOTORS, len(POLL_FIELDS)), np.nan)
+        self._times = np.full((NUM_MOTORS, len(POLL_FIELDS)), -np.inf)
+        self._counts = np.zeros((NUM_MOTORS, len(POLL_FIELDS)), dtype=np.int64)
+        self._ok = np.zeros(NUM_MOTORS, dtype=bool)
+        self._next_due = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # --- Scheduling ---
+
+    def tick(self, now=None):
+        """
+        Reads every field that is due.
+
+        :param now: Monotonic time of the tick; time.monotonic() by default.
+        :return: The number of bus frames sent.
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._next_due is None:
+            self._next_due = np.full_like(self.periods, now)
+            self._next_due[np.isinf(self.periods)] = np.inf
+        due = self._next_due <= now
+        rows = np.flatnonzero(due.any(axis=1))
+        if len(rows) == 0:
+            return 0
+
+        block = np.zeros((len(rows), PRESENT_BLOCK_SIZE), dtype=np.uint8)
+        read = np.zeros((len(rows), len(POLL_FIELDS)), dtype=bool)
+        ok = np.zeros(len(rows), dtype=bool)
+        frames = sent_total = received_total = 0
+        for i, row in enumerate(rows):
+            motor_id = MOTOR_IDS[row]
+            spans = plan_spans([self._offsets[k] for k in np.flatnonzero(due[row])])
+            ok[i] = True
+            for offset, size in spans:
+                sent, received = read_frame_bytes(size)
+                frames += 1
+                sent_total += sent
+                try:
+                    data = self.hand._call_motor(motor_id, "read_raw_data", PRESENT_BLOCK_ADDR + offset, size)
+                except Exception:
+                    ok[i] = False
+                    continue
+                received_total += received
+                block[i, offset:offset + size] = data
+                for k, (field_offset, field_size) in enumerate(self._offsets):
+                    if field_offset >= offset and field_offset + field_size <= offset + size:
+                        read[i, k] = True
+        sample_time = time.monotonic()
+        decoded = decode_present_block(block, ids=[MOTOR_IDS[row] for row in rows])
+
+        with self._lock:
+            for k, field in enumerate(POLL_FIELDS):
+                hit = rows[read[:, k]]
+                self._values[hit, k] = decoded[field][read[:, k]]
+                self._times[hit, k] = sample_time
+                self._counts[hit, k] += 1
+            self._ok[rows] = ok
+            self.ticks += 1
+            self.frames += frames
+            self.bytes_sent += sent_total
+            self.bytes_received += received_total
+            self.errors += int((~ok).sum())
+
+        # Absolute deadlines for the fields that were due; fields refreshed as a
+        # side effect of a span are rescheduled one period after this sample.
+        # Late fields skip the missed periods instead of bursting.
+        for i, row in enumerate(rows):
+            polled = due[row]
+            extra = read[i] & ~polled
+            self._next_due[row, polled] += self.periods[row, polled]
+            self._next_due[row, extra] = sample_time + self.periods[row, extra]
+            late = self._next_due[row] <= now
+            if late.any():
+                self.overruns += int(late.sum())
+                self._next_due[row, late] = now + self.periods[row, late]
+        return frames
+
+    def next_due(self):
+        """Monotonic time at which the next field is due, or None before the first tick."""
+        if self._next_due is None:
+            return None
+        return float(self._next_due.min())
+
+    # --- Results ---
+
+    def latest(self):
+        """
+        Returns the cached value of every field and its age.
+
+        :return: A (telemetry, ages) tuple: a TELEMETRY_DTYPE array (fields never
+                 read are NaN; ok is False for motors whose last read failed) and
+                 an (motors x fields) array of sample ages in seconds, columns in
+                 POLL_FIELDS order.
+        """
+        now = time.monotonic()
+        telemetry = np.empty(NUM_MOTORS, dtype=TELEMETRY_DTYPE)
+        telemetry["id"] = MOTOR_IDS
+        with self._lock:
+            for k, field in enumerate(POLL_FIELDS):
+                telemetry[field] = self._values[:, k]
+            telemetry["ok"] = self._ok
+            ages = now - self._times
+        return telemetry, ages
+
+    def get(self, field, motor_id):
+        """
+        :return: The cached (value, age in seconds) of one field of one motor.
+        """
+        row, k = MOTOR_IDS.index(motor_id), POLL_FIELDS.index(field)
+        with self._lock:
+            return float(self._values[row, k]), time.monotonic() - float(self._times[row, k])
+
+    def reset_stats(self):
+        """Clears the frame, byte, error and overrun counters and the per-field sample counts."""
+        self.ticks = 0
+        self.frames = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.errors = 0
+        self.overruns = 0
+        self._counts[:] = 0
+        self._stats_start = time.monotonic()
+
+    def stats(self):
+        """
+        :return: A dict with ticks, frames, bytes, errors, overruns, the bus
+                 utilisation (fraction of the wire time used) and the achieved
+                 rate in Hz of each field, averaged over motors.
+        """
+        elapsed = max(time.monotonic() - self._stats_start, 1e-9)
+        with self._lock:
+            counts = self._counts.copy()
+            wire_bytes = self.bytes_sent + self.bytes_received
+            stats = {
+                "ticks": self.ticks,
+                "frames": self.frames,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "errors": self.errors,
+                "overruns": self.overruns,
+            }
+        stats["elapsed"] = elapsed
+        stats["bus_utilisation"] = wire_bytes * BITS_PER_BYTE / self.baudrate / elapsed
+        stats["rates_hz"] = {field: float(counts[:, k].mean() / elapsed) for k, field in enumerate(POLL_FIELDS)}
+        return stats
+
+    # --- Background thread ---
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="amazinghand-polling", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.tick()
+            delay = self.next_due() - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
@@ -0,0 +1,283 @@
+"""
+Low-latency teleoperation input for the AmazingHand.
+
+A TeleopInput keeps only the newest target of every joint. Targets arrive
+through submit() (e.g. from a data-glove callback) or as datagrams on a local
+UDP or Unix socket, at any rate. A writer thread sends whatever is newest
+as soon as the bus is free. Frames queued behind a slow write are merged
+instead of replayed, so lag cannot build up. Targets older than `max_age`
+are dropped, and the latency from input timestamp to bus write is recorded.
+
+Timestamps are time.monotonic() values, so the sender must run on the same host.
+
+Datagram format (see pack_target()): a little-endian float64 timestamp
+followed by 8 float32 angles in degrees; NaN leaves a joint unchanged and a
+timestamp of 0 means "stamp on arrival".
+"""
+import math
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .scs0009 import MOTOR_IDS, NUM_MOTORS
+from .sockets import remove_stale_socket
+
+TARGET_FORMAT = struct.Struct("<d8f")
+
+
+def pack_target(positions, timestamp=None):
+    """
+    Encodes a teleop datagram.
+
+    :param positions: 8 angles in degrees (NaN for joints left unchanged).
+    :param timestamp: time.monotonic() at capture; now by default.
+    """
+    if timestamp is None:
+        timestamp = time.monotonic()
+    return TARGET_FORMAT.pack(timestamp, *[float(p) for p in positions])
+
+
+class TeleopInput:
+    """
+    Latest-value-wins target stage between a teleop source and the hand.
+
+        teleop = TeleopInput(hand)
+        teleop.start()
+        teleop.listen_udp(port=9870)      # and/or teleop.submit(angles, timestamp)
+        ...
+        print(teleop.stats())
+        teleop.stop()
+    """
+
+    def __init__(self, hand, max_age=0.05, max_rate_hz=None, speed=None, history=10000):
+        """
+        :param hand: The AmazingHand to drive.
+        :param max_age: Targets older than this (seconds since their input timestamp) are dropped.
+        :param max_rate_hz: Optional cap on the write rate; by default targets are
+                            written as fast as the bus takes them.
+        :param speed: Goal speed sent with the targets; the hand's MAX_SPEED by default.
+        :param history: Number of recent latencies kept for stats().
+        """
+        self.hand = hand
+        self.max_age = max_age
+        self.min_interval = 0.0 if not max_rate_hz else 1.0 / max_rate_hz
+        self.speed = hand.MAX_SPEED if speed is None else speed
+
+        self._targets = np.zeros(NUM_MOTORS)
+        self._stamps = np.full(NUM_MOTORS, -math.inf)
+        self._pending = np.zeros(NUM_MOTORS, dtype=bool)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self._latencies = np.zeros(history)
+        self.reset_stats()
+
+    # --- Input ---
+
+    def submit(self, positions, timestamp=None):
+        """
+        Offers new joint targets; only the newest value per joint is kept.
+
+        :param positions: 8 angles in degrees (NaN for joints left unchanged), or
+                          a dict of motor id -> angle.
+        :param timestamp: time.monotonic() at which the targets were captured; now by default.
+        :raises ValueError: On a wrong number of positions or an infinite angle.
+        """
+        if timestamp is None or timestamp <= 0:
+            timestamp = time.monotonic()
+        if isinstance(positions, dict):
+            values = np.full(NUM_MOTORS, np.nan)
+            for motor_id, angle in positions.items():
+                values[MOTOR_IDS.index(motor_id)] = angle
+        else:
+            values = np.asarray(positions, dtype=float)
+            if values.shape != (NUM_MOTORS,):
+                raise ValueError(f"Expected {NUM_MOTORS} positions, got shape {values.shape}")
+        if np.isinf(values).any():
+            raise ValueError(f"Target angles must be finite or NaN, got {values}")
+        given = ~np.isnan(values)
+        with self._lock:
+            self.received += 1
+            # Frames that arrive out of order never overwrite newer targets.
+            newer = given & (timestamp >= self._stamps)
+            self.out_of_order += int((given & ~newer).any())
+            self.coalesced += int((newer & self._pending).sum())
+            self._targets[newer] = values[newer]
+            self._stamps[newer] = timestamp
+            self._pending |= newer
+        self._wake.set()
+
+    def listen_udp(self, port=9870, host="127.0.0.1"):
+        """
+        Receives target datagrams (see pack_target()) on a UDP socket.
+
+        :return: The bound socket address.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+        return self._listen(sock)
+
+    def listen_unix(self, path):
+        """
+        Receives target datagrams (see pack_target()) on a Unix datagram socket at `path`.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not supported on this platform")
+        remove_stale_socket(path, socket.SOCK_DGRAM)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(path)
+        return self._listen(sock)
+
+    def _listen(self, sock):
+        sock.settimeout(0.1)
+        thread = threading.Thread(target=self._receive, args=(sock,), name="amazinghand-teleop-input", daemon=True)
+        self._listeners.append((sock, thread))
+        thread.start()
+        return sock.getsockname()
+
+    def _receive(self, sock):
+        while not self._stop_event.is_set():
+            try:
+                # One byte more than a target, so oversized datagrams are not truncated into valid ones.
+                data = sock.recv(TARGET_FORMAT.size + 1)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if len(data) != TARGET_FORMAT.size:
+                with self._lock:
+                    self.malformed += 1
+                continue
+            timestamp, *positions = TARGET_FORMAT.unpack(data)
+            try:
+                self.submit(positions, timestamp)
+            except ValueError:
+                with self._lock:
+                    self.malformed += 1
+
+    # --- Output ---
+
+    def flush(self):
+        """
+        Writes the pending targets that are still fresh, in one bus frame.
+
+        :return: The number of joints written to the bus.
+        """
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending.copy()
+            self._pending[:] = False
+            targets = self._targets[pending]
+            stamps = self._stamps[pending]
+        if not pending.any():
+            return 0
+        fresh = now - stamps <= self.max_age
+        if not fresh.all():
+            with self._lock:
+                self.stale += int((~fresh).sum())
+            if not fresh.any():
+                return 0
+        indices = np.flatnonzero(pending)[fresh]
+        written = self.hand.set_targets(indices + 1, targets[fresh], self.speed)
+        done = time.monotonic()
+
+        # Only targets that actually went out on the bus count toward the latency.
+        sent = np.isin(indices + 1, written)
+        latencies = done - stamps[fresh][sent]
+        with self._lock:
+            for latency in latencies:
+                self._latencies[self._count % len(self._latencies)] = latency
+                self._count += 1
+            self.suppressed += len(indices) - len(latencies)
+            if len(latencies):
+                self.writes += 1
+        return len(latencies)
+
+    def start(self):
+        """Starts the writer thread."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="amazinghand-teleop", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the writer thread and closes the sockets."""
+        self._stop_event.set()
+        self._wake.set()
+        for sock, thread in self._listeners:
+            thread.join()
+            sock.close()
+        self._listeners = []
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        last = 0.0
+        while not self._stop_event.is_set():
+            self._wake.wait(0.1)
+            self._wake.clear()
+            if self._stop_event.is_set():
+                return
+            delay = last + self.min_interval - time.monotonic()
+            if delay > 0:
+                # More targets may arrive meanwhile; they are merged into this write.
+                time.sleep(delay)
+            last = time.monotonic()
+            try:
+                self.flush()
+            except Exception as error:
+                # e.g. a bus error: the targets of this write are lost, newer ones are still written.
+                with self._lock:
+                    if not self.errors:
+                        print(f"Teleop write failed: {error!r}")
+                    self.errors += 1
+
+    # --- Statistics ---
+
+    def reset_stats(self):
+        """Clears the counters and latency history."""
+        with self._lock:
+            self.received = 0
+            self.coalesced = 0
+            self.out_of_order = 0
+            self.stale = 0
+            self.malformed = 0
+            self.suppressed = 0
+            self.writes = 0
+            self.errors = 0
+            self._count = 0
+
+    def stats(self):
+        """
+        :return: A dict with input frames received, joint targets coalesced (replaced
+                 before being written), frames out of order, targets dropped as
+                 stale, malformed datagrams, targets not written because the hand
+                 skipped them (degraded servo, unchanged goal or a batch on the
+                 writer thread), bus writes, failed writes, and input-to-write latency
+                 percentiles (seconds) over the targets written.
+        """
+        with self._lock:
+            n = min(self._count, len(self._latencies))
+            latencies = self._latencies[:n].copy()
+            stats = {
+                "received": self.received,
+                "coalesced": self.coalesced,
+                "out_of_order": self.out_of_order,
+                "stale": self.stale,
+                "malformed": self.malformed,
+                "suppressed": self.suppressed,
+                "writes": self.writes,
+                "errors": self.errors,
+            }
+        if n:
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            stats.update(latency_p50=float(p50), latency_p90=float(p90), latency_p99=float(p99),
+                         latency_max=float(latencies.max()))
+        return stats
@@ -0,0 +1,311 @@
+"""
+Thermal model and duty-cycle limiter for the AmazingHand servos.
+
+The SCS0009 only reports a whole-degree temperature, long after the heat went
+in. Holding close() against an object at full load is what overheats the servos
+in continuous pick cycles. ThermalLimiter (installed with
+AmazingHand.enable_thermal()) keeps a first-order thermal model per servo:
+
+    dT/dt = (ambient + load_gain * |load| + speed_gain * |speed| - T) / time_constant
+
+It is advanced with every telemetry sweep (read_telemetry(), e.g. from
+start_telemetry()) and corrected toward the measured temperature. Heating is
+averaged over `heating_window` seconds so that a pick cycle counts as its mean
+duty. From the model it predicts the temperature `horizon` seconds ahead. When
+that prediction enters the band between `soft_limit` and `limit`, the finger is
+throttled in proportion to how deep into the band it is:
+
+- goal speeds of its servos are scaled down (less I^2R while moving),
+- their torque limit (max_torque_limit register) is lowered, so holding
+  against an object draws less current,
+- hold_time() shortens the holds a cycle planner asks for. Sequences played
+  with AmazingHand.play_sequence() use it for their `hold` times; other holds
+  (your own sleeps between gestures, grasp()'s settle_time) are not scaled.
+
+Both servos of a finger get the same throttle, so its motion keeps its shape.
+Throttling eases off again as the prediction drops, so the hand keeps cycling
+at the highest duty that stays under the limit instead of tripping.
+"""
+import collections
+import threading
+
+import numpy as np
+
+from .scs0009 import (
+    ADDR_MAX_TORQUE_LIMIT,
+    MOTOR_IDS,
+    NUM_MOTORS,
+    STEPS_PER_RAD,
+    TORQUE_LIMIT_MAX,
+    pack_words,
+)
+from .sequence import FINGERS
+
+# Speed (rad/s) a servo runs at with goal speed 0, i.e. "as fast as possible".
+FULL_SPEED = 10.0
+# Torque limits are written in steps of this size, to avoid a write per sweep.
+TORQUE_STEP = 50
+
+
+class ThermalLimiter:
+    """
+    Per-servo thermal model and the throttling derived from it.
+    """
+
+    def __init__(self, hand, limit=65.0, soft_limit=55.0, horizon=30.0, time_constant=120.0,
+                 load_gain=0.03, speed_gain=0.3, ambient=None, heating_window=5.0, observer_gain=0.2,
+                 min_speed_scale=0.3, min_torque=300, min_hold_scale=0.3, history=1000):
+        """
+        :param hand: The AmazingHand to protect.
+        :param limit: Temperature (deg C) the servos must stay under; one value or a dict
+                      of finger name -> value.
+        :param soft_limit: Predicted temperature at which throttling starts; one value or a dict.
+        :param horizon: How far ahead (seconds) the temperature is predicted.
+        :param time_constant: Thermal time constant of a servo, in seconds.
+        :param load_gain: Steady-state rise (deg C) per unit of |present_load|.
+        :param speed_gain: Steady-state rise (deg C) per rad/s of |present_speed|.
+        :param ambient: Ambient temperature; the coldest servo's first reading by default.
+        :param heating_window: Time constant (seconds) of the heating average.
+        :param observer_gain: Weight (0-1) of each temperature reading against the model.
+        :param min_speed_scale: Speed scale at full throttle.
+        :param min_torque: Torque limit (raw, 0-1000) at full throttle.
+        :param min_hold_scale: Hold-time scale at full throttle.
+        :param history: Number of throttling decisions kept for decisions().
+        """
+        self.hand = hand
+        self.limit = self._per_motor(limit)
+        self.soft_limit = self._per_motor(soft_limit)
+        if np.any(self.soft_limit >= self.limit):
+            raise ValueError("soft_limit must be below limit")
+        self.horizon = horizon
+        self.time_constant = time_constant
+        self.load_gain = load_gain
+        self.speed_gain = speed_gain
+        self.ambient = ambient
+        self.heating_window = heating_window
+        self.observer_gain = observer_gain
+        self.min_speed_scale = min_speed_scale
+        self.min_torque = min_torque
+        self.min_hold_scale = min_hold_scale
+
+        self._lock = threading.Lock()
+        self._temperature = np.full(NUM_MOTORS, np.nan)
+        self._measured = np.full(NUM_MOTORS, np.nan)
+        self._heating = np.zeros(NUM_MOTORS)
+        self._last_update = None
+        self._severity = np.zeros(NUM_MOTORS)
+        self._torque_limit = np.full(NUM_MOTORS, TORQUE_LIMIT_MAX, dtype=np.int64)
+        # Torque limits the servos hold (-1: unknown, written on the next update).
+        self._torque_sent = np.full(NUM_MOTORS, -1, dtype=np.int64)
+        # Counts the invalidate() calls per servo, so a write racing one does not undo it.
+        self._invalidations = np.zeros(NUM_MOTORS, dtype=np.int64)
+        # Failed torque-limit writes; the limits are retried on the next update.
+        self.write_errors = 0
+        self._throttled = dict.fromkeys(FINGERS, False)
+        self._decisions = collections.deque(maxlen=history)
+
+    @staticmethod
+    def _per_motor(value):
+        if not isinstance(value, dict):
+            return np.full(NUM_MOTORS, float(value))
+        values = np.full(NUM_MOTORS, np.nan)
+        for finger, pair in FINGERS.items():
+            values[list(pair)] = value[finger]
+        return values
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Feeds the model from every telemetry sweep of the hand."""
+        self.hand.add_telemetry_listener(self.update)
+
+    def stop(self):
+        """Stops listening, lifts the throttling and restores the full torque limit."""
+        self.hand.remove_telemetry_listener(self.update)
+        with self._lock:
+            self._severity[:] = 0.0
+            self._torque_limit[:] = TORQUE_LIMIT_MAX
+        self._write_torque_limits()
+
+    def invalidate(self, indices=slice(None)):
+        """
+        Forgets the torque limits the servos are assumed to hold (e.g. after a
+        power cycle); they are rewritten on the next update.
+        """
+        with self._lock:
+            self._torque_sent[indices] = -1
+            self._invalidations[indices] += 1
+
+    # --- Model ---
+
+    def update(self, timestamp, telemetry):
+        """
+        Advances the model to `timestamp` with one telemetry sweep and updates the throttling.
+
+        :param timestamp: time.monotonic() of the sweep.
+        :param telemetry: A TELEMETRY_DTYPE array, as returned by read_telemetry().
+        """
+        ok = telemetry["ok"]
+        measured = np.where(ok, telemetry["temperature"], np.nan)
+        heating = self.load_gain * np.abs(telemetry["load"]) + self.speed_gain * np.abs(telemetry["speed"])
+        with self._lock:
+            if self.ambient is None:
+                if not ok.any():
+                    return
+                self.ambient = float(np.nanmin(measured))
+            first = np.isnan(self._temperature) & ok
+            self._temperature[first] = measured[first]
+            self._heating[first] = heating[first]
+            if self._last_update is not None:
+                dt = max(timestamp - self._last_update, 0.0)
+                # Heating average and model step, for the servos that answered.
+                alpha = 1.0 - np.exp(-dt / self.heating_window)
+                self._heating[ok] += alpha * (heating[ok] - self._heating[ok])
+                steady = self.ambient + self._heating
+                decay = np.exp(-dt / self.time_constant)
+                predicted = steady + (self._temperature - steady) * decay
+                self._temperature[ok] = predicted[ok] + self.observer_gain * (measured[ok] - predicted[ok])
+            self._last_update = timestamp
+            self._measured[ok] = measured[ok]
+            self._throttle(timestamp)
+        self._write_torque_limits()
+
+    def _predict(self, horizon):
+        steady = self.ambient + self._heating
+        return steady + (self._temperature - steady) * np.exp(-horizon / self.time_constant)
+
+    def _throttle(self, timestamp):
+        """Recomputes the per-finger throttling; call with the lock held."""
+        predicted = np.fmax(self._predict(self.horizon), self._temperature)
+        severity = np.clip((predicted - self.soft_limit) / (self.limit - self.soft_limit), 0.0, 1.0)
+        severity = np.nan_to_num(severity)
+        for finger, pair in FINGERS.items():
+            pair = list(pair)
+            value = severity[pair].max()
+            severity[pair] = value
+            throttled = value > 0
+            if throttled != self._throttled[finger]:
+                self._throttled[finger] = throttled
+                hottest = float(np.nanmax(self._temperature[pair]))
+                if throttled:
+                    print(f"Throttling {finger} finger: {hottest:.1f} C, "
+                          f"{float(np.nanmax(predicted[pair])):.1f} C predicted in {self.horizon:g} s.")
+                else:
+                    print(f"{finger.capitalize()} finger back to full duty ({hottest:.1f} C).")
+        changed = np.flatnonzero(np.abs(severity - self._severity) >= 0.01)
+        self._severity[:] = severity
+        torque = TORQUE_LIMIT_MAX - severity * (TORQUE_LIMIT_MAX - self.min_torque)
+        self._torque_limit[:] = np.round(torque / TORQUE_STEP).astype(np.int64) * TORQUE_STEP
+        for i in changed:
+            self._decisions.append({
+                "time": timestamp,
+                "id": MOTOR_IDS[i],
+                "temperature": float(self._temperature[i]),
+                "predicted": float(predicted[i]),
+                "severity": float(severity[i]),
+                "speed_scale": float(self._speed_scale()[i]),
+                "torque_limit": int(self._torque_limit[i]),
+            })
+
+    def _write_torque_limits(self):
+        with self._lock:
+            indices = np.flatnonzero(self._torque_limit != self._torque_sent)
+            if self.hand.health is not None:
+                indices = indices[self.hand.health.available(indices)]
+            values = self._torque_limit[indices]
+            invalidations = self._invalidations[indices]
+        if not len(indices):
+            return
+        # The servos boot with the EEPROM lock on: the write takes effect but is not persisted.
+        # invalidate() is called under the bus lock, so _lock is not held across it.
+        try:
+            with self.hand._bus_lock:
+                self.hand.controller.sync_write_raw_data((indices + 1).tolist(), ADDR_MAX_TORQUE_LIMIT,
+                                                         pack_words(values))
+        except Exception as error:
+            if not self.write_errors:
+                print(f"Failed to write the torque limits: {error}")
+            self.write_errors += 1
+            return
+        with self._lock:
+            # Servos invalidated during the write keep -1 and are rewritten next time.
+            current = self._invalidations[indices] == invalidations
+            self._torque_sent[indices[current]] = values[current]
+
+    # --- Throttling ---
+
+    def _speed_scale(self):
+        return 1.0 - self._severity * (1.0 - self.min_speed_scale)
+
+    def scale_speeds(self, indices, speed_raw):
+        """
+        Applies the speed throttling to raw goal speeds (see AmazingHand._write_goals()).
+
+        :param indices: Indices into the 8-element pose arrays (motor id - 1).
+        :param speed_raw: Raw goal speeds of those servos; 0 means full speed.
+        :return: The scaled raw speeds.
+        """
+        scale = self._speed_scale()[indices]
+        if np.all(scale >= 1.0):
+            return speed_raw
+        full = np.where(speed_raw == 0, int(FULL_SPEED * STEPS_PER_RAD), speed_raw)
+        return np.where(scale < 1.0, np.maximum((full * scale).astype(np.int64), 1), speed_raw)
+
+    def hold_time(self, seconds, finger=None):
+        """
+        Shortens a hold under load according to the throttling.
+
+        :param seconds: The hold time a cycle would use at full duty.
+        :param finger: Finger the hold loads; the most throttled finger by default.
+        :return: The hold time to use, in seconds.
+        """
+        severity = self._severity[list(FINGERS[finger])].max() if finger else self._severity.max()
+        return seconds * (1.0 - severity * (1.0 - self.min_hold_scale))
+
+    def cooldown_time(self, finger=None):
+        """
+        :param finger: A finger name; the hottest servo of the hand by default.
+        :return: Seconds at rest (no heating) until the servo is back under its soft limit.
+        """
+        with self._lock:
+            indices = list(FINGERS[finger]) if finger else list(range(NUM_MOTORS))
+            excess = self._temperature[indices] - self.ambient
+            target = self.soft_limit[indices] - self.ambient
+        with np.errstate(divide="ignore", invalid="ignore"):
+            times = np.where(excess > target, self.time_constant * np.log(excess / target), 0.0)
+        return float(np.nanmax(times)) if len(times) else 0.0
+
+    # --- State ---
+
+    def status(self):
+        """
+        :return: A dict of motor id -> {"temperature" (model estimate), "measured",
+                 "predicted" (at the horizon), "steady_state" (at the current heating),
+                 "limit", "severity" (0-1), "speed_scale", "torque_limit", "hold_scale"}.
+        """
+        with self._lock:
+            predicted = self._predict(self.horizon) if self.ambient is not None else self._temperature
+            steady = (self.ambient + self._heating) if self.ambient is not None else self._temperature
+            speed_scale = self._speed_scale()
+            return {
+                motor_id: {
+                    "temperature": float(self._temperature[i]),
+                    "measured": float(self._measured[i]),
+                    "predicted": float(predicted[i]),
+                    "steady_state": float(steady[i]),
+                    "limit": float(self.limit[i]),
+                    "severity": float(self._severity[i]),
+                    "speed_scale": float(speed_scale[i]),
+                    "torque_limit": int(self._torque_limit[i]),
+                    "hold_scale": float(1.0 - self._severity[i] * (1.0 - self.min_hold_scale)),
+                }
+                for i, motor_id in enumerate(MOTOR_IDS)
+            }
+
+    def decisions(self):
+        """
+        :return: The recent throttling changes, oldest first: dicts with "time",
+                 "id", "temperature", "predicted", "severity", "speed_scale" and "torque_limit".
+        """
+        with self._lock:
+            return list(self._decisions)
@@ -0,0 +1,169 @@
+"""
+Smooth multi-joint trajectories for the AmazingHand.
+
+Setpoints for all 8 joints and every sample are computed at once as numpy
+arrays, so planning a transition costs a handful of array operations rather
+than per-sample Python math. Play them back with AmazingHand.play_trajectory().
+"""
+import numpy as np
+
+from .scs0009 import NUM_MOTORS
+
+METHODS = ("min_jerk", "cubic")
+
+
+class Trajectory:
+    """
+    Time-sampled joint setpoints.
+
+    :ivar times: Sample times in seconds, shape (n,).
+    :ivar positions: Joint angles in degrees, shape (n, 8), same convention as set_pose().
+    :ivar velocities: Joint velocities in degrees per second, shape (n, 8).
+    :ivar rate_hz: Sample rate.
+    """
+
+    def __init__(self, times, positions, velocities, rate_hz):
+        self.times = times
+        self.positions = positions
+        self.velocities = velocities
+        self.rate_hz = rate_hz
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    def servo_speeds(self, margin=1.2, min_speed=0.5):
+        """
+        Goal speeds (rad/s) that let each servo keep up with the trajectory.
+
+        The SCS0009 treats a goal speed of 0 as "full speed", so speeds are
+        floored at `min_speed` where the trajectory is at rest.
+
+        :param margin: Factor applied to the trajectory speed so the servo does not lag.
+        :param min_speed: Lowest speed sent, in rad/s.
+        """
+        return np.maximum(np.deg2rad(np.abs(self.velocities)) * margin, min_speed)
+
+
+class CompiledTrajectory:
+    """
+    A Trajectory encoded for one hand: a ready-made goal frame per sample.
+
+    Built by AmazingHand.compile_trajectory() and sent one sample at a time
+    with AmazingHand.send_trajectory_sample().
+    """
+
+    def __init__(self, positions, speeds, payloads, rate_hz):
+        self.positions = positions
+        self.speeds = speeds
+        self.payloads = payloads
+        self.rate_hz = rate_hz
+
+    def __len__(self):
+        return len(self.positions)
+
+    def frame(self, k):
+        """Goal block payloads of sample k, one per motor."""
+        return self.payloads[k * NUM_MOTORS:(k + 1) * NUM_MOTORS]
+
+    def sample_at(self, t):
+        """Index of the sample due at time t (seconds since the start), clamped to the last one."""
+        return min(int(round(t * self.rate_hz)), len(self) - 1)
+
+
+def _knots(poses, durations):
+    poses = np.asarray(poses, dtype=float)
+    durations = np.asarray(durations, dtype=float).reshape(-1)
+    if poses.ndim != 2 or poses.shape[1] != NUM_MOTORS or len(poses) < 2:
+        raise ValueError(f"Expected at least 2 poses of {NUM_MOTORS} joints, got shape {poses.shape}")
+    if len(durations) != len(poses) - 1:
+        raise ValueError("Expected one duration per transition (len(poses) - 1)")
+    if np.any(durations <= 0):
+        raise ValueError("Durations must be positive")
+    return poses, np.concatenate(([0.0], np.cumsum(durations)))
+
+
+def _sample_times(knots, rate_hz):
+    n = int(np.floor(knots[-1] * rate_hz + 1e-9)) + 1
+    times = np.arange(n) / rate_hz
+    if times[-1] < knots[-1]:
+        # Always end exactly on the last pose.
+        times = np.append(times, knots[-1])
+    return times
+
+
+def minimum_jerk(poses, durations, rate_hz=100):
+    """
+    Plans minimum-jerk transitions through a list of poses, stopping at each one.
+
+    :param poses: (k + 1, 8) array of poses in degrees.
+    :param durations: k transition durations in seconds.
+    :param rate_hz: Sample rate of the returned trajectory.
+    :return: A Trajectory.
+    """
+    poses, knots = _knots(poses, durations)
+    times = _sample_times(knots, rate_hz)
+    seg = np.clip(np.searchsorted(knots, times, side="right") - 1, 0, len(knots) - 2)
+    dur = (knots[seg + 1] - knots[seg])[:, None]
+    tau = ((times - knots[seg])[:, None] / dur)
+    delta = poses[seg + 1] - poses[seg]
+    s = tau ** 3 * (10 - 15 * tau + 6 * tau ** 2)
+    ds = 30 * tau ** 2 * (1 - tau) ** 2 / dur
+    return Trajectory(times, poses[seg] + delta * s, delta * ds, rate_hz)
+
+
+def cubic_spline(poses, durations, rate_hz=100):
+    """
+    Plans a C2 cubic spline through a list of poses, at rest at both ends.
+
+    Unlike minimum_jerk(), the hand does not stop at intermediate poses.
+
+    :param poses: (k + 1, 8) array of poses in degrees.
+    :param durations: k segment durations in seconds.
+    :param rate_hz: Sample rate of the returned trajectory.
+    :return: A Trajectory.
+    """
+    poses, knots = _knots(poses, durations)
+    h = np.diff(knots)
+    n = len(poses)
+    slopes = np.diff(poses, axis=0) / h[:, None]
+
+    # Clamped spline (zero end velocity): solve for the second derivatives of
+    # all joints at once.
+    a = np.zeros((n, n))
+    rhs = np.zeros((n, NUM_MOTORS))
+    a[0, 0], a[0, 1] = 2 * h[0], h[0]
+    rhs[0] = 6 * slopes[0]
+    a[-1, -2], a[-1, -1] = h[-1], 2 * h[-1]
+    rhs[-1] = -6 * slopes[-1]
+    for i in range(1, n - 1):
+        a[i, i - 1], a[i, i], a[i, i + 1] = h[i - 1], 2 * (h[i - 1] + h[i]), h[i]
+        rhs[i] = 6 * (slopes[i] - slopes[i - 1])
+    m = np.linalg.solve(a, rhs)
+
+    times = _sample_times(knots, rate_hz)
+    seg = np.clip(np.searchsorted(knots, times, side="right") - 1, 0, n - 2)
+    hs = h[seg][:, None]
+    u = (times - knots[seg])[:, None]
+    v = hs - u
+    m0, m1 = m[seg], m[seg + 1]
+    p0, p1 = poses[seg], poses[seg + 1]
+    positions = (m0 * v ** 3 + m1 * u ** 3) / (6 * hs) + (p0 / hs - m0 * hs / 6) * v + (p1 / hs - m1 * hs / 6) * u
+    velocities = (-m0 * v ** 2 + m1 * u ** 2) / (2 * hs) - (p0 / hs - m0 * hs / 6) + (p1 / hs - m1 * hs / 6)
+    return Trajectory(times, positions, velocities, rate_hz)
+
+
+def plan(poses, durations, rate_hz=100, method="min_jerk"):
+    """
+    Plans a trajectory through `poses` with the given interpolation method.
+
+    :param method: "min_jerk" (stops at every pose) or "cubic" (smooth spline through them).
+    """
+    if method == "min_jerk":
+        return minimum_jerk(poses, durations, rate_hz)
+    if method == "cubic":
+        return cubic_spline(poses, durations, rate_hz)
+    raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
@@ -7,22 +7,22 @@ PORT = "/dev/tty.usbmodem5A7A0585381"
 
 def create_thumbs_up(hand):
     """
-    Creates a custom 'Thumbs Up' gesture by controlling individual fingers.
+    Registers a custom 'Thumbs Up' gesture on the hand.
     This function is an example of how to build your own gestures.
+
+    A gesture is just data: 8 servo angles (index, middle, ring, thumb; two
+    servos per finger) and their speeds. It is compiled once, together with the
+    calibration, and the left-hand version is mirrored automatically.
     """
-    print("Creating a custom 'Thumbs Up' gesture...")
-    
-    # 1. Curl the index, middle, and ring fingers into a fist
-    hand.index(90, -90, hand.CLOSE_SPEED)
-    time.sleep(0.1) # Small delay between finger movements
-    hand.middle(90, -90, hand.CLOSE_SPEED)
-    time.sleep(0.1)
-    hand.ring(90, -90, hand.CLOSE_SPEED)
-    time.sleep(0.1)
-    
-    # 2. Position the thumb upwards.
-    #    The exact angles might need tuning for your specific hand calibration.
-    hand.thumb(0, -75, hand.MAX_SPEED)
+    print("Registering a custom 'Thumbs Up' gesture...")
+    hand.register_gesture(
+        "thumbs_up",
+        # 1. Curl the index, middle, and ring fingers into a fist
+        # 2. Position the thumb upwards.
+        #    The exact angles might need tuning for your specific hand calibration.
+        [90, -90, 90, -90, 90, -90, 0, -75],
+        [hand.CLOSE_SPEED] * 6 + [hand.MAX_SPEED] * 2,
+    )
 
 def main():
     try:
@@ -33,11 +33,12 @@ def main():
         # Start from an open hand position
         print("1. Opening hand to start.")
         hand.open()
-        time.sleep(2)
+        hand.wait_settled()
 
         # Execute the custom gesture
         print("2. Executing custom gesture.")
         create_thumbs_up(hand)
+        hand.gesture("thumbs_up")
         time.sleep(3) # Hold the gesture
 
         # Return to open position
@@ -18,14 +18,14 @@ def main():
 
         print("--- Test 1: Reading status in a static 'open' position ---")
         hand.open()
-        time.sleep(2) # Wait for the hand to settle
+        hand.wait_settled() # Wait for the hand to settle
         static_status = hand.get_all_motors_status()
         print_status(static_status)
         time.sleep(2)
 
         print("\n--- Test 2: Reading status immediately after a 'close' action ---")
         hand.close()
-        time.sleep(2) # Wait for the hand to close
+        hand.wait_settled() # Wait for the hand to close
         closed_status = hand.get_all_motors_status()
         print_status(closed_status)
         print("Note the 'load' values, they should be higher now.")
@@ -51,19 +51,19 @@ def main():
         print("\n--- Test 4: Testing additional gestures ---")
         print("Testing point gesture...")
         hand.point()
-        time.sleep(2)
+        hand.wait_settled()
         
         print("Testing victory gesture...")
         hand.victory()
-        time.sleep(2)
+        hand.wait_settled()
         
         print("Testing ok gesture...")
         hand.ok()
-        time.sleep(2)
+        hand.wait_settled()
         
         print("Testing pinch gesture...")
         hand.pinch()
-        time.sleep(2)
+        hand.wait_settled()
         
         print("Returning to open position...")
         hand.open()
@@ -19,36 +19,42 @@ def main():
         hand.start()
         time.sleep(1) # Wait a moment for the hand to be ready
 
-        # 3. Perform a sequence of gestures
+        # 3. Perform a sequence of gestures. wait_settled() returns as soon as
+        # every finger has arrived (or is blocked by an object), instead of
+        # sleeping for a worst-case delay.
         print("Performing gesture sequence...")
 
         print("Opening hand...")
         hand.open()
-        time.sleep(2)
+        hand.wait_settled()
 
         print("Closing hand...")
         hand.close()
-        time.sleep(2)
+        hand.wait_settled()
 
         print("Pointing...")
         hand.point()
-        time.sleep(2)
+        hand.wait_settled()
 
         print("Victory sign...")
         hand.victory()
-        time.sleep(2)
+        hand.wait_settled()
 
         print("OK sign...")
         hand.ok()
-        time.sleep(2)
+        hand.wait_settled()
 
         print("Pinching...")
         hand.pinch()
-        time.sleep(2)
+        hand.wait_settled()
         
         # Return to open position
-        hand.open()
-        time.sleep(1)
+        result = hand.move_and_wait("open", tol_deg=2.0, timeout=3.0)
+        if not result["settled"]:
+            for joint in result["joints"]:
+                if joint["status"] != "settled":
+                    print(f"Motor {joint['id']}: {joint['status']} at {joint['position']:.1f} deg "
+                          f"(target {joint['target']:.1f} deg)")
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -8,6 +8,9 @@ PORT = "/dev/tty.usbmodem5A7A0585381"
 def monitor_motors(hand, duration=10):
     """
     Monitor all motor status for a specified duration.
+
+    Telemetry is sampled in a background thread, so this loop only reads the
+    latest sample from the ring buffer and never waits on the serial bus.
     
     :param hand: AmazingHand instance
     :param duration: Monitoring duration in seconds
@@ -16,26 +19,32 @@ def monitor_motors(hand, duration=10):
     print("Format: Motor_ID | Position | Speed | Load | Voltage | Temperature")
     print("-" * 70)
     
-    start_time = time.time()
-    while time.time() - start_time < duration:
-        status_list = hand.get_all_motors_status()
-        
-        # Print current timestamp
-        elapsed = time.time() - start_time
-        print(f"\nTime: {elapsed:.1f}s")
-        
-        for status in status_list:
-            if 'error' not in status:
-                print(f"Motor {status['id']:1d} | "
-                      f"{status['position']:7.2f}° | "
-                      f"{status['speed']:5.1f} | "
-                      f"{status['load']:6.1f} | "
-                      f"{status['voltage']:4.1f}V | "
-                      f"{status['temperature']:3.1f}°C")
-            else:
-                print(f"Motor {status['id']:1d} | ERROR: {status['error']}")
-        
-        time.sleep(1)  # Update every second
+    sampler = hand.start_telemetry(rate_hz=20, history=200)
+    try:
+        start_time = time.time()
+        while time.time() - start_time < duration:
+            time.sleep(1)  # Update every second
+            sample = sampler.latest()
+            if sample is None:
+                continue
+            _, values = sample
+
+            # Print current timestamp
+            elapsed = time.time() - start_time
+            print(f"\nTime: {elapsed:.1f}s")
+
+            for motor_id, (position, speed, load, voltage, temperature, ok) in enumerate(values, start=1):
+                if ok:
+                    print(f"Motor {motor_id:1d} | "
+                          f"{position:7.2f}° | "
+                          f"{speed:5.1f} | "
+                          f"{load:6.1f} | "
+                          f"{voltage:4.1f}V | "
+                          f"{temperature:3.1f}°C")
+                else:
+                    print(f"Motor {motor_id:1d} | ERROR: read failed")
+    finally:
+        hand.stop_telemetry()
 
 def main():
     try:
@@ -48,7 +57,7 @@ def main():
         # Test 1: Monitor in open position
         print("Test 1: Monitoring in open position")
         hand.open()
-        time.sleep(2)
+        hand.wait_settled()
         monitor_motors(hand, duration=5)
         
         # Test 2: Monitor during gesture changes
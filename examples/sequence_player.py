@@ -0,0 +1,31 @@
+import os
+import amazingctrl
+
+# --- IMPORTANT ---
+# Replace "/dev/tty.usbmodem5A7A0585381" with the actual port of your AmazingHand.
+PORT = "/dev/tty.usbmodem5A7A0585381"
+
+# The same chain of gestures as gesture_sequence.py, written as a script.
+# It is planned in one go (and checked against the joint limits) before the
+# hand moves, then streamed at a fixed rate with each transition blending
+# into the next.
+SEQUENCE = os.path.join(os.path.dirname(__file__), "gesture_sequence.json")
+
+def main():
+    try:
+        hand = amazingctrl.AmazingHand(port=PORT)
+        hand.start()
+
+        print(f"Playing {SEQUENCE}...")
+        trajectory = hand.play_sequence(SEQUENCE, limits=(-100, 100))
+        print(f"Done: {trajectory.duration:.1f}s, {len(trajectory)} setpoints.")
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    finally:
+        if 'hand' in locals():
+            hand.stop()
+
+if __name__ == '__main__':
+    main()
@@ -16,7 +16,7 @@ def main():
         # Start from an open hand position
         print("1. Opening hand to start.")
         hand.open()
-        time.sleep(2)
+        hand.wait_settled()
 
         # Control the index finger independently
         print("2. Bending the index finger.")
@@ -24,11 +24,11 @@ def main():
         # angle_1: Controls side-to-side movement
         # angle_2: Controls forward/backward bending
         hand.index(90, -90, hand.CLOSE_SPEED)
-        time.sleep(2)
+        hand.wait_settled()
 
         print("3. Straightening the index finger.")
         hand.index(-40, 40, hand.MAX_SPEED)
-        time.sleep(2)
+        hand.wait_settled()
 
         print("4. Wagging the index finger side-to-side.")
         hand.index(-10, 80, hand.MAX_SPEED)
@@ -0,0 +1,63 @@
+"""
+Fixtures shared by the tests: an AmazingHand on a SimulatedController without
+the wire-time model, whose sync writes are recorded.
+"""
+import pytest
+
+from amazingctrl import AmazingHand
+from amazingctrl.sim import SimulatedController
+
+ZERO_CALIBRATION = [0.0] * 8
+
+
+class RecordingController(SimulatedController):
+    """
+    A SimulatedController that records every sync write as (ids, addr, payloads)
+    and can unplug servos: an unplugged servo times out on reads and ignores writes.
+    """
+
+    def __init__(self, **options):
+        options.setdefault("latency", False)
+        super().__init__(**options)
+        self.sync_writes = []
+        self.unplugged = set()
+
+    def _check_plugged(self, motor_id):
+        if motor_id in self.unplugged:
+            self.timeouts += 1
+            raise RuntimeError(f"motor {motor_id}: Operation timed out")
+
+    def read_raw_data(self, id, addr, length):
+        self._check_plugged(id)
+        return super().read_raw_data(id, addr, length)
+
+    def write_raw_data(self, id, addr, data):
+        self._check_plugged(id)
+        super().write_raw_data(id, addr, data)
+
+    def sync_write_raw_data(self, ids, addr, data):
+        ids, data = list(ids), [bytes(payload) for payload in data]
+        self.sync_writes.append((ids, addr, data))
+        plugged = [(motor_id, payload) for motor_id, payload in zip(ids, data) if motor_id not in self.unplugged]
+        super().sync_write_raw_data([motor_id for motor_id, _ in plugged], addr, [payload for _, payload in plugged])
+
+    def register_words(self, motor_id, addr):
+        """The big-endian 2-byte register at `addr` of a servo, even if it is unplugged."""
+        high, low = SimulatedController.read_raw_data(self, motor_id, addr, 2)
+        return (high << 8) | low
+
+
+@pytest.fixture
+def controller():
+    return RecordingController()
+
+
+@pytest.fixture
+def hand(controller):
+    """A started right hand with zero calibration; the start-up writes are cleared."""
+    hand = AmazingHand(port="sim", controller=controller, calibration_data=ZERO_CALIBRATION)
+    hand.start()
+    controller.sync_writes.clear()
+    hand.reset_write_stats()
+    yield hand
+    hand.stop()
@@ -0,0 +1,75 @@
+"""
+HealthMonitor: a servo that stops answering is degraded and skipped, and restored when it answers again.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from amazingctrl.health import MotorUnavailableError
+from amazingctrl.scs0009 import ADDR_GOAL_POSITION, POSITION_CENTER, STEPS_PER_RAD
+
+POSE = [30.0, -30.0, 30.0, -30.0, 30.0, -30.0, 30.0, -30.0]
+
+
+def _raw_position(deg):
+    return int(np.trunc(POSITION_CENTER + np.deg2rad(deg) * STEPS_PER_RAD))
+
+
+@pytest.fixture
+def health(hand):
+    # The probe thread is kept out of the way; the tests probe by hand.
+    health = hand.enable_health(failure_threshold=2, retries=0, probe_interval=60)
+    yield health
+    hand.disable_health()
+
+
+def test_a_failing_servo_is_degraded_and_skipped(hand, controller, health):
+    controller.unplugged.add(3)
+    telemetry = hand.read_telemetry()
+    assert not telemetry["ok"][2] and telemetry["ok"][[0, 1, 3, 4, 5, 6, 7]].all()
+    assert not health.is_degraded(3)
+    hand.read_telemetry()
+    assert health.is_degraded(3)
+    assert health.degraded_ids() == [3]
+    assert health.status()[3]["state"] == "degraded"
+
+    # Degraded: reads fail without touching the bus, goal writes leave it out.
+    timeouts = controller.timeouts
+    with pytest.raises(MotorUnavailableError):
+        hand._call_motor(3, "read_raw_data", ADDR_GOAL_POSITION, 2)
+    assert controller.timeouts == timeouts
+    hand.set_pose(POSE)
+    assert controller.sync_writes[-1][0] == [1, 2, 4, 5, 6, 7, 8]
+    assert health.status()[3]["skipped"] == 1
+
+
+def test_a_recovered_servo_gets_its_goal_back(hand, controller, health):
+    controller.unplugged.add(3)
+    hand.read_telemetry()
+    hand.read_telemetry()
+    hand.set_pose(POSE)
+    assert health.probe_degraded() == []
+
+    controller.unplugged.clear()
+    assert health.probe_degraded() == [3]
+    assert health.degraded_ids() == []
+    assert controller.sync_writes[-1][0] == [3]
+    assert controller.register_words(3, ADDR_GOAL_POSITION) == _raw_position(POSE[2])
+    assert hand.read_telemetry()["ok"].all()
+
+
+def test_the_probe_thread_restores_servos(hand, controller):
+    health = hand.enable_health(failure_threshold=1, retries=0, probe_interval=0.01)
+    try:
+        controller.unplugged.add(5)
+        hand.read_telemetry()
+        assert health.degraded_ids() == [5]
+        controller.unplugged.clear()
+        deadline = time.monotonic() + 2.0
+        while health.degraded_ids() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert health.degraded_ids() == []
+    finally:
+        hand.disable_health()
+    assert controller.sync_writes[-1][0] == [5]
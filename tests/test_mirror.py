@@ -0,0 +1,64 @@
+"""
+Left/right mirroring of gestures, joints and the compiled gesture table.
+"""
+import numpy as np
+
+from amazingctrl import AmazingHand
+from amazingctrl.gestures import GESTURES, LEFT_HAND, RIGHT_HAND, mirror
+from amazingctrl.kinematics import joint_to_servo, servo_to_joint
+from amazingctrl.scs0009 import ADDR_GOAL_POSITION, MOTOR_IDS, POSITION_CENTER, STEPS_PER_RAD
+
+from conftest import ZERO_CALIBRATION, RecordingController
+
+
+def _left_hand(controller=None):
+    return AmazingHand(port="sim", side=LEFT_HAND, controller=controller or RecordingController(),
+                       calibration_data=ZERO_CALIBRATION)
+
+
+def test_mirror_swaps_and_negates_each_finger():
+    np.testing.assert_array_equal(mirror([1, 2, 3, 4, 5, 6, 7, 8]), [-2, -1, -4, -3, -6, -5, -8, -7])
+    poses = np.arange(16.0).reshape(2, 8)
+    np.testing.assert_array_equal(mirror(mirror(poses)), poses)
+    assert not np.signbit(mirror(np.zeros(8))).any()
+
+
+def test_left_gestures_are_mirrored():
+    hand = _left_hand()
+    for name in ("point", "victory", "ok"):
+        np.testing.assert_array_equal(hand.gestures[name].positions, mirror(GESTURES[name].positions))
+        hand.gesture(name)
+        np.testing.assert_array_equal(hand.get_goal_pose()[0], mirror(GESTURES[name].positions))
+
+
+def test_explicit_left_positions_win_over_mirroring():
+    hand = _left_hand()
+    np.testing.assert_array_equal(hand.gestures["pinch"].positions, GESTURES["pinch"].left_positions)
+    hand.register_gesture("thumbs_up", [90, -90, 90, -90, 90, -90, 0, 0], left_positions=[1] * 8)
+    np.testing.assert_array_equal(hand.gestures["thumbs_up"].positions, 1)
+
+
+def test_side_and_calibration_changes_recompile_the_table():
+    controller = RecordingController()
+    hand = AmazingHand(port="sim", side=RIGHT_HAND, controller=controller, calibration_data=ZERO_CALIBRATION)
+    right = hand.gestures["ok"].positions.copy()
+    hand.side = LEFT_HAND
+    np.testing.assert_array_equal(hand.gestures["ok"].positions, mirror(right))
+
+    hand.calibration_data = [5.0] * 8
+    hand.gesture("ok")
+    expected = np.trunc(POSITION_CENTER + np.deg2rad(5.0 + mirror(right)) * STEPS_PER_RAD)
+    written = [controller.register_words(motor_id, ADDR_GOAL_POSITION) for motor_id in MOTOR_IDS]
+    np.testing.assert_array_equal(written, expected)
+
+
+def test_joints_are_mirrored_on_a_left_hand():
+    joints = np.array([[30.0, 10.0], [60.0, -5.0], [0.0, 0.0], [45.0, 20.0]])
+    right = joint_to_servo(joints, RIGHT_HAND)
+    left = joint_to_servo(joints, LEFT_HAND)
+    np.testing.assert_array_equal(left, mirror(right))
+    np.testing.assert_allclose(servo_to_joint(left, LEFT_HAND), joints)
+
+    hand = _left_hand()
+    hand.set_joints(joints)
+    np.testing.assert_array_equal(hand.get_goal_pose()[0], left)
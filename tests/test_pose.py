@@ -0,0 +1,145 @@
+"""
+Goal writes: one sync-write frame per pose, the bytes on the wire, batch()
+coalescing and rollback, and the shadow-register deadband.
+"""
+import numpy as np
+import pytest
+
+from amazingctrl import AmazingHand
+from amazingctrl.scs0009 import (
+    ADDR_GOAL_POSITION,
+    ADDR_GOAL_SPEED,
+    GOAL_BLOCK_ADDR,
+    MOTOR_IDS,
+    POSITION_CENTER,
+    STEPS_PER_RAD,
+)
+
+from conftest import RecordingController
+
+POSE = [10.0, -10.0, 20.0, -20.0, 30.0, -30.0, 40.0, -40.0]
+
+
+def _raw_position(deg):
+    return int(np.trunc(POSITION_CENTER + np.deg2rad(deg) * STEPS_PER_RAD))
+
+
+def _raw_speed(rad_s):
+    return int(np.trunc(rad_s * STEPS_PER_RAD))
+
+
+# --- Single-frame pose writes ---
+
+def test_set_pose_is_one_goal_block_frame(hand, controller):
+    hand.set_pose(POSE, speeds=3)
+    assert len(controller.sync_writes) == 1
+    ids, addr, payloads = controller.sync_writes[0]
+    assert ids == list(MOTOR_IDS)
+    assert addr == GOAL_BLOCK_ADDR
+    for angle, payload in zip(POSE, payloads):
+        position, speed = _raw_position(angle), _raw_speed(3)
+        # goal_position, goal_time (0), goal_speed; big endian.
+        assert payload == bytes([position >> 8, position & 0xFF, 0, 0, speed >> 8, speed & 0xFF])
+
+
+def test_set_pose_applies_the_calibration():
+    controller = RecordingController()
+    calibration = [3, 0, -5, -8, -2, 5, -12, 0]
+    hand = AmazingHand(port="sim", controller=controller, calibration_data=calibration)
+    hand.set_pose([0.0] * 8)
+    for motor_id, offset in zip(MOTOR_IDS, calibration):
+        assert controller.register_words(motor_id, ADDR_GOAL_POSITION) == _raw_position(offset)
+
+
+def test_gestures_and_fingers_are_one_frame_each(hand, controller):
+    hand.close()
+    hand.index(0, 0, 3)
+    assert [ids for ids, _, _ in controller.sync_writes] == [list(MOTOR_IDS), [1, 2]]
+    np.testing.assert_array_equal(hand.get_goal_pose()[0], [0, 0, 90, -90, 90, -90, 90, -90])
+
+
+@pytest.mark.parametrize("positions, speeds", [
+    ([np.nan] + POSE[1:], 3),
+    (POSE, np.inf),
+    ([np.inf] + POSE[1:], None),
+])
+def test_non_finite_goals_are_rejected(hand, controller, positions, speeds):
+    with pytest.raises(ValueError):
+        hand.set_pose(positions, speeds)
+    with pytest.raises(ValueError):
+        hand.set_targets([1], [positions[0]], speeds)
+    assert controller.sync_writes == []
+    np.testing.assert_array_equal(hand.get_goal_pose()[0], 0.0)
+
+
+# --- batch() ---
+
+def test_batch_sends_one_frame_when_it_closes(hand, controller):
+    with hand.batch():
+        hand.index(90, -90, 3)
+        hand.thumb(0, -75, 7)
+        hand.index(80, -80, 3)
+        assert controller.sync_writes == []
+    assert len(controller.sync_writes) == 1
+    assert controller.sync_writes[0][0] == [1, 2, 7, 8]
+    np.testing.assert_array_equal(hand.get_goal_pose()[0], [80, -80, 0, 0, 0, 0, 0, -75])
+
+
+def test_batch_rolls_back_when_it_raises(hand, controller):
+    hand.set_pose(POSE, speeds=3)
+    controller.sync_writes.clear()
+    with pytest.raises(RuntimeError):
+        with hand.batch():
+            hand.set_pose([0.0] * 8, speeds=5)
+            hand.open()
+            raise RuntimeError("abort")
+    assert controller.sync_writes == []
+    positions, speeds = hand.get_goal_pose()
+    np.testing.assert_array_equal(positions, POSE)
+    np.testing.assert_array_equal(speeds, 3)
+    # Nothing left dirty: the next flush has nothing to send.
+    hand.flush()
+    assert controller.sync_writes == []
+
+
+# --- Shadow registers ---
+
+def test_unchanged_goals_are_not_resent(hand, controller):
+    hand.set_pose(POSE, speeds=3)
+    hand.set_pose(POSE, speeds=3)
+    assert len(controller.sync_writes) == 1
+    stats = hand.write_stats()
+    assert stats["goal_position"] == {"sent": 8, "suppressed": 8}
+    assert stats["frames_suppressed"] == 1
+
+
+def test_only_the_changed_register_is_sent(hand, controller):
+    hand.set_pose(POSE, speeds=3)
+    hand.set_pose(POSE, speeds=5)
+    hand.index(0, 0, 5)
+    (_, addr_speed, speeds), (ids, addr_position, positions) = controller.sync_writes[1:]
+    assert addr_speed == ADDR_GOAL_SPEED and len(speeds) == 8
+    assert ids == [1, 2] and addr_position == ADDR_GOAL_POSITION
+    assert positions == [bytes([POSITION_CENTER >> 8, POSITION_CENTER & 0xFF])] * 2
+
+
+def test_position_deadband(hand, controller):
+    hand.position_deadband = 1.0
+    hand.set_pose(POSE)
+    hand.set_pose(np.add(POSE, 0.5))
+    assert len(controller.sync_writes) == 1
+    hand.set_pose(np.add(POSE, 2.0))
+    assert len(controller.sync_writes) == 2
+
+
+def test_resync_and_stop_invalidate_the_shadow(hand, controller):
+    hand.set_pose(POSE)
+    hand.resync()
+    assert len(controller.sync_writes) == 2
+    assert controller.sync_writes[1][0] == list(MOTOR_IDS)
+
+    hand.stop(close=False)
+    hand.start()
+    controller.sync_writes.clear()
+    hand.set_pose(POSE)
+    assert len(controller.sync_writes) == 1
@@ -0,0 +1,58 @@
+"""
+Round trips through ProcessAmazingHand, with the child driving a SimulatedController.
+"""
+import numpy as np
+import pytest
+
+from amazingctrl import ProcessAmazingHand
+from amazingctrl.scs0009 import MOTOR_IDS
+from amazingctrl.sim import SimulatedController
+
+
+@pytest.fixture(scope="module")
+def hand():
+    hand = ProcessAmazingHand("sim", controller_factory=SimulatedController)
+    hand.start()
+    yield hand
+    hand.shutdown()
+
+
+def test_get_forwards_child_attributes(hand):
+    assert hand.present_ids == tuple(MOTOR_IDS)
+    assert hand.port == "sim"
+
+
+def test_get_unknown_attribute_raises_attribute_error(hand):
+    with pytest.raises(AttributeError):
+        hand.no_such_attribute
+    assert not hasattr(hand, "no_such_attribute")
+
+
+def test_set_assigns_in_the_child(hand):
+    previous = hand.position_deadband
+    try:
+        hand.position_deadband = 1.5
+        assert "position_deadband" not in vars(hand)
+        assert hand.position_deadband == 1.5
+    finally:
+        hand.position_deadband = previous
+
+
+def test_call_forwards_methods_and_results(hand):
+    stats = hand.write_stats()
+    assert "goal_position" in stats
+    assert hand.probe.__name__ == "probe"
+
+
+def test_call_raises_child_errors(hand):
+    with pytest.raises(KeyError):
+        hand.call("gesture", "no-such-gesture")
+
+
+def test_goals_round_trip(hand):
+    pose = np.array([10.0, -10.0, 20.0, -20.0, 30.0, -30.0, 5.0, -5.0])
+    hand.set_pose(pose)
+    assert hand.wait_sent()
+    positions, _ = hand.call("get_goal_pose")
+    np.testing.assert_allclose(positions, pose)
+    np.testing.assert_allclose(hand.get_goal_pose()[0], pose)
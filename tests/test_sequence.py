@@ -0,0 +1,111 @@
+"""
+Sequence scripts: expansion of repeats and defaults, blending, mirroring and validation.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from amazingctrl import AmazingHand
+from amazingctrl.gestures import GESTURES, LEFT_HAND, mirror
+from amazingctrl.sequence import _expand, plan_sequence
+
+from conftest import ZERO_CALIBRATION, RecordingController
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, "examples", "gesture_sequence.json")
+A = [0.0] * 8
+B = [40.0, -40.0] * 4
+C = [80.0, -80.0] * 4
+
+
+def _gestures(side=1):
+    hand = AmazingHand(port="sim", side=side, controller=RecordingController(), calibration_data=ZERO_CALIBRATION)
+    return hand.gestures
+
+
+def test_repeats_expand_with_labels_and_defaults():
+    steps = _expand([
+        {"pose": A},
+        {"repeat": 2, "duration": 0.5, "steps": [{"pose": B}, {"pose": C, "hold": 0.1}]},
+    ], {"duration": 1.0, "hold": 0.0, "blend": 0.0})
+    assert [label for label, _ in steps] == ["0", "1.0.0", "1.0.1", "1.1.0", "1.1.1"]
+    assert [step["duration"] for _, step in steps] == [1.0, 0.5, 0.5, 0.5, 0.5]
+    assert [step["hold"] for _, step in steps] == [0.0, 0.0, 0.1, 0.0, 0.1]
+
+
+def test_steps_are_timed_back_to_back_without_blend():
+    trajectory = plan_sequence({"rate_hz": 100, "steps": [
+        {"pose": A}, {"pose": B, "duration": 0.5, "hold": 0.2}, {"pose": C, "duration": 0.3},
+    ]})
+    # The first step starts on its own pose, so it only takes its duration.
+    assert trajectory.duration == pytest.approx(1.0 + 0.5 + 0.2 + 0.3)
+    k = np.searchsorted(trajectory.times, 1.6)
+    np.testing.assert_allclose(trajectory.positions[k], B)
+    np.testing.assert_allclose(trajectory.positions[-1], C)
+    np.testing.assert_allclose(trajectory.velocities[-1], 0.0, atol=1e-9)
+
+
+def test_blend_overlaps_transitions_and_still_ends_on_each_pose():
+    script = {"rate_hz": 1000, "defaults": {"duration": 0.5}, "steps": [{"pose": A}, {"pose": B}, {"pose": C}]}
+    plain = plan_sequence(script, start=A)
+    blended = plan_sequence(dict(script, defaults={"duration": 0.5, "blend": 0.2}), start=A)
+    assert blended.duration == pytest.approx(plain.duration - 2 * 0.2)
+    np.testing.assert_allclose(blended.positions[-1], C)
+    # No stop at B: the hand keeps moving through the overlap.
+    k = np.searchsorted(blended.times, 0.9)
+    assert np.abs(blended.velocities[k]).min() > 1.0
+    # Superposed minimum-jerk transitions stay smooth.
+    numeric = np.gradient(blended.positions, blended.times, axis=0)
+    np.testing.assert_allclose(blended.velocities[1:-1], numeric[1:-1], atol=0.5)
+
+
+def test_gestures_fingers_and_start():
+    trajectory = plan_sequence({"start": "open", "steps": [
+        {"pose": "close", "fingers": {"thumb": [0, -75]}, "duration": 0.2},
+    ]}, gestures=_gestures())
+    np.testing.assert_allclose(trajectory.positions[0], GESTURES["open"].positions)
+    np.testing.assert_allclose(trajectory.positions[-1], [90, -90, 90, -90, 90, -90, 0, -75])
+
+
+def test_literal_angles_are_mirrored_on_a_left_hand():
+    script = {"steps": [{"pose": [10, 20, 30, 40, 50, 60, 70, 80]}, {"pose": "ok", "fingers": {"index": [5, 15]}}]}
+    trajectory = plan_sequence(script, gestures=_gestures(LEFT_HAND), side=LEFT_HAND)
+    np.testing.assert_allclose(trajectory.positions[0], mirror([10, 20, 30, 40, 50, 60, 70, 80]))
+    expected = mirror(GESTURES["ok"].positions)
+    expected[:2] = [-15, -5]
+    np.testing.assert_allclose(trajectory.positions[-1], expected)
+
+
+def test_example_script_plans_for_both_sides():
+    for side in (1, LEFT_HAND):
+        trajectory = plan_sequence(EXAMPLE, gestures=_gestures(side), side=side)
+        np.testing.assert_allclose(trajectory.positions[-1], GESTURES["open"].pose(side))
+
+
+def test_hold_time_scales_the_holds():
+    script = {"steps": [{"pose": A, "duration": 0.5, "hold": 1.0}, {"pose": B, "duration": 0.5, "hold": 1.0}]}
+    trajectory = plan_sequence(script, hold_time=lambda seconds: seconds / 2)
+    assert trajectory.duration == pytest.approx(0.5 + 0.5 + 0.5 + 0.5)
+
+
+@pytest.mark.parametrize("script, message", [
+    ({"steps": []}, "no steps"),
+    ({"steps": [{"duration": 1.0}]}, "expected 'pose'"),
+    ({"steps": [{"repeat": 2}]}, "'repeat' needs 'steps'"),
+    ({"steps": [{"repeat": -1, "steps": []}]}, "must not be negative"),
+    ({"steps": [{"pose": [0] * 7}]}, "expected 8 angles"),
+    ({"steps": [{"pose": "wave"}]}, "unknown gesture"),
+    ({"steps": [{"pose": A, "fingers": {"pinky": [0, 0]}}]}, "unknown finger"),
+    ({"steps": [{"pose": A, "duration": 0}]}, "duration must be positive"),
+    ({"steps": [{"pose": A}, {"pose": C}], "limits": {"lower": -60, "upper": 60}}, "outside"),
+])
+def test_invalid_scripts_are_rejected(script, message):
+    with pytest.raises(ValueError, match=message):
+        plan_sequence(script, gestures=_gestures())
+
+
+def test_play_sequence_streams_to_the_hand(hand, controller):
+    trajectory = hand.play_sequence({"rate_hz": 100, "steps": [{"pose": B, "duration": 0.1}]})
+    np.testing.assert_allclose(trajectory.positions[0], A)
+    np.testing.assert_allclose(hand.get_goal_pose()[0], B)
+    assert controller.sync_writes
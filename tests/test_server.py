@@ -0,0 +1,134 @@
+"""
+Protocol round trips between HandClient and a HandServer on localhost,
+serving an AmazingHand on a SimulatedController.
+"""
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from amazingctrl import AmazingHand
+from amazingctrl.client import HandClient
+from amazingctrl.server import ACK_ERROR, HandServer
+from amazingctrl.sim import SimulatedController
+from amazingctrl.sockets import remove_stale_socket
+
+TELEMETRY_RATE_HZ = 50
+
+
+@pytest.fixture
+def server():
+    hand = AmazingHand(port="sim", controller=SimulatedController())
+    server = HandServer(hand, tcp=("127.0.0.1", 0), telemetry_rate_hz=TELEMETRY_RATE_HZ, claim_timeout=5.0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _client_stats(server, owner):
+    return [client for client in server.stats()["clients"] if client["owner"] == owner]
+
+
+def test_lower_priority_is_rejected_while_controlled(server):
+    with HandClient(server.tcp_address) as high, HandClient(server.tcp_address) as low:
+        assert high.set_pose([10, -10] * 4, priority=5)
+        assert not low.set_pose([20, -20] * 4, priority=1)
+        assert not low.gesture("open", priority=1)
+        assert server.hand.get_goal_pose()[0].tolist() == [10, -10] * 4
+        (owner,) = _client_stats(server, owner=True)
+        (other,) = _client_stats(server, owner=False)
+        assert owner["accepted"] == 1 and other["rejected"] == 2
+
+        # Equal priority takes over, and a release hands control back to anyone.
+        assert low.set_pose([20, -20] * 4, priority=5)
+        assert not high.set_pose([30, -30] * 4, priority=0)
+        low.release()
+        assert high.set_pose([30, -30] * 4, priority=0)
+        assert server.hand.get_goal_pose()[0].tolist() == [30, -30] * 4
+
+
+def test_subscription_is_decimated(server):
+    sequences = []
+    done = threading.Event()
+
+    def callback(timestamp, telemetry):
+        sequences.append(client.latest()[1])
+        if len(sequences) >= 4:
+            done.set()
+
+    with HandClient(server.tcp_address) as client:
+        assert client.subscribe(TELEMETRY_RATE_HZ / 5, callback=callback) == TELEMETRY_RATE_HZ / 5
+        assert [c["decimation"] for c in server.stats()["clients"]] == [5]
+        assert done.wait(5.0)
+        client.subscribe(0)
+    gaps = {b - a for a, b in zip(sequences, sequences[1:4])}
+    assert gaps == {5}
+
+
+def test_unknown_gesture_is_acknowledged_with_an_error(server):
+    with HandClient(server.tcp_address) as client:
+        with pytest.raises(RuntimeError, match="Unknown gesture"):
+            client.gesture("no-such-gesture")
+        assert client._request(99) == (ACK_ERROR, "Unknown message type 99")
+        # The connection is still usable after the errors.
+        assert client.gesture("open")
+
+
+def test_failing_callback_does_not_stall_commands(server, capsys):
+    def callback(timestamp, telemetry):
+        raise ValueError("broken callback")
+
+    with HandClient(server.tcp_address) as client:
+        client.subscribe(TELEMETRY_RATE_HZ, callback=callback)
+        deadline = time.monotonic() + 5.0
+        while client.callback_errors < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.callback_errors >= 3
+        assert client.set_pose([0, 0] * 4)
+    assert capsys.readouterr().out.count("broken callback") == 1
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_remove_stale_socket(tmp_path):
+    path = str(tmp_path / "hand.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    with pytest.raises(FileExistsError):
+        remove_stale_socket(path)
+    listener.close()
+    remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+    regular = tmp_path / "not-a-socket"
+    regular.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        remove_stale_socket(str(regular))
+    assert regular.read_text() == "keep me"
+
+
+def test_commands_do_not_hold_up_telemetry_fan_out(server):
+    writing, release = threading.Event(), threading.Event()
+    set_pose = server.hand.set_pose
+
+    def slow_set_pose(*args):
+        writing.set()
+        release.wait(5.0)
+        set_pose(*args)
+
+    server.hand.set_pose = slow_set_pose
+    with HandClient(server.tcp_address) as client:
+        command = threading.Thread(target=client.set_pose, args=([0, 0] * 4,))
+        command.start()
+        assert writing.wait(5.0)
+        # Sweeps keep being fanned out while the command is on the bus.
+        sweeps = server._sequence
+        deadline = time.monotonic() + 1.0
+        while server._sequence < sweeps + 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        fanned_out = server._sequence - sweeps
+        release.set()
+        command.join()
+    assert fanned_out >= 3
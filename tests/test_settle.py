@@ -0,0 +1,45 @@
+"""
+wait_settled(): arrival, stalls against an obstacle, timeouts and failed reads.
+"""
+import numpy as np
+
+POSE = [45.0, -45.0, 45.0, -45.0, 45.0, -45.0, 45.0, -45.0]
+
+
+def test_move_and_wait_settles(hand):
+    result = hand.move_and_wait(POSE, tol_deg=2.0, timeout=3.0)
+    assert result["settled"] and not result["timed_out"]
+    assert result["stalled"] == []
+    assert {joint["status"] for joint in result["joints"]} == {"settled"}
+    np.testing.assert_allclose([joint["position"] for joint in result["joints"]], POSE, atol=2.0)
+
+
+def test_a_blocked_finger_stalls_and_ends_the_wait_early(hand, controller):
+    controller.set_obstacle(1, 20.0)
+    result = hand.move_and_wait(POSE, timeout=3.0, stall_time=0.05)
+    assert result["stalled"] == [1]
+    assert not result["settled"] and not result["timed_out"]
+    assert result["elapsed"] < 1.0
+    joints = {joint["id"]: joint for joint in result["joints"]}
+    assert joints[1]["status"] == "stalled"
+    assert joints[1]["error"] < -20.0
+    assert joints[1]["load"] >= 300
+    assert {joints[motor_id]["status"] for motor_id in range(2, 9)} == {"settled"}
+
+
+def test_a_wait_that_runs_out_of_time(hand):
+    hand.set_pose([90.0, -90.0] * 4, speeds=0.5)
+    result = hand.wait_settled(timeout=0.05)
+    assert result["timed_out"] and not result["settled"]
+    assert 0.05 <= result["elapsed"] < 1.0
+    assert {joint["status"] for joint in result["joints"]} == {"moving"}
+
+
+def test_an_unanswering_servo_is_reported_and_not_waited_for(hand, controller):
+    controller.unplugged.add(4)
+    result = hand.move_and_wait(POSE, timeout=3.0)
+    assert not result["settled"] and not result["timed_out"]
+    joints = {joint["id"]: joint for joint in result["joints"]}
+    assert joints[4]["status"] == "error"
+    assert np.isnan(joints[4]["position"])
+    assert all(joints[motor_id]["status"] == "settled" for motor_id in joints if motor_id != 4)
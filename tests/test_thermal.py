@@ -0,0 +1,112 @@
+"""
+ThermalLimiter: a hot finger gets slower goals, a lower torque limit and shorter holds, and recovers.
+"""
+import numpy as np
+import pytest
+
+from amazingctrl.scs0009 import (
+    ADDR_GOAL_SPEED,
+    ADDR_MAX_TORQUE_LIMIT,
+    MOTOR_IDS,
+    NUM_MOTORS,
+    STEPS_PER_RAD,
+    TELEMETRY_DTYPE,
+)
+
+POSE = [30.0, -30.0, 30.0, -30.0, 30.0, -30.0, 30.0, -30.0]
+
+
+def _telemetry(temperatures):
+    telemetry = np.zeros(NUM_MOTORS, dtype=TELEMETRY_DTYPE)
+    telemetry["id"] = MOTOR_IDS
+    telemetry["temperature"] = temperatures
+    telemetry["ok"] = True
+    return telemetry
+
+
+HOT_INDEX = _telemetry([60.0, 60.0] + [25.0] * 6)
+COLD = _telemetry([25.0] * 8)
+
+
+@pytest.fixture
+def thermal(hand):
+    thermal = hand.enable_thermal(limit=65, soft_limit=55, ambient=25)
+    yield thermal
+    hand.disable_thermal()
+
+
+def test_a_hot_finger_is_throttled(hand, controller, thermal):
+    thermal.update(0.0, HOT_INDEX)
+    status = thermal.status()
+    assert status[1]["severity"] == status[2]["severity"] > 0
+    assert status[1]["speed_scale"] == status[2]["speed_scale"] < 1.0
+    assert all(status[motor_id]["speed_scale"] == 1.0 for motor_id in range(3, 9))
+    assert [decision["id"] for decision in thermal.decisions()] == [1, 2]
+
+    limit = status[1]["torque_limit"]
+    assert limit < 1000
+    assert [controller.register_words(motor_id, ADDR_MAX_TORQUE_LIMIT) for motor_id in MOTOR_IDS] == [limit] * 2 + [1000] * 6
+
+    hand.set_pose(POSE, speeds=3)
+    speed = int(3 * STEPS_PER_RAD)
+    assert controller.register_words(1, ADDR_GOAL_SPEED) == int(speed * status[1]["speed_scale"])
+    assert controller.register_words(3, ADDR_GOAL_SPEED) == speed
+
+    assert thermal.hold_time(1.0) < 1.0
+    assert thermal.hold_time(1.0, "index") < 1.0
+    assert thermal.hold_time(1.0, "middle") == 1.0
+
+
+def test_sequence_holds_are_shortened(hand, thermal):
+    script = {"rate_hz": 100, "steps": [{"pose": POSE, "duration": 0.05, "hold": 0.2}]}
+    assert hand.play_sequence(script).duration == pytest.approx(0.25)
+    thermal.update(0.0, HOT_INDEX)
+    assert hand.play_sequence(script).duration < 0.2
+
+
+def test_cooling_down_restores_full_duty(hand, controller, thermal):
+    thermal.update(0.0, HOT_INDEX)
+    for timestamp in (600.0, 1200.0, 1800.0):
+        thermal.update(timestamp, COLD)
+    status = thermal.status()
+    assert all(status[motor_id]["severity"] == 0 for motor_id in MOTOR_IDS)
+    assert controller.register_words(1, ADDR_MAX_TORQUE_LIMIT) == 1000
+    assert thermal.decisions()[-1]["severity"] == 0
+
+
+def test_a_failed_torque_limit_write_is_counted_and_retried(hand, controller, thermal, monkeypatch):
+    write = controller.sync_write_raw_data
+
+    def failing_write(ids, addr, data):
+        if addr == ADDR_MAX_TORQUE_LIMIT:
+            raise RuntimeError("Operation timed out")
+        write(ids, addr, data)
+
+    monkeypatch.setattr(controller, "sync_write_raw_data", failing_write)
+    thermal.update(0.0, HOT_INDEX)
+    assert thermal.write_errors == 1
+    assert controller.register_words(1, ADDR_MAX_TORQUE_LIMIT) == 1000
+
+    monkeypatch.setattr(controller, "sync_write_raw_data", write)
+    thermal.update(0.0, HOT_INDEX)
+    assert controller.register_words(1, ADDR_MAX_TORQUE_LIMIT) == thermal.status()[1]["torque_limit"] < 1000
+
+    # Through a telemetry sweep: the error stays in the limiter.
+    monkeypatch.setattr(controller, "sync_write_raw_data", failing_write)
+    thermal.invalidate()
+    assert hand.read_telemetry()["ok"].all()
+    assert thermal.write_errors == 2
+    assert hand.listener_errors == 0
+
+def test_a_failing_listener_does_not_stop_the_sweep(hand):
+    seen = []
+
+    def broken(timestamp, telemetry):
+        raise RuntimeError("broken listener")
+
+    hand.add_telemetry_listener(broken)
+    hand.add_telemetry_listener(lambda timestamp, telemetry: seen.append(telemetry))
+    telemetry = hand.read_telemetry()
+    assert telemetry["ok"].all()
+    assert len(seen) == 1
+    assert hand.listener_errors == 1
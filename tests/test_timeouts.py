@@ -0,0 +1,52 @@
+"""
+Bus reply timeouts across probe() and the HealthMonitor, with a controller
+that, like rustypot's Scs0009PyController, cannot report its timeout.
+"""
+from amazingctrl import AmazingHand
+from amazingctrl.amazingctrl import BUS_TIMEOUT
+from amazingctrl.sim import SimulatedController
+
+
+class OpaqueTimeoutController:
+    """A SimulatedController without a readable `timeout`, recording set_timeout() calls."""
+
+    def __init__(self):
+        self._sim = SimulatedController(latency=False)
+        self.timeouts = []
+
+    def set_timeout(self, timeout):
+        self.timeouts.append(timeout)
+        self._sim.set_timeout(timeout)
+
+    def __getattr__(self, name):
+        if name == "timeout":
+            raise AttributeError(name)
+        return getattr(self._sim, name)
+
+
+def test_probe_restores_the_health_timeout():
+    controller = OpaqueTimeoutController()
+    hand = AmazingHand(port="sim", controller=controller)
+    hand.enable_health(call_timeout=0.01)
+    hand.start()
+    assert controller.timeouts == [0.01, 0.02, 0.01]
+    hand.disable_health()
+    assert controller.timeouts[-1] == BUS_TIMEOUT
+    hand.stop()
+
+
+def test_probe_restores_the_bus_timeout():
+    controller = OpaqueTimeoutController()
+    hand = AmazingHand(port="sim", controller=controller)
+    hand.probe(timeout=0.03)
+    assert controller.timeouts == [0.03, BUS_TIMEOUT]
+
+
+def test_disable_health_restores_the_bus_timeout():
+    controller = SimulatedController(latency=False, timeout=0.2)
+    hand = AmazingHand(port="sim", controller=controller)
+    hand.enable_health(call_timeout=0.01)
+    hand.probe()
+    assert controller.timeout == 0.01
+    hand.disable_health()
+    assert controller.timeout == 0.2
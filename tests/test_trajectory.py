@@ -0,0 +1,77 @@
+"""
+Trajectory planning: endpoints, velocities and playback.
+"""
+import numpy as np
+import pytest
+
+from amazingctrl.trajectory import cubic_spline, minimum_jerk, plan
+
+START = np.zeros(8)
+MIDDLE = np.array([45.0, -45.0, 30.0, -30.0, 60.0, -60.0, 20.0, -20.0])
+END = np.full(8, 90.0)
+
+
+@pytest.mark.parametrize("method", ["min_jerk", "cubic"])
+def test_endpoints_and_rest(method):
+    trajectory = plan([START, MIDDLE, END], [0.5, 0.75], rate_hz=100, method=method)
+    assert trajectory.times[0] == 0.0
+    assert trajectory.duration == pytest.approx(1.25)
+    np.testing.assert_allclose(trajectory.positions[0], START, atol=1e-9)
+    np.testing.assert_allclose(trajectory.positions[-1], END, atol=1e-9)
+    np.testing.assert_allclose(trajectory.velocities[0], 0.0, atol=1e-9)
+    np.testing.assert_allclose(trajectory.velocities[-1], 0.0, atol=1e-9)
+    assert len(trajectory) == 126
+
+
+def test_duration_off_the_sample_grid_ends_on_the_pose():
+    trajectory = minimum_jerk([START, END], [0.123], rate_hz=100)
+    assert trajectory.times[-1] == pytest.approx(0.123)
+    np.testing.assert_allclose(trajectory.positions[-1], END)
+
+
+def test_minimum_jerk_stops_at_each_pose_and_peaks_midway():
+    trajectory = minimum_jerk([START, MIDDLE, END], [0.5, 0.5], rate_hz=100)
+    k = np.searchsorted(trajectory.times, 0.5)
+    np.testing.assert_allclose(trajectory.positions[k], MIDDLE)
+    np.testing.assert_allclose(trajectory.velocities[k], 0.0, atol=1e-9)
+    # Peak speed of a minimum-jerk move is 1.875 * distance / duration, at its midpoint.
+    k = np.searchsorted(trajectory.times, 0.25)
+    np.testing.assert_allclose(trajectory.velocities[k], 1.875 * MIDDLE / 0.5)
+
+
+@pytest.mark.parametrize("method", [minimum_jerk, cubic_spline])
+def test_velocities_match_the_positions(method):
+    trajectory = method([START, MIDDLE, END], [0.5, 0.75], rate_hz=1000)
+    numeric = np.gradient(trajectory.positions, trajectory.times, axis=0)
+    np.testing.assert_allclose(trajectory.velocities[1:-1], numeric[1:-1], atol=0.5)
+
+
+def test_cubic_spline_passes_through_without_stopping():
+    trajectory = cubic_spline([START, MIDDLE, END], [0.5, 0.5], rate_hz=100)
+    k = np.searchsorted(trajectory.times, 0.5)
+    np.testing.assert_allclose(trajectory.positions[k], MIDDLE)
+    assert np.abs(trajectory.velocities[k]).max() > 1.0
+
+
+def test_servo_speeds_are_floored():
+    speeds = minimum_jerk([START, END], [1.0]).servo_speeds(margin=1.2, min_speed=0.5)
+    assert speeds.min() == 0.5
+    assert speeds.max() == pytest.approx(np.deg2rad(1.875 * 90.0) * 1.2, rel=1e-3)
+
+
+@pytest.mark.parametrize("poses, durations", [
+    ([START], []),
+    ([START, END], [0.0]),
+    ([START, END], [1.0, 1.0]),
+    ([START[:4], END[:4]], [1.0]),
+])
+def test_invalid_plans_are_rejected(poses, durations):
+    with pytest.raises(ValueError):
+        plan(poses, durations)
+
+
+def test_play_trajectory_ends_on_the_last_pose(hand, controller):
+    trajectory = minimum_jerk([START, END], [0.1], rate_hz=100)
+    hand.play_trajectory(trajectory)
+    np.testing.assert_allclose(hand.get_goal_pose()[0], END)
+    assert 2 <= len(controller.sync_writes) <= len(trajectory)